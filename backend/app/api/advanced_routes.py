@@ -1,10 +1,14 @@
 """Advanced AI features: batch processing, analytics, ranking"""
-from fastapi import APIRouter, HTTPException, status, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.responses import StreamingResponse
 from app.models.resume import ResumeData, TailorRequest
 from app.services.content_analyzer import BulletPointRanker, HallucinationDetector
+from app.services.jd_digest import job_digest
 from app.services.ai_settings_service import ai_settings_service
-from app.services.ai_service_factory import AIServiceFactory
+from app.services.job_queue import job_queue
+from app.services.streaming import sse_event
 from app.core.auth_middleware import get_current_user
+from app.core.config import settings
 from typing import Dict, Any, List
 from pydantic import BaseModel
 import asyncio
@@ -24,86 +28,119 @@ class VerifyAccuracyRequest(BaseModel):
     original: ResumeData
     tailored: ResumeData
 
-@router.post("/ai/batch-tailor")
+@router.post("/ai/batch-tailor", status_code=status.HTTP_202_ACCEPTED)
 async def batch_tailor_resumes(
     request: BatchTailorRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    background_tasks: BackgroundTasks = None
+    current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
-    Tailor resume for multiple jobs simultaneously
-    Returns multiple tailored versions
+    Queue resume tailoring against multiple jobs
+    Returns a job id to poll (/ai/jobs/{job_id}) or stream (/ai/jobs/{job_id}/stream)
     """
-    try:
-        user_id = current_user["user_id"]
-
-        # Get user's AI settings
-        user_config = await ai_settings_service.get_user_settings(user_id)
-        if not user_config:
-            raise HTTPException(
-                status_code=status.HTTP_428_PRECONDITION_REQUIRED,
-                detail="AI provider not configured"
-            )
-
-        ai_service = AIServiceFactory.create_service(user_config)
-
-        # Process all jobs in parallel
-        async def tailor_for_job(job_desc: str):
-            try:
-                # Tailor all sections in parallel for each job
-                results = await asyncio.gather(
-                    ai_service.tailor_summary(
-                        request.profileData.additionalInfo,
-                        request.profileData.skills,
-                        request.profileData.experience,
-                        job_desc
-                    ),
-                    ai_service.tailor_experience(
-                        request.profileData.experience,
-                        job_desc
-                    ),
-                    ai_service.tailor_skills(
-                        request.profileData.skills,
-                        job_desc
-                    ),
-                    return_exceptions=True
-                )
-
-                summary, experience, skills = results
-
-                return {
-                    "job_description": job_desc[:100] + "...",
-                    "summary": summary if not isinstance(summary, Exception) else "",
-                    "experience_count": len(experience) if isinstance(experience, list) else 0,
-                    "status": "success"
-                }
-            except Exception as e:
-                return {
-                    "job_description": job_desc[:100] + "...",
-                    "status": "error",
-                    "error": str(e)
-                }
-
-        # Limit to 5 jobs max to prevent abuse
-        job_descriptions = request.jobDescriptions[:5]
-
-        # Process all jobs in parallel
-        results = await asyncio.gather(*[
-            tailor_for_job(job_desc) for job_desc in job_descriptions
-        ])
+    user_id = current_user["user_id"]
 
-        return {
-            "total_jobs": len(results),
-            "results": results,
-            "message": f"Processed {len(results)} job descriptions"
-        }
+    # Fail fast instead of queueing work that cannot run
+    user_config = await ai_settings_service.get_user_settings(user_id)
+    if not user_config:
+        raise HTTPException(
+            status_code=status.HTTP_428_PRECONDITION_REQUIRED,
+            detail="AI provider not configured"
+        )
 
-    except Exception as e:
+    job_descriptions = [jd for jd in request.jobDescriptions if jd.strip()]
+    if not job_descriptions:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one job description is required"
+        )
+    if len(job_descriptions) > settings.JOB_MAX_DESCRIPTIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.JOB_MAX_DESCRIPTIONS} job descriptions per batch"
         )
 
+    active = await asyncio.to_thread(job_queue.store.count_active_jobs, user_id)
+    if active >= settings.JOB_MAX_ACTIVE_PER_USER:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"You already have {active} batch jobs in progress"
+        )
+
+    job_id = await job_queue.submit(user_id, request.profileData, job_descriptions)
+    return {
+        "job_id": job_id,
+        "status": "pending",
+        "total_jobs": len(job_descriptions),
+        "message": f"Queued {len(job_descriptions)} job descriptions"
+    }
+
+
+@router.get("/ai/jobs")
+async def list_batch_jobs(current_user: Dict[str, Any] = Depends(get_current_user)):
+    """List the user's recent batch tailoring jobs"""
+    jobs = await asyncio.to_thread(job_queue.store.list_jobs, current_user["user_id"])
+    return {"jobs": [{"job_id": job.pop("id"), **job} for job in jobs]}
+
+
+async def get_owned_job(job_id: str, user_id: str) -> Dict[str, Any]:
+    job = await job_queue.get_job(job_id, user_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return job
+
+
+@router.get("/ai/jobs/{job_id}")
+async def get_batch_job(
+    job_id: str,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """Get progress and per-job-description results of a batch tailoring job"""
+    job = await get_owned_job(job_id, current_user["user_id"])
+    job["results"] = await job_queue.get_results(job_id)
+    return job
+
+
+async def stream_job_events(job_id: str, user_id: str):
+    """Yield each finished item as an SSE event, then the final job summary"""
+    sent = set()
+    while True:
+        updated = job_queue.update_event(job_id)
+        job = await job_queue.get_job(job_id, user_id)
+        if job is None:
+            yield sse_event("error", {"detail": "Job not found"})
+            return
+
+        for item in await job_queue.get_results(job_id):
+            if item["index"] not in sent and item["status"] in ("completed", "failed"):
+                sent.add(item["index"])
+                yield sse_event("result", item)
+        yield sse_event("progress", {k: job[k] for k in ("status", "total_jobs", "completed", "failed", "pending")})
+
+        if job["status"] in ("completed", "failed"):
+            yield sse_event("complete", job)
+            return
+
+        if not await job_queue.wait_for_update(updated, timeout=15):
+            # Keep proxies from closing an idle connection
+            yield ": keep-alive\n\n"
+
+
+@router.get("/ai/jobs/{job_id}/stream")
+async def stream_batch_job(
+    job_id: str,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """Stream results of a batch tailoring job as server-sent events as each one finishes"""
+    await get_owned_job(job_id, current_user["user_id"])
+    return StreamingResponse(
+        stream_job_events(job_id, current_user["user_id"]),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 
 @router.post("/ai/rank-bullets")
 async def rank_experience_bullets(
@@ -119,7 +156,8 @@ async def rank_experience_bullets(
         ranked_experience = ranker.rank_experience_bullets(
             request.profileData.experience,
             request.jobDescription,
-            request.keep_top_n
+            request.keep_top_n,
+            important_terms=job_digest(request.jobDescription).important_terms
         )
 
         return {
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, HTTPException, status, Depends
 from app.models.ai_config import AIProviderConfig, GeminiConfig, OpenAIConfig, OpenRouterConfig
 from app.services.ai_settings_service import ai_settings_service
-from app.services.ai_service_factory import PROVIDER_MODELS
+from app.services.ai_service_factory import AIServiceFactory, PROVIDER_MODELS
 from app.core.auth_middleware import get_current_user
+from app.core.config import settings as app_settings
 from typing import Dict, Any
 
 router = APIRouter()
@@ -31,6 +32,8 @@ async def get_ai_settings(current_user: Dict[str, Any] = Depends(get_current_use
     # Don't return the API key for security
     settings_dict = settings.model_dump()
     settings_dict["api_key"] = ""  # Mask the key
+    for fallback in settings_dict.get("fallbacks") or []:
+        fallback["api_key"] = ""
 
     return settings_dict
 
@@ -48,7 +51,18 @@ async def save_ai_settings(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="API key is required"
         )
+    if not app_settings.MOCK_AI_ENABLED and "mock" in [config.provider] + [f.provider for f in config.fallbacks or []]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The mock AI provider is not enabled on this server"
+        )
+    if any(not fallback.api_key.strip() for fallback in config.fallbacks or []):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="API key is required for each fallback provider"
+        )
 
+    previous = await ai_settings_service.get_user_settings(user_id)
     success = await ai_settings_service.save_user_settings(user_id, config)
 
     if not success:
@@ -57,6 +71,10 @@ async def save_ai_settings(
             detail="Failed to save AI settings"
         )
 
+    # Drop the live provider instance built from the old key/model
+    if previous:
+        AIServiceFactory.invalidate(previous)
+
     return {"message": "AI settings saved successfully"}
 
 @router.delete("/ai/settings")
@@ -64,6 +82,7 @@ async def delete_ai_settings(current_user: Dict[str, Any] = Depends(get_current_
     """Delete user's AI provider settings (revert to default)"""
     user_id = current_user["user_id"]
 
+    previous = await ai_settings_service.get_user_settings(user_id)
     success = await ai_settings_service.delete_user_settings(user_id)
 
     if not success:
@@ -72,12 +91,17 @@ async def delete_ai_settings(current_user: Dict[str, Any] = Depends(get_current_
             detail="Failed to delete AI settings"
         )
 
+    if previous:
+        AIServiceFactory.invalidate(previous)
+
     return {"message": "AI settings deleted successfully"}
 
 @router.get("/ai/providers")
 async def get_available_providers():
     """Get list of available AI providers and their models"""
     return {
+        # Whether the fast_routing setting has any effect on this server
+        "modelRouting": app_settings.AI_ROUTING_ENABLED,
         "providers": [
             {
                 "value": "gemini",
@@ -100,5 +124,13 @@ async def get_available_providers():
                 "requiresKey": True,
                 "models": PROVIDER_MODELS["openrouter"]
             }
-        ]
+        ] + ([
+            {
+                "value": "mock",
+                "label": "Mock (load testing)",
+                "description": "Deterministic offline answers, no API calls",
+                "requiresKey": True,
+                "models": PROVIDER_MODELS["mock"]
+            }
+        ] if app_settings.MOCK_AI_ENABLED else [])
     }
@@ -0,0 +1,56 @@
+"""Runtime metrics for connection pools and caches"""
+import hmac
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from app.core.config import settings
+from app.services.http_client import http_pool
+from app.services.ai_service_factory import AIServiceFactory
+from app.services.cache_service import ai_cache
+from app.services.job_queue import job_queue
+from app.services.rate_limiter import limiter_registry
+from app.services.singleflight import completion_flights
+from app.services.circuit_breaker import breaker_registry
+from app.services.hedging import hedge_policy
+from app.services.model_routing import model_router
+from app.services.prompt_inputs import prompt_planner
+from app.core.auth_middleware import get_current_user_optional
+
+router = APIRouter()
+
+
+async def require_metrics_access(request: Request):
+    """
+    Metrics cover all users, so they are only served to operators: callers
+    presenting METRICS_TOKEN in X-Metrics-Token and the users listed in
+    METRICS_ADMIN_USER_IDS.
+    """
+    metrics_token = request.headers.get("X-Metrics-Token", "")
+    if settings.METRICS_TOKEN and hmac.compare_digest(metrics_token.encode(), settings.METRICS_TOKEN.encode()):
+        return
+
+    user = await get_current_user_optional(request)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    admin_ids = {user_id.strip() for user_id in settings.METRICS_ADMIN_USER_IDS.split(",") if user_id.strip()}
+    if user.get("user_id") not in admin_ids:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Metrics are restricted to administrators")
+
+
+@router.get("/metrics", dependencies=[Depends(require_metrics_access)])
+async def get_metrics():
+    """Get runtime metrics for shared resources"""
+    return {
+        "http_pool": http_pool.stats(),
+        "ai_services": AIServiceFactory.stats(),
+        "ai_rate_limits": limiter_registry.stats(),
+        "ai_inflight_coalescing": completion_flights.stats(),
+        "ai_circuits": breaker_registry.stats(),
+        "ai_hedging": hedge_policy.stats(),
+        "ai_model_routing": model_router.stats(),
+        "ai_prompt_inputs": prompt_planner.stats(),
+        "ai_cache": ai_cache.stats(),
+        "job_queue": job_queue.stats()
+    }
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 from app.models.resume import (
     ResumeProfile,
     ResumeData,
     TailoredResumeData,
     TailorRequest,
+    TailorResumeRequest,
     CoverLetterRequest,
     ATSScoreResponse,
     ChangeDetail,
@@ -12,17 +15,21 @@ from app.models.resume import (
 from app.services.supabase_service import supabase_service
 from app.services.ai_settings_service import ai_settings_service
 from app.services.ai_service_factory import AIServiceFactory
+from app.models.ai_config import AIProviderConfig
 from app.services.base_ai_service import BaseAIService
+from app.services.streaming import sse_event
 from app.services.enhanced_ats_scorer import EnhancedATSScorer
+from app.services.jd_digest import job_digest
 from app.core.auth_middleware import get_current_user
+from app.core.cancellation import until_disconnected, start_stream_deadline
 from typing import Optional, Dict, Any, List
 import asyncio
 import json
 
 router = APIRouter()
 
-async def get_ai_service_for_user(user_id: Optional[str] = None) -> BaseAIService:
-    """Get AI service instance based on user preferences (required)"""
+async def get_ai_config_for_user(user_id: Optional[str] = None) -> AIProviderConfig:
+    """Get the user's AI provider configuration (required)"""
     if not user_id:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -37,7 +44,12 @@ async def get_ai_service_for_user(user_id: Optional[str] = None) -> BaseAIServic
             detail="AI provider not configured. Please configure your AI settings in the AI Settings page before using AI features."
         )
 
-    return AIServiceFactory.create_service(user_config)
+    return user_config
+
+async def get_ai_service_for_user(user_id: Optional[str] = None) -> BaseAIService:
+    """Get AI service instance based on user preferences (required)"""
+    user_config = await get_ai_config_for_user(user_id)
+    return AIServiceFactory.get_service(user_config)
 
 # Health check
 @router.get("/health")
@@ -86,6 +98,7 @@ async def delete_profile(user_id: str):
 @router.post("/ai/generate-summary")
 async def generate_summary(
     data: dict,
+    http_request: Request,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """Generate professional summary from experience"""
@@ -99,12 +112,13 @@ async def generate_summary(
         )
 
     ai_service = await get_ai_service_for_user(user_id)
-    summary = await ai_service.generate_summary(experience)
+    summary = await until_disconnected(http_request, ai_service.generate_summary(experience))
     return {"summary": summary}
 
 @router.post("/ai/tailor-summary")
 async def tailor_summary_endpoint(
     request: TailorRequest,
+    http_request: Request,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """Tailor professional summary for specific job"""
@@ -112,12 +126,12 @@ async def tailor_summary_endpoint(
         user_id = current_user["user_id"]
         ai_service = await get_ai_service_for_user(user_id)
 
-        summary = await ai_service.tailor_summary(
+        summary = await until_disconnected(http_request, ai_service.tailor_summary(
             request.profileData.additionalInfo,
             request.profileData.skills,
             request.profileData.experience,
             request.jobDescription
-        )
+        ))
         return {"summary": summary}
     except Exception as e:
         raise HTTPException(
@@ -128,6 +142,7 @@ async def tailor_summary_endpoint(
 @router.post("/ai/tailor-experience")
 async def tailor_experience_endpoint(
     request: TailorRequest,
+    http_request: Request,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """Tailor work experience for specific job"""
@@ -135,10 +150,10 @@ async def tailor_experience_endpoint(
         user_id = current_user["user_id"]
         ai_service = await get_ai_service_for_user(user_id)
 
-        experience = await ai_service.tailor_experience(
+        experience = await until_disconnected(http_request, ai_service.tailor_experience(
             request.profileData.experience,
             request.jobDescription
-        )
+        ))
         return {"experience": [exp.model_dump() for exp in experience]}
     except Exception as e:
         raise HTTPException(
@@ -149,6 +164,7 @@ async def tailor_experience_endpoint(
 @router.post("/ai/tailor-skills")
 async def tailor_skills_endpoint(
     request: TailorRequest,
+    http_request: Request,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """Tailor skills for specific job"""
@@ -156,10 +172,10 @@ async def tailor_skills_endpoint(
         user_id = current_user["user_id"]
         ai_service = await get_ai_service_for_user(user_id)
 
-        skills = await ai_service.tailor_skills(
+        skills = await until_disconnected(http_request, ai_service.tailor_skills(
             request.profileData.skills,
             request.jobDescription
-        )
+        ))
         return {"skills": skills}
     except Exception as e:
         raise HTTPException(
@@ -170,6 +186,7 @@ async def tailor_skills_endpoint(
 @router.post("/ai/tailor-projects")
 async def tailor_projects_endpoint(
     request: TailorRequest,
+    http_request: Request,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """Tailor projects for specific job"""
@@ -177,10 +194,10 @@ async def tailor_projects_endpoint(
         user_id = current_user["user_id"]
         ai_service = await get_ai_service_for_user(user_id)
 
-        projects = await ai_service.tailor_projects(
+        projects = await until_disconnected(http_request, ai_service.tailor_projects(
             request.profileData.projects,
             request.jobDescription
-        )
+        ))
         return {"projects": [proj.model_dump() for proj in projects]}
     except Exception as e:
         raise HTTPException(
@@ -191,6 +208,7 @@ async def tailor_projects_endpoint(
 @router.post("/ai/tailor-education")
 async def tailor_education_endpoint(
     request: TailorRequest,
+    http_request: Request,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """Tailor education for specific job"""
@@ -198,10 +216,10 @@ async def tailor_education_endpoint(
         user_id = current_user["user_id"]
         ai_service = await get_ai_service_for_user(user_id)
 
-        education = await ai_service.tailor_education(
+        education = await until_disconnected(http_request, ai_service.tailor_education(
             request.profileData.education,
             request.jobDescription
-        )
+        ))
         return {"education": [edu.model_dump() for edu in education]}
     except Exception as e:
         raise HTTPException(
@@ -209,118 +227,230 @@ async def tailor_education_endpoint(
             detail=str(e)
         )
 
+TAILOR_SECTIONS = ("summary", "experience", "skills", "projects", "education")
+
+def section_coroutines(
+    ai_service: BaseAIService,
+    request: TailorRequest,
+    sections: tuple = TAILOR_SECTIONS
+) -> Dict[str, Any]:
+    """One tailoring coroutine per requested resume section"""
+    factories = {
+        "summary": lambda: ai_service.tailor_summary(
+            request.profileData.additionalInfo,
+            request.profileData.skills,
+            request.profileData.experience,
+            request.jobDescription
+        ),
+        "experience": lambda: ai_service.tailor_experience(
+            request.profileData.experience,
+            request.jobDescription
+        ),
+        "skills": lambda: ai_service.tailor_skills(
+            request.profileData.skills,
+            request.jobDescription
+        ),
+        "projects": lambda: ai_service.tailor_projects(
+            request.profileData.projects,
+            request.jobDescription
+        ),
+        "education": lambda: ai_service.tailor_education(
+            request.profileData.education,
+            request.jobDescription
+        )
+    }
+    return {section: factories[section]() for section in sections}
+
+def section_result(section: str, result: Any, profile: ResumeData) -> Any:
+    """Use the original section (or an empty summary) when tailoring failed"""
+    if not isinstance(result, Exception):
+        return result
+    print(f"{section.capitalize()} tailoring failed: {result}")
+    if section == "summary":
+        return ""
+    return getattr(profile, section)
+
+async def tailor_sections_fanout(ai_service: BaseAIService, request: TailorRequest) -> tuple:
+    """Tailor each section with its own prompt, all in parallel"""
+    coroutines = section_coroutines(ai_service, request)
+    results = await asyncio.gather(
+        *[coroutines[section] for section in TAILOR_SECTIONS],
+        return_exceptions=True  # Don't fail entire operation if one section fails
+    )
+
+    return tuple(
+        section_result(section, result, request.profileData)
+        for section, result in zip(TAILOR_SECTIONS, results)
+    )
+
+async def tailor_sections_combined(ai_service: BaseAIService, request: TailorRequest) -> tuple:
+    """Tailor all sections with one structured prompt, falling back to fan-out on failure"""
+    try:
+        tailored = await ai_service.tailor_resume_combined(
+            request.profileData,
+            request.jobDescription
+        )
+    except Exception as e:
+        print(f"Combined tailoring failed, falling back to per-section prompts: {e}")
+        return await tailor_sections_fanout(ai_service, request)
+
+    return tailored.summary, tailored.experience, tailored.skills, tailored.projects, tailored.education
+
+def track_changes(
+    profile: ResumeData,
+    tailored_summary: str,
+    tailored_experience: List
+) -> List[ChangeDetail]:
+    """Describe what tailoring changed compared to the original profile"""
+    changes: List[ChangeDetail] = []
+
+    # Track summary changes
+    if tailored_summary:
+        changes.append(ChangeDetail(
+            section="Summary",
+            field="summary",
+            before=profile.additionalInfo[:100] + "..." if len(profile.additionalInfo) > 100 else profile.additionalInfo,
+            after=tailored_summary[:100] + "..." if len(tailored_summary) > 100 else tailored_summary,
+            reason="Generated job-specific summary"
+        ))
+
+    # Track experience changes
+    for i, (orig_exp, tail_exp) in enumerate(zip(profile.experience, tailored_experience if isinstance(tailored_experience, list) else [])):
+        if orig_exp.description != tail_exp.description:
+            changes.append(ChangeDetail(
+                section="Experience",
+                field=f"{orig_exp.company} - {orig_exp.role}",
+                before=f"{len(orig_exp.description)} bullets",
+                after=f"{len(tail_exp.description)} bullets (tailored)",
+                reason="Optimized for job requirements"
+            ))
+
+    return changes
+
+def keyword_analysis_for(profile: ResumeData, job_description: str) -> dict:
+    """Keyword match of the original profile against the job description"""
+    scorer = EnhancedATSScorer()
+    keyword_score, missing_keywords = scorer.calculate_keyword_match(
+        profile,
+        job_description,
+        job_digest(job_description)
+    )
+
+    return {
+        "matched_percentage": keyword_score,
+        "missing_keywords": missing_keywords[:5]
+    }
+
+def build_tailored_resume(
+    profile: ResumeData,
+    tailored_summary: str,
+    tailored_experience: Any,
+    tailored_skills: Any,
+    tailored_projects: Any,
+    tailored_education: Any
+) -> TailoredResumeData:
+    """Assemble the tailored resume, keeping original sections that did not come back as lists"""
+    return TailoredResumeData(
+        personalInfo=profile.personalInfo,
+        summary=tailored_summary,
+        coverLetter=profile.coverLetter,
+        skills=tailored_skills,
+        experience=tailored_experience if isinstance(tailored_experience, list) else profile.experience,
+        education=tailored_education if isinstance(tailored_education, list) else profile.education,
+        projects=tailored_projects if isinstance(tailored_projects, list) else profile.projects,
+        certifications=profile.certifications
+    )
+
+def section_payload(result: Any) -> Any:
+    """JSON-ready form of a tailored section"""
+    if isinstance(result, list):
+        return [item.model_dump() for item in result]
+    if isinstance(result, BaseModel):
+        return result.model_dump()
+    return result
+
+async def stream_tailored_sections(ai_service: BaseAIService, request: TailorRequest, mode: str):
+    """Yield each section as an SSE event as soon as it is tailored"""
+    start_stream_deadline()
+    profile = request.profileData
+    tailored: Dict[str, Any] = {}
+    pending: Dict[asyncio.Task, str] = {}
+
+    try:
+        if mode == "combined":
+            # One prompt produces every section; each is sent as soon as it is written
+            try:
+                async for section, result in ai_service.stream_resume_combined(profile, request.jobDescription):
+                    tailored[section] = result
+                    yield sse_event("section", {"section": section, "data": section_payload(result)})
+            except Exception as e:
+                print(f"Combined tailoring failed, falling back to per-section prompts: {e}")
+
+        # Per-section prompts for everything combined mode did not deliver
+        missing = tuple(section for section in TAILOR_SECTIONS if section not in tailored)
+        pending = {
+            asyncio.create_task(coroutine): section
+            for section, coroutine in section_coroutines(ai_service, request, missing).items()
+        }
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                section = pending.pop(task)
+                result = task.exception() or task.result()
+                tailored[section] = section_result(section, result, profile)
+                yield sse_event("section", {"section": section, "data": section_payload(tailored[section])})
+
+        yield sse_event("keywordAnalysis", keyword_analysis_for(profile, request.jobDescription))
+
+        changes = track_changes(profile, tailored["summary"], tailored["experience"])
+        yield sse_event("changes", [c.model_dump() for c in changes])
+
+        tailored_data = build_tailored_resume(profile, *[tailored[section] for section in TAILOR_SECTIONS])
+        yield sse_event("complete", {"tailoredResume": tailored_data.model_dump(), "mode": mode})
+    except Exception as e:
+        print(f"Error streaming tailored resume: {e}")
+        yield sse_event("error", {"detail": str(e)})
+    finally:
+        # Client went away or we failed: stop outstanding provider calls
+        for task in pending:
+            task.cancel()
+
 @router.post("/ai/tailor-resume")
 async def tailor_resume(
-    request: TailorRequest,
+    request: TailorResumeRequest,
+    http_request: Request,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """Tailor resume for specific job with parallel processing and change tracking"""
     try:
         # Get AI service using authenticated user
         user_id = current_user["user_id"]
-        ai_service = await get_ai_service_for_user(user_id)
+        user_config = await get_ai_config_for_user(user_id)
+        ai_service = AIServiceFactory.get_service(user_config)
 
-        # PARALLEL PROCESSING: Tailor all sections simultaneously
-        results = await asyncio.gather(
-            ai_service.tailor_summary(
-                request.profileData.additionalInfo,
-                request.profileData.skills,
-                request.profileData.experience,
-                request.jobDescription
-            ),
-            ai_service.tailor_experience(
-                request.profileData.experience,
-                request.jobDescription
-            ),
-            ai_service.tailor_skills(
-                request.profileData.skills,
-                request.jobDescription
-            ),
-            ai_service.tailor_projects(
-                request.profileData.projects,
-                request.jobDescription
-            ),
-            ai_service.tailor_education(
-                request.profileData.education,
-                request.jobDescription
-            ),
-            return_exceptions=True  # Don't fail entire operation if one section fails
-        )
-
-        # Unpack results
-        tailored_summary, tailored_experience, tailored_skills, tailored_projects, tailored_education = results
-
-        # Handle exceptions in individual results
-        if isinstance(tailored_summary, Exception):
-            print(f"Summary tailoring failed: {tailored_summary}")
-            tailored_summary = ""
-        if isinstance(tailored_experience, Exception):
-            print(f"Experience tailoring failed: {tailored_experience}")
-            tailored_experience = request.profileData.experience
-        if isinstance(tailored_skills, Exception):
-            print(f"Skills tailoring failed: {tailored_skills}")
-            tailored_skills = request.profileData.skills
-        if isinstance(tailored_projects, Exception):
-            print(f"Projects tailoring failed: {tailored_projects}")
-            tailored_projects = request.profileData.projects
-        if isinstance(tailored_education, Exception):
-            print(f"Education tailoring failed: {tailored_education}")
-            tailored_education = request.profileData.education
+        # Combined mode sends one prompt instead of five (useful on strict rate limits)
+        mode = request.mode or user_config.tailor_mode or "fanout"
+        if mode == "combined":
+            sections = await until_disconnected(http_request, tailor_sections_combined(ai_service, request))
+        else:
+            sections = await until_disconnected(http_request, tailor_sections_fanout(ai_service, request))
+        tailored_summary, tailored_experience, tailored_skills, tailored_projects, tailored_education = sections
 
         # Track changes
-        changes: List[ChangeDetail] = []
-
-        # Track summary changes
-        if tailored_summary:
-            changes.append(ChangeDetail(
-                section="Summary",
-                field="summary",
-                before=request.profileData.additionalInfo[:100] + "..." if len(request.profileData.additionalInfo) > 100 else request.profileData.additionalInfo,
-                after=tailored_summary[:100] + "..." if len(tailored_summary) > 100 else tailored_summary,
-                reason="Generated job-specific summary"
-            ))
-
-        # Track experience changes
-        for i, (orig_exp, tail_exp) in enumerate(zip(request.profileData.experience, tailored_experience if isinstance(tailored_experience, list) else [])):
-            if orig_exp.description != tail_exp.description:
-                changes.append(ChangeDetail(
-                    section="Experience",
-                    field=f"{orig_exp.company} - {orig_exp.role}",
-                    before=f"{len(orig_exp.description)} bullets",
-                    after=f"{len(tail_exp.description)} bullets (tailored)",
-                    reason="Optimized for job requirements"
-                ))
+        changes = track_changes(request.profileData, tailored_summary, tailored_experience)
 
         # Create tailored resume data
-        tailored_data = TailoredResumeData(
-            personalInfo=request.profileData.personalInfo,
-            summary=tailored_summary,
-            coverLetter=request.profileData.coverLetter,
-            skills=tailored_skills,
-            experience=tailored_experience if isinstance(tailored_experience, list) else request.profileData.experience,
-            education=tailored_education if isinstance(tailored_education, list) else request.profileData.education,
-            projects=tailored_projects if isinstance(tailored_projects, list) else request.profileData.projects,
-            certifications=request.profileData.certifications
-        )
-
-        # Calculate keyword analysis
-        scorer = EnhancedATSScorer()
-        keyword_score, missing_keywords = scorer.calculate_keyword_match(
-            request.profileData,
-            request.jobDescription
-        )
-
-        keyword_analysis = {
-            "matched_percentage": keyword_score,
-            "missing_keywords": missing_keywords[:5]
-        }
+        tailored_data = build_tailored_resume(request.profileData, *sections)
 
         return {
             "tailoredResume": tailored_data.model_dump(),
             "changes": [c.model_dump() for c in changes],
-            "keywordAnalysis": keyword_analysis
+            "keywordAnalysis": keyword_analysis_for(request.profileData, request.jobDescription),
+            "mode": mode
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         error_msg = str(e)
         print(f"Error tailoring resume: {error_msg}")
@@ -329,6 +459,23 @@ async def tailor_resume(
             detail=error_msg
         )
 
+@router.post("/ai/tailor-resume/stream")
+async def tailor_resume_stream(
+    request: TailorResumeRequest,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """Tailor resume and stream each section as a server-sent event when it completes"""
+    user_id = current_user["user_id"]
+    user_config = await get_ai_config_for_user(user_id)
+    ai_service = AIServiceFactory.get_service(user_config)
+    mode = request.mode or user_config.tailor_mode or "fanout"
+
+    return StreamingResponse(
+        stream_tailored_sections(ai_service, request, mode),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.post("/ai/ats-score", response_model=ATSScoreResponse)
 async def calculate_ats_score(
     request: TailorRequest,
@@ -340,7 +487,8 @@ async def calculate_ats_score(
         scorer = EnhancedATSScorer()
         result = scorer.calculate_comprehensive_score(
             request.profileData,
-            request.jobDescription
+            request.jobDescription,
+            job_digest(request.jobDescription)
         )
 
         return ATSScoreResponse(
@@ -362,6 +510,7 @@ async def calculate_ats_score(
 @router.post("/ai/ats-score-llm")
 async def calculate_ats_score_llm(
     request: TailorRequest,
+    http_request: Request,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """Calculate ATS score using LLM analysis of complete assembled resume"""
@@ -370,17 +519,18 @@ async def calculate_ats_score_llm(
         ai_service = await get_ai_service_for_user(user_id)
 
         # Use AI service to analyze the complete assembled resume
-        result = await ai_service.calculate_ats_score(
+        result = await until_disconnected(http_request, ai_service.calculate_ats_score(
             request.profileData,
             request.jobDescription
-        )
+        ))
 
         # LLM returns a simpler format: {"score": 85, "feedback": "..."}
         # We'll enhance it with the heuristic breakdown for additional details
         scorer = EnhancedATSScorer()
         heuristic_result = scorer.calculate_comprehensive_score(
             request.profileData,
-            request.jobDescription
+            request.jobDescription,
+            job_digest(request.jobDescription)
         )
 
         return {
@@ -402,6 +552,7 @@ async def calculate_ats_score_llm(
 @router.post("/ai/generate-cover-letter")
 async def generate_cover_letter(
     request: CoverLetterRequest,
+    http_request: Request,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """Generate personalized cover letter"""
@@ -409,11 +560,12 @@ async def generate_cover_letter(
         user_id = current_user["user_id"]
         ai_service = await get_ai_service_for_user(user_id)
 
-        cover_letter = await ai_service.generate_cover_letter(
+        cover_letter = await until_disconnected(http_request, ai_service.generate_cover_letter(
             request.profileData,
             request.jobDescription,
-            request.instructions or ""
-        )
+            request.instructions or "",
+            body_only=request.bodyOnly
+        ))
         return {"coverLetter": cover_letter}
     except Exception as e:
         error_msg = str(e)
@@ -423,9 +575,42 @@ async def generate_cover_letter(
             detail=error_msg
         )
 
+async def stream_cover_letter_events(ai_service: BaseAIService, request: CoverLetterRequest):
+    """Yield cover letter text deltas as SSE events, then the full letter"""
+    start_stream_deadline()
+    parts = []
+    try:
+        async for text in ai_service.stream_cover_letter(
+            request.profileData,
+            request.jobDescription,
+            request.instructions or "",
+            body_only=request.bodyOnly
+        ):
+            parts.append(text)
+            yield sse_event("delta", {"text": text})
+        yield sse_event("complete", {"coverLetter": "".join(parts).strip()})
+    except Exception as e:
+        print(f"Error streaming cover letter: {e}")
+        yield sse_event("error", {"detail": str(e)})
+
+@router.post("/ai/generate-cover-letter/stream")
+async def generate_cover_letter_stream(
+    request: CoverLetterRequest,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """Generate a cover letter and stream its text as server-sent events while it is written"""
+    ai_service = await get_ai_service_for_user(current_user["user_id"])
+
+    return StreamingResponse(
+        stream_cover_letter_events(ai_service, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.post("/ai/generate-proposal")
 async def generate_proposal(
     request: TailorRequest,
+    http_request: Request,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """Generate freelance job proposal with suggested experience and projects"""
@@ -433,10 +618,10 @@ async def generate_proposal(
         user_id = current_user["user_id"]
         ai_service = await get_ai_service_for_user(user_id)
 
-        result = await ai_service.generate_proposal(
+        result = await until_disconnected(http_request, ai_service.generate_proposal(
             request.profileData,
             request.jobDescription
-        )
+        ))
         return result
     except Exception as e:
         error_msg = str(e)
@@ -445,3 +630,30 @@ async def generate_proposal(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=error_msg
         )
+
+async def stream_proposal_events(ai_service: BaseAIService, request: TailorRequest):
+    """Yield proposal text deltas as SSE events, then the parsed proposal"""
+    start_stream_deadline()
+    try:
+        async for event in ai_service.stream_proposal(request.profileData, request.jobDescription):
+            if event["type"] == "delta":
+                yield sse_event("delta", {"text": event["text"]})
+            else:
+                yield sse_event("complete", event["data"])
+    except Exception as e:
+        print(f"Error streaming proposal: {e}")
+        yield sse_event("error", {"detail": str(e)})
+
+@router.post("/ai/generate-proposal/stream")
+async def generate_proposal_stream(
+    request: TailorRequest,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """Generate a freelance proposal and stream its text as server-sent events while it is written"""
+    ai_service = await get_ai_service_for_user(current_user["user_id"])
+
+    return StreamingResponse(
+        stream_proposal_events(ai_service, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -40,7 +40,7 @@ async def get_current_user(
     auth_service = get_auth_service()
     print(f"DEBUG: Auth service: {auth_service}")
 
-    user_data = auth_service.verify_token(token)
+    user_data = await auth_service.verify_token(token)
     print(f"DEBUG: User data: {user_data}")
 
     if not user_data:
@@ -74,7 +74,7 @@ async def get_current_user_optional(
     token = auth_header.split(" ")[1]
     auth_service = get_auth_service()
 
-    return auth_service.verify_token(token)
+    return await auth_service.verify_token(token)
 
 def require_auth(user: Optional[dict] = None) -> dict:
     """
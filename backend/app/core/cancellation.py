@@ -0,0 +1,60 @@
+"""
+Client disconnects and request deadlines for AI routes.
+
+Route handlers run their AI work through until_disconnected(): if the
+client goes away first, the work is cancelled, which cancels outstanding
+gather branches, limiter waits and the provider HTTP requests under them
+(a coalesced call keeps running while another request still waits on it).
+The work runs inside a deadline_scope, so every provider call it makes,
+retries and fallbacks included, ends by AI_ENDPOINT_DEADLINE_SECONDS.
+Streaming routes are cancelled by StreamingResponse itself when the client
+disconnects; their generators start with start_stream_deadline().
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Optional
+from fastapi import Request
+from app.core.config import settings
+from app.services.rate_limiter import deadline_scope, request_deadline
+
+
+class ClientDisconnected(Exception):
+    """The client closed the connection before the response was ready"""
+
+
+async def wait_for_disconnect(http_request: Request):
+    """Return once the client disconnects (FastAPI has already read the body)"""
+    while True:
+        message = await http_request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def until_disconnected(
+    http_request: Request,
+    work: Awaitable[Any],
+    seconds: Optional[float] = None
+) -> Any:
+    """Await an AI route's work under the request deadline, cancelling it if the client leaves"""
+    with deadline_scope(seconds or settings.AI_ENDPOINT_DEADLINE_SECONDS):
+        # Tasks copy the current context, so the work keeps the deadline
+        task = asyncio.ensure_future(work)
+    watcher = asyncio.ensure_future(wait_for_disconnect(http_request))
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+        if task.done():
+            return task.result()
+        print(f"Client disconnected from {http_request.url.path}, cancelling AI calls")
+        raise ClientDisconnected(f"Client disconnected from {http_request.url.path}")
+    finally:
+        task.cancel()
+        watcher.cancel()
+
+
+def start_stream_deadline(seconds: Optional[float] = None):
+    """
+    Apply the request deadline to a streaming response's generator. Not reset:
+    StreamingResponse iterates the generator in its own task, whose context
+    ends with the response.
+    """
+    request_deadline.set(time.monotonic() + (seconds or settings.AI_ENDPOINT_DEADLINE_SECONDS))
@@ -15,6 +15,115 @@ class Settings(BaseSettings):
     SUPABASE_SERVICE_KEY: str
     SUPABASE_JWT_SECRET: str
 
+    # Async PostgREST connection pool
+    SUPABASE_DB_MAX_CONNECTIONS: int = 20
+    SUPABASE_DB_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    SUPABASE_DB_TIMEOUT: float = 10.0
+    SUPABASE_DB_CONNECT_TIMEOUT: float = 5.0
+
+    # Local JWT verification (JWKS defaults to SUPABASE_URL/auth/v1/.well-known/jwks.json;
+    # SUPABASE_JWKS_FILE is a local stand-in for offline/dev use)
+    SUPABASE_JWKS_URL: str = ""
+    SUPABASE_JWKS_FILE: str = ""
+    JWKS_REFRESH_SECONDS: int = 600
+    AUTH_TOKEN_CACHE_SIZE: int = 10000
+
+    # Shared HTTP client pool for AI providers
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_ENABLE_HTTP2: bool = True
+    HTTP_TIMEOUT: float = 60.0
+    HTTP_CONNECT_TIMEOUT: float = 10.0
+
+    # Live AI provider instances reused across requests
+    AI_SERVICE_CACHE_SIZE: int = 256
+    AI_SERVICE_IDLE_TTL_SECONDS: int = 900
+
+    # Per-key adaptive concurrency and retries for AI provider calls
+    AI_LIMITER_INITIAL_CONCURRENCY: int = 4
+    AI_LIMITER_MAX_CONCURRENCY: int = 16
+    AI_LIMITER_LATENCY_TARGET_SECONDS: float = 30.0
+    AI_RETRY_MAX_ATTEMPTS: int = 4
+    AI_RETRY_BASE_DELAY: float = 0.5
+    AI_RETRY_MAX_DELAY: float = 20.0
+    AI_REQUEST_DEADLINE_SECONDS: float = 120.0
+    # Whole AI API request (all of its provider calls); work stops early if the client disconnects
+    AI_ENDPOINT_DEADLINE_SECONDS: float = 150.0
+
+    # Circuit breakers per provider model (sliding window of call outcomes)
+    CIRCUIT_WINDOW_SECONDS: int = 60
+    CIRCUIT_MIN_CALLS: int = 10
+    CIRCUIT_ERROR_RATE: float = 0.5
+    CIRCUIT_SLOW_CALL_SECONDS: float = 30.0
+    CIRCUIT_SLOW_CALL_RATE: float = 0.8
+    CIRCUIT_OPEN_SECONDS: int = 30
+    CIRCUIT_HALF_OPEN_PROBES: int = 2
+
+    # Hedged requests: comma-separated operations to hedge (e.g. "tailor_summary,tailor_skills"),
+    # empty = off. A duplicate is sent once a call outlives the observed latency percentile,
+    # to the first fallback provider if AI_HEDGE_TO_FALLBACK, and hedges stay under
+    # AI_HEDGE_BUDGET of all hedgeable calls
+    AI_HEDGE_OPERATIONS: str = ""
+    AI_HEDGE_PERCENTILE: float = 0.9
+    AI_HEDGE_BUDGET: float = 0.1
+    AI_HEDGE_MIN_SAMPLES: int = 20
+    AI_HEDGE_TO_FALLBACK: bool = False
+
+    # Model routing: operations in AI_ROUTING_FAST_OPERATIONS run on the cheapest fast model of the
+    # user's provider whose observed p90 latency meets AI_ROUTING_LATENCY_SLO_SECONDS; the rest
+    # use the configured model. Off by default; when enabled it still applies only to users who
+    # opt in with fast_routing in their AI settings
+    AI_ROUTING_ENABLED: bool = False
+    AI_ROUTING_FAST_OPERATIONS: str = "generate_summary,tailor_summary,tailor_skills,calculate_ats_score"
+    AI_ROUTING_LATENCY_SLO_SECONDS: float = 8.0
+    AI_ROUTING_MIN_SAMPLES: int = 10
+
+    # Estimated input tokens per prompt before low-relevance bullets are trimmed
+    AI_INPUT_TOKEN_BUDGET: int = 6000
+
+    # Ask providers for JSON constrained to the response model's schema
+    AI_STRUCTURED_OUTPUT: bool = True
+
+    # Provider API endpoints; point them at benchmarks/fake_provider.py for offline load tests
+    OPENAI_BASE_URL: str = "https://api.openai.com/v1"
+    OPENROUTER_BASE_URL: str = "https://openrouter.ai/api/v1"
+    GEMINI_API_ENDPOINT: str = ""  # e.g. http://localhost:8900 (REST); empty = Google's gRPC endpoint
+
+    # In-process mock provider ("mock" in AI settings) for load tests; never enable in production
+    MOCK_AI_ENABLED: bool = False
+    MOCK_AI_LATENCY_SECONDS: float = 0.5
+
+    # AI response cache
+    AI_CACHE_MAX_ENTRIES: int = 5000
+    AI_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    AI_CACHE_TTL_SECONDS: int = 24 * 3600
+    CACHE_SWEEP_INTERVAL_SECONDS: int = 60
+
+    # Per-user AI settings cache
+    AI_SETTINGS_CACHE_TTL_SECONDS: int = 300
+    AI_SETTINGS_CACHE_SIZE: int = 10000
+    # With a shared backend, how long a worker may reuse settings without re-reading it; keeps
+    # other workers' saves (e.g. a revoked API key) visible within this many seconds
+    AI_SETTINGS_LOCAL_TTL_SECONDS: int = 2
+
+    # Optional cache shared across workers ("none" or "redis")
+    SHARED_CACHE_BACKEND: str = "none"
+    REDIS_URL: str = ""
+
+    # Background batch tailoring jobs (SQLite file persists progress across restarts)
+    JOB_DB_PATH: str = "jobs.sqlite3"
+    JOB_WORKERS: int = 4
+    JOB_MAX_CONCURRENT_PER_USER: int = 2
+    JOB_MAX_ACTIVE_PER_USER: int = 5
+    JOB_MAX_DESCRIPTIONS: int = 100
+    JOB_RETENTION_DAYS: int = 7
+
+    # /api/metrics access (metrics cover all users): a shared token sent as X-Metrics-Token,
+    # and/or comma-separated Supabase user ids of administrators
+    METRICS_TOKEN: str = ""
+    METRICS_ADMIN_USER_IDS: str = ""
+
     # CORS
     CORS_ORIGINS: str = "http://localhost:5173,http://localhost:3000"
 
@@ -0,0 +1,34 @@
+"""
+Report which models answered a request.
+
+Model routing can run an operation on a different model than the one the
+user configured, and failover can move it to another provider. This ASGI
+middleware tracks every model whose answer the request used (cache hits
+included) and lists them in an X-AI-Models response header, as
+"provider:model" pairs. Streaming responses send their headers before any
+model answers, so they do not carry it.
+"""
+from app.services.cache_service import track_answering_models
+
+MODELS_HEADER = b"x-ai-models"
+
+
+class ModelReportingMiddleware:
+    """Add the X-AI-Models header to responses that used an AI model"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_answering_models() as models:
+            async def send_with_models(message):
+                if message["type"] == "http.response.start" and models:
+                    value = ",".join(f"{provider}:{model}" for provider, model in sorted(models))
+                    message = {**message, "headers": [*message.get("headers", []), (MODELS_HEADER, value.encode())]}
+                await send(message)
+
+            await self.app(scope, receive, send_with_models)
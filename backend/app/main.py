@@ -1,18 +1,47 @@
+from contextlib import asynccontextmanager
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.services.http_client import http_pool
+from app.services.token_verifier import jwks_cache
+from app.services.supabase_service import supabase_service
+from app.services.cache_service import ai_cache
+from app.services.job_queue import job_queue
+from app.services.ai_service_factory import AIServiceFactory
+from app.core.model_reporting import ModelReportingMiddleware
 from app.api.routes import router
 from app.api.auth import router as auth_router
 from app.api.ai_settings_routes import router as ai_settings_router
 from app.api.advanced_routes import router as advanced_router
+from app.api.metrics_routes import router as metrics_router
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared resources on startup and release them on shutdown"""
+    http_pool.start()
+    jwks_refresher = asyncio.create_task(jwks_cache.run_refresh_loop())
+    cache_sweeper = asyncio.create_task(ai_cache.run_sweeper(settings.CACHE_SWEEP_INTERVAL_SECONDS))
+    await job_queue.start()
+    yield
+    await job_queue.stop()
+    jwks_refresher.cancel()
+    cache_sweeper.cancel()
+    await AIServiceFactory.aclose()
+    await http_pool.close()
+    await supabase_service.aclose()
 
 # Create FastAPI app
 app = FastAPI(
     title="Resumyx API",
     description="AI-powered resume builder backend",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Name the models that answered each request (X-AI-Models)
+app.add_middleware(ModelReportingMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -20,12 +49,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-AI-Models"],
 )
 
 # Include API routes
 app.include_router(auth_router, prefix="/api")
 app.include_router(ai_settings_router, prefix="/api")
 app.include_router(advanced_router, prefix="/api")
+app.include_router(metrics_router, prefix="/api")
 app.include_router(router, prefix="/api")
 
 @app.get("/")
@@ -1,11 +1,24 @@
 from pydantic import BaseModel
-from typing import Optional, Literal
+from typing import Optional, Literal, List
+
+class FallbackProviderConfig(BaseModel):
+    """Provider used when the primary one fails or its circuit is open"""
+    provider: Literal["gemini", "openai", "openrouter", "mock"]
+    api_key: str
+    model: Optional[str] = None
 
 class AIProviderConfig(BaseModel):
     """Configuration for AI provider"""
-    provider: Literal["gemini", "openai", "openrouter"]
+    provider: Literal["gemini", "openai", "openrouter", "mock"]
     api_key: str
     model: Optional[str] = None
+    # Default /ai/tailor-resume mode for this provider ("fanout" or "combined")
+    tailor_mode: Optional[Literal["fanout", "combined"]] = None
+    # Tried in order when the primary provider is unavailable
+    fallbacks: Optional[List[FallbackProviderConfig]] = None
+    # Let short operations run on a faster, cheaper model of the same provider
+    # (needs AI_ROUTING_ENABLED on the server)
+    fast_routing: bool = False
 
 class GeminiConfig(AIProviderConfig):
     provider: Literal["gemini"] = "gemini"
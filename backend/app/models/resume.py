@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Optional, Literal
 
 class PersonalInfo(BaseModel):
     fullName: str
@@ -63,10 +63,17 @@ class TailorRequest(BaseModel):
     profileData: ResumeData
     jobDescription: str
 
+class TailorResumeRequest(TailorRequest):
+    # "fanout" = one prompt per section, "combined" = single structured prompt;
+    # None uses the provider setting, then fanout
+    mode: Optional[Literal["fanout", "combined"]] = None
+
 class CoverLetterRequest(BaseModel):
     profileData: ResumeData
     jobDescription: str
     instructions: Optional[str] = ""
+    # True returns only the body paragraphs (no greeting, closing or signature)
+    bodyOnly: bool = False
 
 class TailoredResumeData(BaseModel):
     personalInfo: PersonalInfo
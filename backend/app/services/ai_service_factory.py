@@ -2,11 +2,129 @@ from app.services.base_ai_service import BaseAIService
 from app.services.gemini_service import GeminiService
 from app.services.openai_service import OpenAIService
 from app.services.openrouter_service import OpenRouterService
+from app.services.mock_service import MockService
 from app.models.ai_config import AIProviderConfig, OpenRouterConfig
+from app.services.model_routing import model_router
+from app.core.config import settings
+from collections import OrderedDict
+from typing import Optional, Tuple
+import functools
+import hashlib
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
 
 class AIServiceFactory:
     """Factory class to create appropriate AI service based on configuration"""
 
+    # Live provider instances keyed by (provider, model, key hash, extras),
+    # most recently used last, so warmed connection pools survive across requests
+    _instances: "OrderedDict[Tuple, Tuple[BaseAIService, float]]" = OrderedDict()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _cache_key(config: AIProviderConfig) -> Tuple:
+        """Build instance cache key without keeping the raw API key around"""
+        key_hash = hashlib.sha256(config.api_key.encode()).hexdigest()
+        extras = ()
+        if config.provider == "openrouter":
+            openrouter_config = config if isinstance(config, OpenRouterConfig) else OpenRouterConfig(**config.model_dump())
+            extras = (openrouter_config.site_url, openrouter_config.app_name)
+        if getattr(config, "fallbacks", None):
+            extras += tuple(
+                (fallback.provider, fallback.model or "", hashlib.sha256(fallback.api_key.encode()).hexdigest())
+                for fallback in config.fallbacks
+            )
+        if config.fast_routing:
+            extras += ("fast_routing",)
+        return (config.provider, config.model or "", key_hash) + extras
+
+    @classmethod
+    def get_service(cls, config: AIProviderConfig) -> BaseAIService:
+        """Return a cached service instance for this configuration, creating it if needed"""
+        key = cls._cache_key(config)
+        now = time.monotonic()
+
+        with cls._lock:
+            # Drop instances that have been idle too long. Evicted instances are
+            # not closed: a request may still be using one, and their clients
+            # release their connections when garbage collected
+            idle_cutoff = now - settings.AI_SERVICE_IDLE_TTL_SECONDS
+            for cached_key in [k for k, (_, used) in cls._instances.items() if used < idle_cutoff]:
+                del cls._instances[cached_key]
+
+            entry = cls._instances.get(key)
+            if entry is not None:
+                service = entry[0]
+                cls._instances[key] = (service, now)
+                cls._instances.move_to_end(key)
+            else:
+                service = cls.create_service(config)
+                if settings.AI_ROUTING_ENABLED and config.fast_routing:
+                    service.route = functools.partial(cls.route_operation, config, service.model)
+                for fallback in config.fallbacks or []:
+                    # Fallbacks are plain services without their own fallback chain
+                    service.fallbacks.append(cls.create_service(AIProviderConfig(**fallback.model_dump())))
+                cls._instances[key] = (service, now)
+                while len(cls._instances) > settings.AI_SERVICE_CACHE_SIZE:
+                    cls._instances.popitem(last=False)
+
+        return service
+
+    @classmethod
+    def route_operation(cls, config: AIProviderConfig, model: str, operation: Optional[str]) -> Optional[BaseAIService]:
+        """
+        Service for another model of the same provider and key when the routing
+        policy moves this operation off the configured model, else None
+        """
+        routed = model_router.choose(config.provider, model, operation)
+        if routed == model:
+            return None
+        # Cached like any other configuration, fallbacks included; the routed
+        # service itself does not route again
+        return cls.get_service(config.model_copy(update={"model": routed, "fast_routing": False}))
+
+    @classmethod
+    def invalidate(cls, config: AIProviderConfig):
+        """Evict the cached instance for a configuration (e.g. after settings change)"""
+        with cls._lock:
+            cls._instances.pop(cls._cache_key(config), None)
+
+    @classmethod
+    def clear(cls):
+        """Evict all cached instances"""
+        with cls._lock:
+            cls._instances.clear()
+
+    @classmethod
+    async def aclose(cls):
+        """Evict and close all cached instances (app shutdown, once requests have finished)"""
+        with cls._lock:
+            services = [service for service, _ in cls._instances.values()]
+            cls._instances.clear()
+        for service in services:
+            for instance in [service] + service.fallbacks:
+                try:
+                    await instance.aclose()
+                except Exception as e:
+                    logger.warning("Error closing %s client: %s", instance.PROVIDER, e)
+
+    @classmethod
+    def stats(cls) -> dict:
+        """Get provider instance cache statistics"""
+        with cls._lock:
+            providers = {}
+            for key in cls._instances:
+                providers[key[0]] = providers.get(key[0], 0) + 1
+            return {
+                "cached_instances": len(cls._instances),
+                "max_instances": settings.AI_SERVICE_CACHE_SIZE,
+                "idle_ttl_seconds": settings.AI_SERVICE_IDLE_TTL_SECONDS,
+                "by_provider": providers
+            }
+
     @staticmethod
     def create_service(config: AIProviderConfig) -> BaseAIService:
         """Create and return appropriate AI service instance"""
@@ -32,6 +150,14 @@ class AIServiceFactory:
                 app_name=openrouter_config.app_name
             )
 
+        elif config.provider == "mock":
+            if not settings.MOCK_AI_ENABLED:
+                raise ValueError("The mock AI provider is disabled (set MOCK_AI_ENABLED)")
+            return MockService(
+                api_key=config.api_key,
+                model=config.model or "mock-1"
+            )
+
         else:
             raise ValueError(f"Unsupported AI provider: {config.provider}")
 
@@ -55,5 +181,8 @@ PROVIDER_MODELS = {
         {"value": "google/gemini-pro-1.5", "label": "Gemini Pro 1.5", "description": "Via OpenRouter"},
         {"value": "meta-llama/llama-3.1-70b-instruct", "label": "Llama 3.1 70B", "description": "Open source"},
         {"value": "mistralai/mixtral-8x7b-instruct", "label": "Mixtral 8x7B", "description": "Fast and capable"},
+    ],
+    "mock": [
+        {"value": "mock-1", "label": "Mock", "description": "Deterministic offline answers for load tests"},
     ]
 }
@@ -1,23 +1,74 @@
 from app.services.supabase_service import supabase_service
+from app.services.repositories import AISettingsRepository
+from app.services.cache_service import LRUCache, create_shared_backend
 from app.models.ai_config import AIProviderConfig, UserAISettings
+from app.core.config import settings
 from typing import Optional
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 class AISettingsService:
     """Service for managing user AI provider settings"""
 
-    TABLE_NAME = "ai_settings"
+    def __init__(self, repository: AISettingsRepository):
+        self.repository = repository
+        self._shared = create_shared_backend("ai_settings")
+        # Decoded configs per user, so cache hits skip the DB and json parsing. With a
+        # shared backend the shared entry is authoritative: invalidate() only reaches this
+        # worker's local cache, so other workers re-read the shared one within seconds
+        self._local = LRUCache(
+            max_entries=settings.AI_SETTINGS_CACHE_SIZE,
+            default_ttl_seconds=(
+                settings.AI_SETTINGS_LOCAL_TTL_SECONDS if self._shared else settings.AI_SETTINGS_CACHE_TTL_SECONDS
+            )
+        )
+
+    async def _cache_set(self, user_id: str, config: AIProviderConfig):
+        self._local.set(user_id, config)
+        if self._shared:
+            try:
+                await self._shared.set(user_id, config.model_dump_json(), settings.AI_SETTINGS_CACHE_TTL_SECONDS)
+            except Exception as e:
+                logger.warning("Error writing shared AI settings cache: %s", e)
+
+    async def invalidate(self, user_id: str):
+        """Drop cached settings for a user in this process and the shared backend"""
+        self._local.delete(user_id)
+        if self._shared:
+            try:
+                await self._shared.delete(user_id)
+            except Exception as e:
+                logger.warning("Error invalidating shared AI settings cache: %s", e)
 
     async def get_user_settings(self, user_id: str) -> Optional[AIProviderConfig]:
-        """Get AI provider settings for a user"""
+        """Get AI provider settings for a user (read-through cache)"""
+        cached = self._local.get(user_id)
+        if cached is not None:
+            return cached
+
+        if self._shared:
+            try:
+                raw = await self._shared.get(user_id)
+                if raw:
+                    config = AIProviderConfig.model_validate_json(raw)
+                    self._local.set(user_id, config)
+                    return config
+            except Exception as e:
+                logger.warning("Error reading shared AI settings cache: %s", e)
+
         try:
-            response = supabase_service.client.table(self.TABLE_NAME).select("*").eq("user_id", user_id).execute()
+            settings_data = await self.repository.get_ai_settings(user_id)
 
-            if response.data and len(response.data) > 0:
-                settings_data = response.data[0]
-                # Parse provider_config JSON
-                provider_config = json.loads(settings_data["provider_config"])
-                return AIProviderConfig(**provider_config)
+            if settings_data:
+                # provider_config is stored as a JSON string inside the JSONB column
+                provider_config = settings_data["provider_config"]
+                if isinstance(provider_config, str):
+                    provider_config = json.loads(provider_config)
+                config = AIProviderConfig(**provider_config)
+                await self._cache_set(user_id, config)
+                return config
 
             return None
         except Exception as e:
@@ -27,25 +78,10 @@ class AISettingsService:
     async def save_user_settings(self, user_id: str, config: AIProviderConfig) -> bool:
         """Save AI provider settings for a user"""
         try:
-            # Convert config to JSON string
-            config_json = json.dumps(config.model_dump())
-
-            # Check if settings exist
-            existing = await self.get_user_settings(user_id)
-
-            if existing:
-                # Update existing
-                response = supabase_service.client.table(self.TABLE_NAME).update({
-                    "provider_config": config_json,
-                    "updated_at": "now()"
-                }).eq("user_id", user_id).execute()
-            else:
-                # Insert new
-                response = supabase_service.client.table(self.TABLE_NAME).insert({
-                    "user_id": user_id,
-                    "provider_config": config_json
-                }).execute()
+            # Single round trip: insert or update on the unique user_id
+            await self.repository.upsert_ai_settings(user_id, json.dumps(config.model_dump()))
 
+            await self.invalidate(user_id)
             return True
         except Exception as e:
             print(f"Error saving user AI settings: {e}")
@@ -54,10 +90,11 @@ class AISettingsService:
     async def delete_user_settings(self, user_id: str) -> bool:
         """Delete AI provider settings for a user"""
         try:
-            supabase_service.client.table(self.TABLE_NAME).delete().eq("user_id", user_id).execute()
+            await self.repository.delete_ai_settings(user_id)
+            await self.invalidate(user_id)
             return True
         except Exception as e:
             print(f"Error deleting user AI settings: {e}")
             return False
 
-ai_settings_service = AISettingsService()
+ai_settings_service = AISettingsService(supabase_service)
@@ -2,11 +2,13 @@
 Authentication service using Supabase Auth.
 Handles user registration, login, and JWT token validation.
 """
+import asyncio
 import jwt
 from typing import Optional, Dict
 from datetime import datetime, timedelta
 from supabase import Client, create_client
 from app.core.config import settings
+from app.services.token_verifier import token_verifier
 
 class AuthService:
     def __init__(self, supabase_client: Client):
@@ -145,10 +147,14 @@ class AuthService:
             # Even if Supabase logout fails, we can still clear client-side
             return {"message": "Logged out (client-side)"}
 
-    def verify_token(self, token: str) -> Optional[Dict]:
+    async def verify_token(self, token: str) -> Optional[Dict]:
         """
         Verify and decode a JWT token.
 
+        Tokens are verified locally (HS256 secret or cached JWKS keys). The
+        Supabase auth server is only consulted when no local key is available;
+        its answer is cached like a locally verified token, until the token's exp.
+
         Args:
             token: JWT access token
 
@@ -156,38 +162,25 @@ class AuthService:
             Decoded token payload with user info, or None if invalid
         """
         try:
-            # First, try to verify using Supabase client (which handles ES256 tokens)
-            try:
-                user = self.supabase_client.auth.get_user(token)
-                if user and user.user:
-                    return {
-                        "user_id": user.user.id,
-                        "email": user.user.email,
-                        "role": "authenticated",
-                        "exp": None
-                    }
-            except Exception as e:
-                print(f"Supabase token verification failed, trying JWT decode: {e}")
-
-            # Fallback to JWT decode for backward compatibility
-            # Try without signature verification as a last resort for Supabase ES256 tokens
-            payload = jwt.decode(
-                token,
-                options={"verify_signature": False},
-                audience="authenticated"
-            )
-
-            # Check if token is expired
-            exp = payload.get("exp")
-            if exp and datetime.fromtimestamp(exp) < datetime.now():
-                return None
-
-            return {
-                "user_id": payload.get("sub"),  # Subject is the user ID
-                "email": payload.get("email"),
-                "role": payload.get("role"),
-                "exp": exp
-            }
+            user_data = await token_verifier.verify(token)
+            if user_data:
+                return user_data
+
+            # No local key for this token (e.g. JWKS unreachable): ask Supabase off the event loop
+            user = await asyncio.to_thread(self.client.auth.get_user, token)
+            if user and user.user:
+                # Supabase has validated the token, so its exp claim can be trusted here
+                exp = jwt.decode(token, options={"verify_signature": False}).get("exp")
+                user_data = {
+                    "user_id": user.user.id,
+                    "email": user.user.email,
+                    "role": "authenticated",
+                    "exp": exp
+                }
+                if exp:
+                    token_verifier.token_cache.set(token, user_data, float(exp))
+                return user_data
+            return None
         except jwt.InvalidTokenError as e:
             print(f"JWT decode error: {e}")
             return None
@@ -207,7 +200,7 @@ class AuthService:
         """
         try:
             # Verify token first
-            user_data = self.verify_token(access_token)
+            user_data = await self.verify_token(access_token)
             if not user_data:
                 raise ValueError("Invalid or expired token")
 
@@ -241,7 +234,7 @@ class AuthService:
         """
         try:
             # Verify token first
-            user_data = self.verify_token(access_token)
+            user_data = await self.verify_token(access_token)
             if not user_data:
                 raise ValueError("Invalid or expired token")
 
@@ -1,20 +1,405 @@
 from abc import ABC, abstractmethod
-from typing import List
-from app.models.resume import ResumeData, Skills, Experience, Education, Project
+from typing import List, Optional, AsyncIterator, Any, Type, Tuple, Callable
+from pydantic import BaseModel
+from app.models.resume import ResumeData, Skills, Experience, Education, Project, TailoredResumeData
+from app.services.cache_service import (
+    ai_cache,
+    cache_ai_response,
+    memoize_entries,
+    record_answering_model,
+    service_cache_key
+)
+from app.services.prompt_inputs import prompt_planner, estimate_tokens
+from app.services.jd_digest import job_digest
+from app.services.streaming import JSONStringFieldStream
+from app.services.rate_limiter import (
+    ProviderCallError,
+    limiter_registry,
+    call_with_retries,
+    stream_with_retries
+)
+from app.services.singleflight import completion_flights
+from app.services.hedging import hedge_policy
+from app.services.model_routing import model_router
+from app.services.structured_output import (
+    RESPONSE_MODELS,
+    StructuredOutputError,
+    TailoredSections,
+    parse_response,
+    type_adapter
+)
+from app.services.json_repair import extract_json, JSONItemStream, JSONRepairError
+from app.core.config import settings
+from app.services.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    breaker_registry,
+    is_health_failure
+)
+import hashlib
+import logging
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+# Shared by the batch and streaming cover letter cleaners
+GREETING_PATTERNS = [
+    r'dear\s+', r'to\s+whom', r'hello', r'greetings', r'hi\s+'
+]
+
+CLOSING_KEYWORDS = [
+    'sincerely', 'best regards', 'kind regards', 'warm regards',
+    'thank you for your consideration', 'thank you for considering',
+    'thank you', 'thanks', 'regards', 'best',
+    'yours truly', 'yours sincerely', 'yours faithfully',
+    'respectfully', 'cordially', 'gratefully',
+    'i look forward to', 'please feel free to contact',
+    'i would welcome the opportunity', 'looking forward'
+]
+
+
+def _is_greeting(paragraph: str) -> bool:
+    lowered = paragraph.lower()
+    return any(re.search(pattern, lowered) for pattern in GREETING_PATTERNS)
+
+
+def trim_letter_ending(paragraphs: List[str], candidate_name: str = "") -> List[str]:
+    """Drop closings, signatures and short lines from the end of a letter's paragraphs"""
+    paragraphs = list(paragraphs)
+    # Closing paragraphs, and the candidate's name or anything very short after them
+    while paragraphs:
+        last_para_lower = paragraphs[-1].lower()
+        contains_closing = any(keyword in last_para_lower for keyword in CLOSING_KEYWORDS)
+        is_name = False
+        if candidate_name:
+            is_name = candidate_name.lower() in last_para_lower or len(paragraphs[-1]) < 30
+        if not (contains_closing or is_name):
+            break
+        paragraphs.pop()
+
+    # Single-line signatures the checks above missed
+    while paragraphs and len(paragraphs[-1]) < 50:
+        paragraphs.pop()
+    return paragraphs
+
+
+def clean_cover_letter(content: str, candidate_name: str = "") -> str:
+    """
+    Extract only the body paragraphs of a cover letter: drop a leading greeting,
+    then closings, signatures and short lines from the end.
+    """
+    paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
+    if not paragraphs:
+        return content
+
+    if _is_greeting(paragraphs[0]):
+        paragraphs.pop(0)
+
+    return '\n\n'.join(trim_letter_ending(paragraphs, candidate_name)).strip()
+
+
+class CoverLetterStreamCleaner:
+    """
+    Incremental version of clean_cover_letter: any chunking of a letter, fed
+    through feed() and finish(), yields exactly clean_cover_letter(letter).
+
+    Text is released a paragraph at a time, once its paragraph break arrives,
+    because any paragraph may still end with a closing phrase. The greeting
+    is dropped; paragraphs that could end the letter (closings, signatures,
+    short lines) are held until a substantive paragraph follows, and whatever
+    is still held at the end is trimmed by trim_letter_ending.
+    """
+
+    def __init__(self, candidate_name: str = ""):
+        self.candidate_name = candidate_name
+        self._buffer = ""        # text of the paragraph still being written
+        self._held = []          # trailing-looking paragraphs awaiting a verdict
+        self._is_first = True    # no paragraph has been classified yet
+        self._emitted_any = False
+
+    def _could_trail(self, paragraph: str) -> bool:
+        """Would trim_letter_ending drop this paragraph if it ended the letter?"""
+        return not trim_letter_ending([paragraph], self.candidate_name)
+
+    def _emit(self, paragraphs: List[str]) -> str:
+        if not paragraphs:
+            return ""
+        prefix = "\n\n" if self._emitted_any else ""
+        self._emitted_any = True
+        return prefix + "\n\n".join(paragraphs)
+
+    def _complete_paragraph(self, paragraph: str) -> str:
+        paragraph = paragraph.strip()
+        if not paragraph:
+            return ""
+        if self._is_first:
+            self._is_first = False
+            if _is_greeting(paragraph):
+                return ""
+        if self._could_trail(paragraph):
+            self._held.append(paragraph)
+            return ""
+        paragraphs = self._held + [paragraph]
+        self._held = []
+        return self._emit(paragraphs)
+
+    def feed(self, chunk: str) -> str:
+        """Consume a chunk of model output and return cleaned text ready to show"""
+        out = []
+        self._buffer += chunk
+        while "\n\n" in self._buffer:
+            paragraph, self._buffer = self._buffer.split("\n\n", 1)
+            out.append(self._complete_paragraph(paragraph))
+        return "".join(out)
+
+    def finish(self) -> str:
+        """Flush the last paragraph and whatever of the held ending clean_cover_letter keeps"""
+        text = self._complete_paragraph(self._buffer)
+        self._buffer = ""
+        ending = trim_letter_ending(self._held, self.candidate_name)
+        self._held = []
+        return text + self._emit(ending)
+
+
+def stitch_entries(originals: List[Any], tailored: List[Any]) -> List[Any]:
+    """
+    One tailored entry per original, matched by id (by position when the
+    model rewrote ids but kept the count); originals the model left out are
+    kept as they were, and entries it made up are dropped
+    """
+    def entry_id(item: Any) -> Any:
+        return item.get("id") if isinstance(item, dict) else getattr(item, "id", None)
+
+    by_id = {entry_id(item): item for item in tailored}
+    positional = len(tailored) == len(originals)
+    stitched = []
+    for index, original in enumerate(originals):
+        item = by_id.get(entry_id(original))
+        if item is None and positional:
+            item = tailored[index]
+        stitched.append(original if item is None else item)
+    return stitched
+
+
+def should_fail_over(error: ProviderCallError) -> bool:
+    """Provider-side failures (open circuit, 5xx, timeouts, exhausted rate limit) move to a fallback"""
+    return isinstance(error, CircuitOpenError) or error.retryable
+
 
 class BaseAIService(ABC):
     """Base class for all AI service providers"""
 
+    # Provider name, part of AI response cache keys along with the prompt template version
+    PROVIDER: str = ""
+
+    # Sampling temperature sent to the provider (None = provider default)
+    temperature: Optional[float] = None
+
     def __init__(self, api_key: str, model: str):
         self.api_key = api_key
         self.model = model
+        # Services tried in order when this provider fails or its circuit is open
+        self.fallbacks: List["BaseAIService"] = []
+        # Set by AIServiceFactory: operation -> service for another model of this provider, or None
+        self.route: Optional[Callable[[Optional[str]], Optional["BaseAIService"]]] = None
+
+    async def aclose(self):
+        """Release provider clients when the instance is evicted from the factory cache"""
+        pass
 
     @abstractmethod
-    async def generate_summary(self, experience: str) -> str:
-        """Generate professional summary from experience"""
+    async def _request_completion(self, prompt: str, response_model: Optional[Type[BaseModel]] = None) -> str:
+        """
+        Make one provider call for a prompt; failures raise ProviderCallError.
+        With a response_model the provider is asked for JSON matching its schema.
+        """
         pass
 
     @abstractmethod
+    def _request_stream(self, prompt: str) -> AsyncIterator[str]:
+        """Make one streaming provider call for a prompt; failures raise ProviderCallError"""
+        pass
+
+    def _completion_key(self, prompt: str, response_model: Optional[Type[BaseModel]] = None) -> str:
+        """Identity of a provider call: same key, model, parameters, response schema and exact prompt"""
+        digest = hashlib.blake2b(digest_size=20)
+        schema = response_model.__name__ if response_model else ""
+        for part in (self.PROVIDER, self.api_key, self.model, repr(self.temperature), schema, prompt):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _breaker(self) -> CircuitBreaker:
+        return breaker_registry.get(self.PROVIDER, self.model)
+
+    async def _guarded_completion(self, prompt: str, response_model: Optional[Type[BaseModel]] = None) -> str:
+        """One provider call, admitted and recorded by the model's circuit breaker"""
+        with self._breaker().guard():
+            return await self._request_completion(prompt, response_model)
+
+    async def _guarded_stream(self, prompt: str) -> AsyncIterator[str]:
+        """One streaming provider call; the breaker judges it by time to first chunk"""
+        breaker = self._breaker()
+        breaker.allow()
+        started = time.monotonic()
+        recorded = False
+        try:
+            async for chunk in self._request_stream(prompt):
+                if not recorded:
+                    breaker.record(False, time.monotonic() - started)
+                    recorded = True
+                yield chunk
+        except Exception as e:
+            if not recorded:
+                recorded = True
+                if is_health_failure(e):
+                    breaker.record(True, time.monotonic() - started)
+                else:
+                    breaker.release_probe()
+            raise
+        finally:
+            if not recorded:
+                # Empty stream, or the caller stopped reading before any text
+                breaker.release_probe()
+
+    async def _complete_once(
+        self,
+        prompt: str,
+        response_model: Optional[Type[BaseModel]] = None,
+        coalesce: bool = True
+    ) -> str:
+        """
+        Send a prompt under the API key's adaptive limiter, retrying throttled and
+        transient failures; identical calls already in flight share one request
+        unless coalesce is False (hedges must be real duplicates).
+        """
+        limiter = limiter_registry.get(self.PROVIDER, self.api_key)
+
+        def call():
+            return call_with_retries(limiter, lambda: self._guarded_completion(prompt, response_model))
+
+        if not coalesce:
+            text = await call()
+        else:
+            text = await completion_flights.do(self._completion_key(prompt, response_model), call)
+        record_answering_model(self.PROVIDER, self.model)
+        return text
+
+    def _routed(self, operation: Optional[str]) -> "BaseAIService":
+        """Service that should run an operation (a faster model of this provider for fast-tier operations)"""
+        if self.route is None:
+            return self
+        return self.route(operation) or self
+
+    async def _generate_completion(
+        self,
+        prompt: str,
+        operation: Optional[str] = None,
+        response_model: Optional[Type[BaseModel]] = None
+    ) -> str:
+        """
+        Complete a prompt on the model the routing policy picks for the operation.
+        Operations listed in AI_HEDGE_OPERATIONS are hedged with a duplicate call
+        when they run slower than usual.
+        """
+        service = self._routed(operation)
+        started = time.monotonic()
+        try:
+            if not hedge_policy.enabled_for(operation):
+                text = await service._complete_with_failover(prompt, response_model)
+            else:
+                target = service.fallbacks[0] if settings.AI_HEDGE_TO_FALLBACK and service.fallbacks else service
+                text = await hedge_policy.run(
+                    (service.PROVIDER, service.model, operation),
+                    lambda: service._complete_with_failover(prompt, response_model),
+                    lambda: target._complete_once(prompt, response_model, coalesce=False)
+                )
+        except ProviderCallError:
+            model_router.record(service.PROVIDER, service.model, operation, time.monotonic() - started, failed=True)
+            raise
+        model_router.record(
+            service.PROVIDER,
+            service.model,
+            operation,
+            time.monotonic() - started,
+            input_tokens=estimate_tokens(prompt),
+            output_tokens=estimate_tokens(text)
+        )
+        return text
+
+    async def _generate_structured(self, prompt: str, operation: str) -> Any:
+        """
+        Complete a prompt whose answer is one of RESPONSE_MODELS and return it
+        validated (lists unwrapped). With AI_STRUCTURED_OUTPUT the provider is
+        constrained to the model's JSON schema; raises StructuredOutputError.
+        """
+        response_model = RESPONSE_MODELS[operation]
+        text = await self._generate_completion(
+            prompt,
+            operation=operation,
+            response_model=response_model if settings.AI_STRUCTURED_OUTPUT else None
+        )
+        return parse_response(response_model, text)
+
+    async def _complete_with_failover(self, prompt: str, response_model: Optional[Type[BaseModel]] = None) -> str:
+        """Complete a prompt with this provider, failing over to configured fallbacks"""
+        try:
+            return await self._complete_once(prompt, response_model)
+        except ProviderCallError as e:
+            error = e
+
+        for fallback in self.fallbacks:
+            if not should_fail_over(error):
+                break
+            logger.warning(
+                "%s:%s failed (%s), falling back to %s:%s",
+                self.PROVIDER, self.model, error, fallback.PROVIDER, fallback.model
+            )
+            try:
+                return await fallback._complete_once(prompt, response_model)
+            except ProviderCallError as e:
+                error = e
+
+        self._handle_rate_limit_error(str(error))
+        raise error
+
+    async def _stream_completion(self, prompt: str, answered: Optional[List["BaseAIService"]] = None) -> AsyncIterator[str]:
+        """
+        Stream response text for a prompt, failing over if no text has arrived yet.
+        The service that produced the text is appended to answered, if given.
+        """
+        relayed = False
+        error = None
+        for service in [self] + self.fallbacks:
+            if error is not None:
+                if relayed or not should_fail_over(error):
+                    break
+                logger.warning(
+                    "%s:%s failed (%s), falling back to %s:%s",
+                    self.PROVIDER, self.model, error, service.PROVIDER, service.model
+                )
+            limiter = limiter_registry.get(service.PROVIDER, service.api_key)
+            try:
+                async for chunk in stream_with_retries(limiter, lambda: service._guarded_stream(prompt)):
+                    if not relayed and answered is not None:
+                        answered.append(service)
+                    relayed = True
+                    yield chunk
+                return
+            except ProviderCallError as e:
+                error = e
+
+        self._handle_rate_limit_error(str(error))
+        raise error
+
+    async def generate_summary(self, experience: str) -> str:
+        """Generate professional summary from experience"""
+        prompt = prompt_planner.render("generate_summary", experience=experience)
+
+        return await self._generate_completion(prompt, operation="generate_summary")
+
+    @cache_ai_response
     async def tailor_summary(
         self,
         additional_info: str,
@@ -23,155 +408,309 @@ class BaseAIService(ABC):
         job_description: str
     ) -> str:
         """Generate tailored professional summary"""
-        pass
+        prompt = prompt_planner.render(
+            "tailor_summary",
+            additional_info=additional_info,
+            skills=skills,
+            experience=[{'role': exp.role, 'company': exp.company, 'years': f"{exp.startDate} - {exp.endDate}"} for exp in experience],
+            job_description=job_digest(job_description)
+        )
 
-    @abstractmethod
+        return await self._generate_completion(prompt, operation="tailor_summary")
+
+    @memoize_entries
     async def tailor_experience(
         self,
         experience: List[Experience],
         job_description: str
     ) -> List[Experience]:
         """Tailor experience descriptions"""
-        pass
+        prompt = prompt_planner.render(
+            "tailor_experience",
+            experience=experience,
+            job_description=job_digest(job_description)
+        )
 
-    @abstractmethod
+        try:
+            return await self._generate_structured(prompt, "tailor_experience")
+        except StructuredOutputError:
+            print(f"JSON parsing error, returning original experience")
+            return experience
+        except Exception as e:
+            error_msg = str(e)
+            self._handle_rate_limit_error(error_msg)
+            if "JSON" in error_msg or "json" in error_msg:
+                return experience
+            raise
+
+    @cache_ai_response
     async def tailor_skills(
         self,
         skills: Skills,
         job_description: str
     ) -> Skills:
         """Tailor skills section"""
-        pass
+        prompt = prompt_planner.render(
+            "tailor_skills",
+            skills=skills,
+            job_description=job_digest(job_description)
+        )
 
-    @abstractmethod
+        try:
+            return await self._generate_structured(prompt, "tailor_skills")
+        except StructuredOutputError:
+            return skills
+        except Exception as e:
+            error_msg = str(e)
+            self._handle_rate_limit_error(error_msg)
+            if "JSON" in error_msg or "json" in error_msg:
+                return skills
+            raise
+
+    @memoize_entries
     async def tailor_projects(
         self,
         projects: List[Project],
         job_description: str
     ) -> List[Project]:
         """Tailor project descriptions"""
-        pass
+        if not projects:
+            return projects
+
+        prompt = prompt_planner.render(
+            "tailor_projects",
+            projects=projects,
+            job_description=job_digest(job_description)
+        )
+
+        try:
+            return await self._generate_structured(prompt, "tailor_projects")
+        except StructuredOutputError:
+            return projects
+        except Exception as e:
+            error_msg = str(e)
+            self._handle_rate_limit_error(error_msg)
+            if "JSON" in error_msg or "json" in error_msg:
+                return projects
+            raise
 
-    @abstractmethod
     async def tailor_education(
         self,
         education: List[Education],
         job_description: str
     ) -> List[Education]:
         """Tailor education section"""
-        pass
+        # Education typically doesn't need AI tailoring
+        return education
 
-    @abstractmethod
     async def calculate_ats_score(
         self,
         resume_data: ResumeData,
         job_description: str
     ) -> dict:
         """Calculate ATS compatibility score"""
-        pass
+        prompt = prompt_planner.render(
+            "calculate_ats_score",
+            resume=resume_data,
+            job_description=job_digest(job_description)
+        )
+
+        try:
+            text = await self._generate_completion(prompt, operation="calculate_ats_score")
+            return extract_json(text)
+        except Exception as e:
+            error_msg = str(e)
+            self._handle_rate_limit_error(error_msg)
+            raise
 
-    @abstractmethod
     async def generate_cover_letter(
         self,
         profile_data: ResumeData,
         job_description: str,
-        instructions: str = ""
+        instructions: str = "",
+        body_only: bool = False
     ) -> str:
-        """Generate personalized cover letter"""
-        pass
+        """Generate personalized cover letter (body paragraphs only if body_only)"""
+        prompt = self._cover_letter_prompt(profile_data, job_description, instructions)
+
+        letter = await self._generate_completion(prompt, operation="generate_cover_letter")
+        return clean_cover_letter(letter, profile_data.personalInfo.fullName) if body_only else letter
 
-    @abstractmethod
     async def generate_proposal(
         self,
         profile_data: ResumeData,
         job_description: str
     ) -> dict:
         """Generate freelance job proposal with suggested experience and projects"""
-        pass
+        prompt = self._proposal_prompt(profile_data, job_description)
 
-    def _clean_cover_letter(self, content: str, candidate_name: str = "") -> str:
+        try:
+            result_text = await self._generate_completion(prompt, operation="generate_proposal")
+            return self._parse_proposal(result_text)
+        except Exception as e:
+            error_msg = str(e)
+            print(f"Error generating proposal: {error_msg}")
+            raise Exception(f"Failed to generate proposal: {error_msg}")
+
+    @cache_ai_response
+    async def tailor_resume_combined(
+        self,
+        profile_data: ResumeData,
+        job_description: str
+    ) -> TailoredResumeData:
+        """Tailor summary, experience, skills and projects with a single prompt"""
+        prompt = self._combined_prompt(profile_data, job_description)
+        tailored = (await self._generate_structured(prompt, "tailor_resume_combined")).model_dump()
+        return self._assemble_combined(profile_data, tailored)
+
+    async def stream_resume_combined(
+        self,
+        profile_data: ResumeData,
+        job_description: str
+    ) -> AsyncIterator[Tuple[str, Any]]:
         """
-        AGGRESSIVELY clean cover letter to extract ONLY body paragraphs.
-        Removes greetings, closings, signatures - everything except substantive content.
+        Yield (section, value) for each section of tailor_resume_combined as
+        soon as the provider has finished writing it. Sections that are missing
+        or invalid are not yielded; a complete result produced by this model is
+        cached for tailor_resume_combined.
         """
-        import re
+        cache_key = service_cache_key(self, "tailor_resume_combined", profile_data, job_description)
+        cached = ai_cache.get(cache_key)
+        if cached is not None:
+            for section in TailoredSections.model_fields:
+                yield section, getattr(cached, section)
+            return
 
-        print(f"\n{'='*60}")
-        print("DEBUG: Original AI response:")
-        print(content)
-        print(f"{'='*60}\n")
+        items = JSONItemStream()
+        sections = {}
+        answered = []
+        async for chunk in self._stream_completion(self._combined_prompt(profile_data, job_description), answered):
+            for section, value in items.feed(chunk):
+                field = TailoredSections.model_fields.get(section)
+                if field is None or section in sections:
+                    continue
+                try:
+                    sections[section] = type_adapter(field.annotation).validate_python(value)
+                except ValueError as e:
+                    logger.warning("Invalid %s in combined output: %s", section, e)
+                    continue
+                if section in ("experience", "projects"):
+                    sections[section] = stitch_entries(getattr(profile_data, section), sections[section])
+                yield section, sections[section]
+            if items.failed:
+                break
 
-        # STEP 1: Split into paragraphs
-        paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
+        # A fallback model's answer does not belong under this model's key
+        if len(sections) == len(TailoredSections.model_fields) and answered == [self]:
+            tailored = TailoredSections(**sections).model_dump()
+            ai_cache.set(cache_key, self._assemble_combined(profile_data, tailored))
 
-        if not paragraphs:
-            return content
-
-        print(f"DEBUG: Found {len(paragraphs)} paragraphs")
-
-        # STEP 2: Remove greeting paragraph (first paragraph with Dear/Hello/etc)
-        greeting_patterns = [
-            r'dear\s+', r'to\s+whom', r'hello', r'greetings', r'hi\s+'
-        ]
-
-        if paragraphs:
-            first_para_lower = paragraphs[0].lower()
-            if any(re.search(pattern, first_para_lower) for pattern in greeting_patterns):
-                print(f"DEBUG: Removing greeting paragraph: {paragraphs[0][:50]}...")
-                paragraphs.pop(0)
-
-        # STEP 3: Remove closing paragraphs from the END
-        # These are ANY paragraphs containing closing keywords
-        closing_keywords = [
-            'sincerely', 'best regards', 'kind regards', 'warm regards',
-            'thank you for your consideration', 'thank you for considering',
-            'thank you', 'thanks', 'regards', 'best',
-            'yours truly', 'yours sincerely', 'yours faithfully',
-            'respectfully', 'cordially', 'gratefully',
-            'i look forward to', 'please feel free to contact',
-            'i would welcome the opportunity', 'looking forward'
-        ]
-
-        # Remove paragraphs from the end that contain closing keywords
-        while paragraphs:
-            last_para_lower = paragraphs[-1].lower()
-
-            # Check if last paragraph contains any closing keyword
-            contains_closing = any(keyword in last_para_lower for keyword in closing_keywords)
-
-            # Also remove if it's the candidate's name or very short
-            is_name = False
-            if candidate_name:
-                name_lower = candidate_name.lower()
-                is_name = name_lower in last_para_lower or len(paragraphs[-1]) < 30
-
-            if contains_closing or is_name:
-                print(f"DEBUG: Removing closing paragraph: {paragraphs[-1][:80]}...")
-                paragraphs.pop()
-            else:
-                break
+    def _combined_prompt(self, profile_data: ResumeData, job_description: str) -> str:
+        return prompt_planner.render(
+            "tailor_resume_combined",
+            additional_info=profile_data.additionalInfo,
+            skills=profile_data.skills,
+            experience=profile_data.experience,
+            projects=profile_data.projects,
+            job_description=job_digest(job_description)
+        )
 
-        # STEP 4: Remove any remaining single-line signatures at the end
-        if paragraphs:
-            # Check if last paragraph is suspiciously short (might be a signature line we missed)
-            while paragraphs and len(paragraphs[-1]) < 50:
-                print(f"DEBUG: Removing short trailing line: {paragraphs[-1]}")
-                paragraphs.pop()
+    def _assemble_combined(self, profile_data: ResumeData, tailored: dict) -> TailoredResumeData:
+        # Sections the model must not touch always come from the profile, and
+        # entries it dropped from experience or projects are kept as they were
+        return TailoredResumeData.model_validate({
+            "personalInfo": profile_data.personalInfo.model_dump(),
+            "summary": tailored["summary"],
+            "coverLetter": profile_data.coverLetter,
+            "skills": tailored["skills"],
+            "experience": stitch_entries(
+                [exp.model_dump() for exp in profile_data.experience], tailored["experience"]
+            ),
+            "education": [edu.model_dump() for edu in profile_data.education],
+            "projects": stitch_entries(
+                [project.model_dump() for project in profile_data.projects], tailored["projects"]
+            ),
+            "certifications": profile_data.certifications
+        })
 
-        # STEP 5: Rejoin and clean up
-        content = '\n\n'.join(paragraphs)
-        content = content.strip()
+    def _cover_letter_prompt(
+        self,
+        profile_data: ResumeData,
+        job_description: str,
+        instructions: str = ""
+    ) -> str:
+        """Prompt shared by generate_cover_letter and stream_cover_letter"""
+        return prompt_planner.render(
+            "generate_cover_letter",
+            profile=profile_data,
+            job_description=job_description,
+            instructions=instructions if instructions else "None"
+        )
 
-        # Remove multiple consecutive newlines
-        content = re.sub(r'\n{3,}', '\n\n', content)
+    def _proposal_prompt(self, profile_data: ResumeData, job_description: str) -> str:
+        """Prompt shared by generate_proposal and stream_proposal"""
+        return prompt_planner.render(
+            "generate_proposal",
+            profile=profile_data,
+            job_description=job_description
+        )
 
-        print(f"\n{'='*60}")
-        print("DEBUG: Cleaned response:")
-        print(content)
-        print(f"{'='*60}\n")
-        print(f"DEBUG: Final paragraph count: {len(paragraphs)}")
+    def _parse_proposal(self, result_text: str) -> dict:
+        """Parse proposal JSON, falling back to the raw text as the proposal"""
+        try:
+            proposal = extract_json(result_text)
+            if not isinstance(proposal, dict) or "proposal" not in proposal:
+                raise JSONRepairError("Missing proposal field")
+            return proposal
+        except JSONRepairError as e:
+            print(f"Error parsing proposal JSON: {e}")
+            return {
+                "proposal": result_text,
+                "suggestedExperience": [],
+                "suggestedProjects": []
+            }
 
-        return content
+    async def stream_cover_letter(
+        self,
+        profile_data: ResumeData,
+        job_description: str,
+        instructions: str = "",
+        body_only: bool = False
+    ) -> AsyncIterator[str]:
+        """Yield cover letter text as the provider generates it (body paragraphs only if body_only)"""
+        prompt = self._cover_letter_prompt(profile_data, job_description, instructions)
+        cleaner = CoverLetterStreamCleaner(profile_data.personalInfo.fullName) if body_only else None
+
+        async for chunk in self._stream_completion(prompt):
+            text = cleaner.feed(chunk) if cleaner else chunk
+            if text:
+                yield text
+
+        if cleaner:
+            tail = cleaner.finish()
+            if tail:
+                yield tail
+
+    async def stream_proposal(
+        self,
+        profile_data: ResumeData,
+        job_description: str
+    ) -> AsyncIterator[dict]:
+        """
+        Yield {"type": "delta", "text": ...} for proposal text as it is generated,
+        then {"type": "result", "data": ...} with the parsed proposal JSON.
+        """
+        prompt = self._proposal_prompt(profile_data, job_description)
+        field_stream = JSONStringFieldStream("proposal")
+        chunks = []
+
+        async for chunk in self._stream_completion(prompt):
+            chunks.append(chunk)
+            text = field_stream.feed(chunk)
+            if text:
+                yield {"type": "delta", "text": text}
+
+        yield {"type": "result", "data": self._parse_proposal("".join(chunks))}
 
     def _handle_rate_limit_error(self, error_msg: str):
         """Check if error is a rate limit error and raise appropriate exception"""
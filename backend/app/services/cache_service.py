@@ -1,89 +1,377 @@
 """Smart caching service for AI responses"""
+import asyncio
+import functools
 import hashlib
 import json
-from typing import Optional, Any
-from datetime import datetime, timedelta
+import logging
+import pickle
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pydantic import BaseModel
+from typing import Optional, Any, NamedTuple, Set, Tuple
+from app.core.config import settings
+from app.services.prompts import prompt_version
 
-class SimpleCache:
-    """In-memory cache with TTL support"""
+logger = logging.getLogger(__name__)
 
-    def __init__(self, default_ttl_hours: int = 24):
-        self._cache: dict = {}
-        self._timestamps: dict = {}
-        self.default_ttl = timedelta(hours=default_ttl_hours)
 
-    def _generate_key(self, *args, **kwargs) -> str:
-        """Generate cache key from arguments"""
-        key_data = json.dumps({"args": args, "kwargs": kwargs}, sort_keys=True)
-        return hashlib.md5(key_data.encode()).hexdigest()
+class _Entry(NamedTuple):
+    value: Any
+    expires_at: float
+    size: int
 
-    def _is_expired(self, key: str) -> bool:
-        """Check if cache entry is expired"""
-        if key not in self._timestamps:
-            return True
-        return datetime.now() - self._timestamps[key] > self.default_ttl
 
-    def get(self, *args, **kwargs) -> Optional[Any]:
+class LRUCache:
+    """
+    Bounded in-memory cache with LRU eviction and per-entry TTL.
+
+    Entries live in an OrderedDict in recency order (get/set/evict are O(1)),
+    and a second OrderedDict in insertion order lets expiry sweeps stop at the
+    first live entry. Expired entries are also dropped lazily on read.
+    Operations never await, so one lock covers both threads and tasks.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 5000,
+        max_bytes: int = 64 * 1024 * 1024,
+        default_ttl_seconds: float = 24 * 3600
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl_seconds
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._expiry_order: "OrderedDict[str, float]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @staticmethod
+    def _sizeof(value: Any) -> int:
+        """Approximate retained size of a value in bytes"""
+        try:
+            return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            return sys.getsizeof(value)
+
+    def _remove(self, key: str) -> Optional[_Entry]:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._expiry_order.pop(key, None)
+            self._bytes -= entry.size
+        return entry
+
+    def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
-        key = self._generate_key(*args, **kwargs)
-
-        if key in self._cache and not self._is_expired(key):
-            print(f"Cache HIT for key: {key[:8]}...")
-            return self._cache[key]
-
-        print(f"Cache MISS for key: {key[:8]}...")
-        return None
-
-    def set(self, value: Any, *args, **kwargs):
-        """Set value in cache"""
-        key = self._generate_key(*args, **kwargs)
-        self._cache[key] = value
-        self._timestamps[key] = datetime.now()
-        print(f"Cache SET for key: {key[:8]}...")
-
-    def clear_expired(self):
-        """Remove expired entries"""
-        expired_keys = [k for k in self._cache.keys() if self._is_expired(k)]
-        for key in expired_keys:
-            del self._cache[key]
-            del self._timestamps[key]
-        print(f"Cleared {len(expired_keys)} expired cache entries")
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry.value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        """Set value in cache, evicting least recently used entries to stay in budget"""
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            return
+
+        expires_at = time.monotonic() + (self.default_ttl if ttl_seconds is None else ttl_seconds)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = _Entry(value, expires_at, size)
+            self._expiry_order[key] = expires_at
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                lru_key = next(iter(self._entries))
+                self._remove(lru_key)
+                self._evictions += 1
+
+    def delete(self, key: str):
+        """Remove a single entry"""
+        with self._lock:
+            self._remove(key)
+
+    def clear_expired(self) -> int:
+        """Remove expired entries from the front of the insertion order"""
+        now = time.monotonic()
+        removed = 0
+        with self._lock:
+            while self._expiry_order:
+                key, expires_at = next(iter(self._expiry_order.items()))
+                if expires_at > now:
+                    break
+                self._remove(key)
+                removed += 1
+            self._expirations += removed
+        return removed
+
+    async def run_sweeper(self, interval_seconds: float):
+        """Periodically drop expired entries; runs for the app lifetime"""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            self.clear_expired()
 
     def clear(self):
         """Clear all cache"""
-        self._cache.clear()
-        self._timestamps.clear()
-        print("Cache cleared")
+        with self._lock:
+            self._entries.clear()
+            self._expiry_order.clear()
+            self._bytes = 0
 
     def stats(self) -> dict:
         """Get cache statistics"""
-        return {
-            "total_entries": len(self._cache),
-            "expired_entries": sum(1 for k in self._cache.keys() if self._is_expired(k))
-        }
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "total_entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations
+            }
+
+
+class SharedCacheBackend(ABC):
+    """Cache shared between worker processes, storing string values with a TTL"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        """Get a value, or None if missing or expired"""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl_seconds: int):
+        """Store a value for ttl_seconds"""
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str):
+        """Remove a value"""
+        pass
+
+
+class RedisCacheBackend(SharedCacheBackend):
+    """Redis-backed shared cache (requires the optional redis package)"""
+
+    def __init__(self, url: str, namespace: str):
+        import redis.asyncio as redis
+        self.client = redis.from_url(url, decode_responses=True)
+        self.namespace = namespace
+
+    def _key(self, key: str) -> str:
+        return f"resumyx:{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self.client.get(self._key(key))
+
+    async def set(self, key: str, value: str, ttl_seconds: int):
+        await self.client.set(self._key(key), value, ex=ttl_seconds)
+
+    async def delete(self, key: str):
+        await self.client.delete(self._key(key))
+
+
+def create_shared_backend(namespace: str) -> Optional[SharedCacheBackend]:
+    """Build the configured shared cache backend, or None for process-local caching only"""
+    if settings.SHARED_CACHE_BACKEND == "redis":
+        if not settings.REDIS_URL:
+            logger.warning("SHARED_CACHE_BACKEND=redis but REDIS_URL is not set, using process-local cache")
+            return None
+        try:
+            return RedisCacheBackend(settings.REDIS_URL, namespace)
+        except ImportError:
+            logger.warning("SHARED_CACHE_BACKEND=redis but the redis package is not installed, using process-local cache")
+            return None
+    return None
 
 
 # Global cache instance
-ai_cache = SimpleCache(default_ttl_hours=24)
+ai_cache = LRUCache(
+    max_entries=settings.AI_CACHE_MAX_ENTRIES,
+    max_bytes=settings.AI_CACHE_MAX_BYTES,
+    default_ttl_seconds=settings.AI_CACHE_TTL_SECONDS
+)
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so formatting-only edits map to the same key"""
+    return " ".join(text.split())
+
+
+def _canonical(value: Any) -> Any:
+    """Convert inputs to a JSON-stable form independent of object identity"""
+    if isinstance(value, BaseModel):
+        return _canonical(value.model_dump(mode="json"))
+    if isinstance(value, str):
+        return normalize_text(value)
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def make_cache_key(operation: str, *inputs: Any, **params: Any) -> str:
+    """
+    Content-addressed key for an AI call: the operation, its normalized
+    inputs and the generation parameters, hashed with blake2b.
+    """
+    payload = json.dumps(
+        [operation, _canonical(list(inputs)), _canonical(params)],
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=20).hexdigest()
+
+
+def service_cache_key(service: Any, operation: str, *args: Any, **kwargs: Any) -> str:
+    """Cache key for an AI service operation, including the service's generation parameters"""
+    return make_cache_key(
+        operation,
+        *args,
+        provider=service.PROVIDER,
+        model=service.model,
+        template_version=prompt_version(operation),
+        temperature=service.temperature,
+        **kwargs
+    )
+
+
+# Sets of (provider, model) pairs collecting the models that answer provider
+# calls; one per enclosing track_answering_models() block
+_answering_models: ContextVar[Tuple[Set[Tuple[str, str]], ...]] = ContextVar("answering_models", default=())
+
+
+@contextmanager
+def track_answering_models():
+    """Collect the models that answer the provider calls made in this block (tasks it spawns included)"""
+    models: Set[Tuple[str, str]] = set()
+    token = _answering_models.set(_answering_models.get() + (models,))
+    try:
+        yield models
+    finally:
+        _answering_models.reset(token)
+
+
+def record_answering_model(provider: str, model: str):
+    """Called by AI services when a provider call succeeds or a cached answer is served"""
+    for models in _answering_models.get():
+        models.add((provider, model))
 
 
 def cache_ai_response(func):
-    """Decorator to cache AI service responses"""
-    async def wrapper(*args, **kwargs):
-        # Generate cache key
-        cache_key_args = (func.__name__, str(args), str(kwargs))
+    """
+    Decorator to cache AI service method responses by canonical content key.
+    Results are keyed by the model expected to answer (the routed model for
+    fast-tier operations) and only cached if that model answered every call,
+    so failover or a changed routing choice never stores a different model's
+    answer under this key.
+    """
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        expected = self._routed(func.__name__)
+        cache_key = service_cache_key(expected, func.__name__, *args, **kwargs)
 
         # Try to get from cache
-        cached_result = ai_cache.get(*cache_key_args)
+        cached_result = ai_cache.get(cache_key)
         if cached_result is not None:
+            record_answering_model(expected.PROVIDER, expected.model)
             return cached_result
 
         # Call function if not cached
-        result = await func(*args, **kwargs)
+        with track_answering_models() as answered:
+            result = await func(self, *args, **kwargs)
 
-        # Store in cache
-        ai_cache.set(result, *cache_key_args)
+        # Providers hand back the input unchanged when tailoring fails; don't pin that
+        if answered == {(expected.PROVIDER, expected.model)} and not any(result is arg for arg in args):
+            ai_cache.set(cache_key, result)
 
         return result
 
     return wrapper
+
+
+def memoize_entries(func):
+    """
+    Decorator for list-tailoring methods (experience, projects): each entry is
+    memoized by its own content, the job description and the model, and only
+    entries without a cached result are sent to the wrapped method. As with
+    cache_ai_response, entries are only stored when the expected model
+    tailored them.
+    """
+    @functools.wraps(func)
+    async def wrapper(self, entries, job_description, *args, **kwargs):
+        if not entries:
+            return await func(self, entries, job_description, *args, **kwargs)
+
+        expected = self._routed(func.__name__)
+        jd_digest = make_cache_key("job_description", job_description)
+        keys = [
+            make_cache_key(
+                f"{func.__name__}:entry",
+                entry,
+                jd_digest=jd_digest,
+                provider=expected.PROVIDER,
+                model=expected.model,
+                template_version=prompt_version(func.__name__),
+                temperature=expected.temperature,
+                **kwargs
+            )
+            for entry in entries
+        ]
+        results = [ai_cache.get(key) for key in keys]
+        misses = [entry for entry, result in zip(entries, results) if result is None]
+        if len(misses) < len(entries):
+            record_answering_model(expected.PROVIDER, expected.model)
+        if not misses:
+            return results
+
+        with track_answering_models() as answered:
+            tailored = await func(self, misses, job_description, *args, **kwargs)
+        if tailored is misses:
+            # Provider fell back to the originals; keep them uncached
+            return [result if result is not None else entry for entry, result in zip(entries, results)]
+        cacheable = answered == {(expected.PROVIDER, expected.model)}
+
+        # Stitch by id; fall back to position when the model rewrote ids
+        by_id = {getattr(item, "id", None): item for item in tailored}
+        positional = len(tailored) == len(misses)
+        miss_index = 0
+        for i, entry in enumerate(entries):
+            if results[i] is not None:
+                continue
+            item = by_id.get(entry.id)
+            if item is None and positional:
+                item = tailored[miss_index]
+            miss_index += 1
+            if item is None:
+                results[i] = entry
+            else:
+                results[i] = item
+                if cacheable:
+                    ai_cache.set(keys[i], item)
+        return results
+
+    return wrapper
@@ -0,0 +1,176 @@
+"""
+Circuit breakers for AI provider models.
+
+Outcomes of provider calls are tracked per (provider, model) over a sliding
+window. When too many fail or run slow the circuit opens and calls are
+rejected immediately (so callers can fail over) instead of waiting out
+timeouts; after a cool-down a few probe calls decide whether it closes again.
+Rate limiting (429) and request errors (4xx) say nothing about provider
+health and are not counted.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Tuple, Deque
+from app.core.config import settings
+from app.services.rate_limiter import ProviderCallError
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(ProviderCallError):
+    """Raised without calling the provider while its circuit is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} is temporarily unavailable (circuit open)", status_code=503, retry_after=retry_after)
+
+    @property
+    def retryable(self) -> bool:
+        # Retrying against an open circuit only burns the deadline; fail over instead
+        return False
+
+
+def is_health_failure(error: Exception) -> bool:
+    """Does this error indicate the provider itself is unhealthy?"""
+    if not isinstance(error, ProviderCallError) or isinstance(error, CircuitOpenError):
+        return False
+    return error.status_code is None or error.status_code >= 500
+
+
+class CircuitBreaker:
+    """Error-rate and slow-call-rate breaker with half-open probing"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = CLOSED
+        self._outcomes: Deque[Tuple[float, bool, bool]] = deque()  # (time, failed, slow)
+        self._opened_at = 0.0
+        self._probes = 0  # half-open calls in flight
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+        self._rejected = 0
+        self._opened = 0
+
+    def _trim(self, now: float):
+        cutoff = now - settings.CIRCUIT_WINDOW_SECONDS
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            self._outcomes.popleft()
+
+    def _open(self, now: float):
+        self.state = OPEN
+        self._opened_at = now
+        self._probes = 0
+        self._outcomes.clear()
+        self._opened += 1
+        logger.warning("Circuit opened for %s", self.name)
+
+    def allow(self):
+        """Admit a call or raise CircuitOpenError"""
+        now = time.monotonic()
+        with self._lock:
+            if self.state == OPEN:
+                remaining = self._opened_at + settings.CIRCUIT_OPEN_SECONDS - now
+                if remaining > 0:
+                    self._rejected += 1
+                    raise CircuitOpenError(self.name, remaining)
+                self.state = HALF_OPEN
+                self._probes = 0
+                self._probe_successes = 0
+            if self.state == HALF_OPEN:
+                if self._probes >= settings.CIRCUIT_HALF_OPEN_PROBES:
+                    self._rejected += 1
+                    raise CircuitOpenError(self.name, 1.0)
+                self._probes += 1
+
+    def record(self, failed: bool, latency: float):
+        now = time.monotonic()
+        slow = latency >= settings.CIRCUIT_SLOW_CALL_SECONDS
+        with self._lock:
+            if self.state == HALF_OPEN:
+                if failed or slow:
+                    self._open(now)
+                else:
+                    self._probes -= 1
+                    self._probe_successes += 1
+                    if self._probe_successes >= settings.CIRCUIT_HALF_OPEN_PROBES:
+                        self.state = CLOSED
+                        logger.info("Circuit closed for %s", self.name)
+                return
+
+            self._outcomes.append((now, failed, slow))
+            self._trim(now)
+            calls = len(self._outcomes)
+            if calls < settings.CIRCUIT_MIN_CALLS:
+                return
+            failures = sum(1 for _, f, _ in self._outcomes if f)
+            slow_calls = sum(1 for _, _, s in self._outcomes if s)
+            if failures / calls >= settings.CIRCUIT_ERROR_RATE or slow_calls / calls >= settings.CIRCUIT_SLOW_CALL_RATE:
+                self._open(now)
+
+    def release_probe(self):
+        """Give back a half-open probe slot for a call that said nothing about health"""
+        with self._lock:
+            if self.state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    @contextmanager
+    def guard(self):
+        """Admit a call and record its outcome"""
+        self.allow()
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            if is_health_failure(e):
+                self.record(True, time.monotonic() - started)
+            else:
+                self.release_probe()
+            raise
+        except BaseException:
+            # Cancelled by the caller: no verdict
+            self.release_probe()
+            raise
+        self.record(False, time.monotonic() - started)
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._trim(time.monotonic())
+            calls = len(self._outcomes)
+            return {
+                "state": self.state,
+                "window_calls": calls,
+                "window_failures": sum(1 for _, f, _ in self._outcomes if f),
+                "window_slow": sum(1 for _, _, s in self._outcomes if s),
+                "times_opened": self._opened,
+                "rejected": self._rejected
+            }
+
+
+class BreakerRegistry:
+    """One breaker per (provider, model), shared by every user of that model"""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider: str, model: str) -> CircuitBreaker:
+        name = f"{provider}:{model}"
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(name)
+                self._breakers[name] = breaker
+            return breaker
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {name: breaker.stats() for name, breaker in self._breakers.items()}
+
+
+breaker_registry = BreakerRegistry()
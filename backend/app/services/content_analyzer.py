@@ -1,5 +1,5 @@
 """Content analysis for ranking and validation"""
-from typing import List, Dict
+from typing import List, Dict, Optional
 from app.models.resume import Experience
 import re
 
@@ -20,7 +20,7 @@ class BulletPointRanker:
         }
 
         important = [w for w in words if w in priority_terms or len(w) > 6]
-        return list(set(important))[:30]  # Top 30 unique terms
+        return list(dict.fromkeys(important))[:30]  # First 30 unique terms, in order of appearance
 
     @staticmethod
     def score_bullet(bullet: str, important_terms: List[str]) -> Dict:
@@ -56,10 +56,12 @@ class BulletPointRanker:
     def rank_experience_bullets(
         experience: List[Experience],
         job_description: str,
-        keep_top_n: int = 5
+        keep_top_n: int = 5,
+        important_terms: Optional[List[str]] = None
     ) -> List[Experience]:
-        """Rank and filter bullets for each experience"""
-        important_terms = BulletPointRanker.extract_important_terms(job_description)
+        """Rank and filter bullets for each experience (terms may come precomputed from a JD digest)"""
+        if important_terms is None:
+            important_terms = BulletPointRanker.extract_important_terms(job_description)
 
         ranked_experience = []
         for exp in experience:
@@ -1,9 +1,12 @@
 """Enhanced ATS Scoring with detailed breakdown and analysis"""
 from app.models.resume import ResumeData, ATSScoreBreakdown
-from typing import List, Dict
+from typing import List, Dict, Optional, TYPE_CHECKING
 import re
 from collections import Counter
 
+if TYPE_CHECKING:
+    from app.services.jd_digest import JobDigest
+
 class EnhancedATSScorer:
     """Provides detailed ATS scoring with multiple factors"""
 
@@ -20,12 +23,19 @@ class EnhancedATSScorer:
         return [w for w in words if w not in stop_words and len(w) > 2]
 
     @staticmethod
-    def calculate_keyword_match(resume_data: ResumeData, job_description: str) -> tuple:
+    def calculate_keyword_match(
+        resume_data: ResumeData,
+        job_description: str,
+        digest: Optional["JobDigest"] = None
+    ) -> tuple:
         """Calculate keyword match score and identify missing keywords"""
-        # Extract keywords from job description
-        job_keywords = EnhancedATSScorer.extract_keywords(job_description)
-        job_keyword_freq = Counter(job_keywords)
-        important_keywords = [k for k, v in job_keyword_freq.most_common(30)]
+        # Extract keywords from job description (already ranked in the digest)
+        if digest is not None:
+            important_keywords = digest.keywords[:30]
+        else:
+            job_keywords = EnhancedATSScorer.extract_keywords(job_description)
+            job_keyword_freq = Counter(job_keywords)
+            important_keywords = [k for k, v in job_keyword_freq.most_common(30)]
 
         # Extract keywords from resume
         resume_text = " ".join([
@@ -72,12 +82,19 @@ class EnhancedATSScorer:
         return max(0, min(100, score))
 
     @staticmethod
-    def score_experience_relevance(resume_data: ResumeData, job_description: str) -> int:
+    def score_experience_relevance(
+        resume_data: ResumeData,
+        job_description: str,
+        digest: Optional["JobDigest"] = None
+    ) -> int:
         """Score how relevant the experience is to the job"""
         if not resume_data.experience:
             return 0
 
-        job_keywords = set(EnhancedATSScorer.extract_keywords(job_description))
+        if digest is not None:
+            job_keywords = set(digest.all_keywords)
+        else:
+            job_keywords = set(EnhancedATSScorer.extract_keywords(job_description))
 
         total_relevance = 0
         for exp in resume_data.experience:
@@ -93,7 +110,11 @@ class EnhancedATSScorer:
         return avg_relevance
 
     @staticmethod
-    def score_skills_alignment(resume_data: ResumeData, job_description: str) -> int:
+    def score_skills_alignment(
+        resume_data: ResumeData,
+        job_description: str,
+        digest: Optional["JobDigest"] = None
+    ) -> int:
         """Score how well skills align with job requirements"""
         all_skills = (
             resume_data.skills.languages +
@@ -105,7 +126,7 @@ class EnhancedATSScorer:
         if not all_skills:
             return 0
 
-        job_desc_lower = job_description.lower()
+        job_desc_lower = (digest.text if digest is not None else job_description).lower()
         matched_skills = sum(1 for skill in all_skills if skill.lower() in job_desc_lower)
 
         alignment_score = int((matched_skills / len(all_skills)) * 100) if all_skills else 0
@@ -157,20 +178,21 @@ class EnhancedATSScorer:
     @staticmethod
     def calculate_comprehensive_score(
         resume_data: ResumeData,
-        job_description: str
+        job_description: str,
+        digest: Optional["JobDigest"] = None
     ) -> Dict:
         """Calculate comprehensive ATS score with detailed breakdown"""
 
         # Calculate individual scores
         keyword_score, missing_keywords = EnhancedATSScorer.calculate_keyword_match(
-            resume_data, job_description
+            resume_data, job_description, digest
         )
         formatting_score = EnhancedATSScorer.score_formatting(resume_data)
         experience_score = EnhancedATSScorer.score_experience_relevance(
-            resume_data, job_description
+            resume_data, job_description, digest
         )
         skills_score = EnhancedATSScorer.score_skills_alignment(
-            resume_data, job_description
+            resume_data, job_description, digest
         )
 
         # Create breakdown
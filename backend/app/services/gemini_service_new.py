@@ -1,305 +0,0 @@
-import google.generativeai as genai
-from app.services.base_ai_service import BaseAIService
-from app.models.resume import ResumeData, Skills, Experience, Education, Project
-from typing import List
-import json
-
-class GeminiService(BaseAIService):
-    """Google Gemini AI provider implementation"""
-
-    def __init__(self, api_key: str, model: str = "gemini-2.0-flash-exp"):
-        super().__init__(api_key, model)
-        genai.configure(api_key=api_key)
-        self.client = genai.GenerativeModel(model)
-
-    async def generate_summary(self, experience: str) -> str:
-        """Generate professional summary from experience"""
-        prompt = f"""Based on the following work experience, generate a compelling 2-3 sentence professional summary for a resume. Focus on key achievements and skills.
-
-Experience:
-{experience}
-
-Return only the summary text, no additional formatting or labels."""
-
-        try:
-            response = self.client.generate_content(prompt)
-            return response.text.strip()
-        except Exception as e:
-            error_msg = str(e)
-            print(f"Error generating summary: {error_msg}")
-            self._handle_rate_limit_error(error_msg)
-            raise Exception(f"Failed to generate summary: {error_msg}")
-
-    async def tailor_summary(
-        self,
-        additional_info: str,
-        skills: Skills,
-        experience: List[Experience],
-        job_description: str
-    ) -> str:
-        """Generate tailored professional summary"""
-        prompt = f"""You are an expert resume writer. Create a professional summary (2-3 sentences) tailored for this specific job.
-
-Additional Information About the Candidate:
-{additional_info}
-
-Skills: {json.dumps(skills.model_dump())}
-
-Work Experience Summary:
-{json.dumps([{'role': exp.role, 'company': exp.company, 'years': f"{exp.startDate} - {exp.endDate}"} for exp in experience])}
-
-Target Job Description:
-{job_description}
-
-Instructions:
-1. Create a compelling 2-3 sentence professional summary
-2. Highlight the most relevant skills and experiences for THIS specific job
-3. Use keywords from the job description naturally
-4. Make it impactful and tailored to the role requirements
-5. Base the summary on the candidate's additional information and experience
-6. Return ONLY the professional summary text, no extra commentary
-
-Professional Summary:"""
-
-        try:
-            response = self.client.generate_content(prompt)
-            return response.text.strip()
-        except Exception as e:
-            error_msg = str(e)
-            print(f"Error generating summary: {error_msg}")
-            self._handle_rate_limit_error(error_msg)
-            raise Exception(f"Failed to generate summary: {error_msg}")
-
-    async def tailor_experience(
-        self,
-        experience: List[Experience],
-        job_description: str
-    ) -> List[Experience]:
-        """Tailor experience descriptions"""
-        prompt = f"""You are an expert resume writer. Optimize these work experiences for the target job description.
-
-Current Experiences:
-{json.dumps([exp.model_dump() for exp in experience], indent=2)}
-
-Target Job Description:
-{job_description}
-
-Instructions:
-1. Rewrite bullet points to emphasize relevant skills and achievements
-2. Use action verbs and quantify results where possible
-3. Incorporate keywords from the job description naturally
-4. Maintain truthfulness - don't add false information
-5. Keep the same structure (company, role, dates, location)
-6. Return valid JSON array matching the exact input structure
-
-Return only the JSON array, no markdown or additional text:"""
-
-        try:
-            response = self.client.generate_content(prompt)
-            text = response.text.strip()
-            # Remove markdown code blocks if present
-            if text.startswith("```"):
-                text = text.split("```")[1]
-                if text.startswith("json"):
-                    text = text[4:]
-            text = text.strip()
-
-            experiences_data = json.loads(text)
-            return [Experience(**exp) for exp in experiences_data]
-        except json.JSONDecodeError:
-            print(f"JSON parsing error, returning original experience")
-            return experience
-        except Exception as e:
-            error_msg = str(e)
-            print(f"Error tailoring experience: {error_msg}")
-            self._handle_rate_limit_error(error_msg)
-            if "JSON" in error_msg or "json" in error_msg:
-                return experience
-            raise Exception(f"Failed to tailor experience: {error_msg}")
-
-    async def tailor_skills(
-        self,
-        skills: Skills,
-        job_description: str
-    ) -> Skills:
-        """Tailor skills section"""
-        prompt = f"""You are an expert resume writer. Optimize this skills section for the target job.
-
-Current Skills:
-{json.dumps(skills.model_dump(), indent=2)}
-
-Target Job Description:
-{job_description}
-
-Instructions:
-1. Reorder skills to prioritize those most relevant to the job
-2. Keep all existing skills (don't remove any)
-3. Return valid JSON object matching the exact input structure
-
-Return only the JSON object, no markdown or additional text:"""
-
-        try:
-            response = self.client.generate_content(prompt)
-            text = response.text.strip()
-            if text.startswith("```"):
-                text = text.split("```")[1]
-                if text.startswith("json"):
-                    text = text[4:]
-            text = text.strip()
-
-            skills_data = json.loads(text)
-            return Skills(**skills_data)
-        except json.JSONDecodeError:
-            return skills
-        except Exception as e:
-            error_msg = str(e)
-            print(f"Error tailoring skills: {error_msg}")
-            self._handle_rate_limit_error(error_msg)
-            if "JSON" in error_msg or "json" in error_msg:
-                return skills
-            raise Exception(f"Failed to tailor skills: {error_msg}")
-
-    async def tailor_projects(
-        self,
-        projects: List[Project],
-        job_description: str
-    ) -> List[Project]:
-        """Tailor project descriptions"""
-        if not projects:
-            return projects
-
-        prompt = f"""You are an expert resume writer. Optimize these projects for the target job.
-
-Current Projects:
-{json.dumps([proj.model_dump() for proj in projects], indent=2)}
-
-Target Job Description:
-{job_description}
-
-Instructions:
-1. Rewrite project descriptions to emphasize relevant technologies and achievements
-2. Incorporate keywords from the job description
-3. Keep the same structure
-4. Return valid JSON array matching the exact input structure
-
-Return only the JSON array, no markdown or additional text:"""
-
-        try:
-            response = self.client.generate_content(prompt)
-            text = response.text.strip()
-            if text.startswith("```"):
-                text = text.split("```")[1]
-                if text.startswith("json"):
-                    text = text[4:]
-            text = text.strip()
-
-            projects_data = json.loads(text)
-            return [Project(**proj) for proj in projects_data]
-        except json.JSONDecodeError:
-            return projects
-        except Exception as e:
-            error_msg = str(e)
-            print(f"Error tailoring projects: {error_msg}")
-            self._handle_rate_limit_error(error_msg)
-            if "JSON" in error_msg or "json" in error_msg:
-                return projects
-            raise Exception(f"Failed to tailor projects: {error_msg}")
-
-    async def tailor_education(
-        self,
-        education: List[Education],
-        job_description: str
-    ) -> List[Education]:
-        """Tailor education section - typically no changes needed"""
-        return education
-
-    async def calculate_ats_score(
-        self,
-        resume_data: ResumeData,
-        job_description: str
-    ) -> dict:
-        """Calculate ATS compatibility score"""
-        prompt = f"""You are an ATS (Applicant Tracking System) expert. Analyze this resume against the job description and provide an ATS compatibility score.
-
-Resume Data:
-{json.dumps(resume_data.model_dump(), indent=2)}
-
-Job Description:
-{job_description}
-
-Analyze:
-1. Keyword matching
-2. Skills alignment
-3. Experience relevance
-4. Format compatibility
-
-Provide a score from 0-100 and brief feedback. Return valid JSON:
-{{"score": 85, "feedback": "Strong match with relevant keywords..."}}
-
-Return only the JSON object:"""
-
-        try:
-            response = self.client.generate_content(prompt)
-            text = response.text.strip()
-            if text.startswith("```"):
-                text = text.split("```")[1]
-                if text.startswith("json"):
-                    text = text[4:]
-            text = text.strip()
-
-            return json.loads(text)
-        except Exception as e:
-            error_msg = str(e)
-            print(f"Error calculating ATS score: {error_msg}")
-            self._handle_rate_limit_error(error_msg)
-            raise Exception(f"Failed to calculate ATS score: {error_msg}")
-
-    async def generate_cover_letter(
-        self,
-        profile_data: ResumeData,
-        job_description: str,
-        instructions: str = ""
-    ) -> str:
-        """Generate personalized cover letter"""
-        prompt = f"""You are an expert cover letter writer. Create a personalized, professional cover letter.
-
-Candidate Information:
-{json.dumps(profile_data.model_dump(), indent=2)}
-
-Job Description:
-{job_description}
-
-Additional Instructions:
-{instructions if instructions else "None"}
-
-Instructions:
-1. Create a compelling cover letter (3-4 paragraphs)
-2. Address specific requirements from the job description
-3. Highlight relevant achievements and experiences
-4. Use professional but engaging tone
-5. Include proper salutation and closing
-
-Return only the cover letter text:"""
-
-        try:
-            response = self.client.generate_content(prompt)
-            return response.text.strip()
-        except Exception as e:
-            error_msg = str(e)
-            print(f"Error generating cover letter: {error_msg}")
-            self._handle_rate_limit_error(error_msg)
-            raise Exception(f"Failed to generate cover letter: {error_msg}")
-
-# Keep old service instance for backward compatibility
-gemini_service = None
-
-def get_gemini_service():
-    """Get singleton Gemini service instance"""
-    global gemini_service
-    if gemini_service is None:
-        from app.core.config import settings
-        gemini_service = GeminiService(
-            api_key=settings.GEMINI_API_KEY,
-            model="gemini-2.0-flash-exp"
-        )
-    return gemini_service
@@ -0,0 +1,129 @@
+"""
+Hedged requests for short, latency-critical AI calls.
+
+If a call has not returned by the observed p90 latency for its
+(provider, model, operation), a duplicate is sent and whichever answers
+first wins; the other is cancelled. Extra calls are capped at a fraction of
+all calls so hedging cannot multiply spend.
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Dict, Tuple, Deque, Callable, Awaitable, Any, Optional
+from app.core.config import settings
+
+# Latency samples kept per (provider, model, operation)
+WINDOW = 200
+
+
+class HedgePolicy:
+    """Latency tracking, hedge budget and win statistics"""
+
+    def __init__(self, operations: str, percentile: float, budget: float, min_samples: int):
+        self.operations = {op.strip() for op in operations.split(",") if op.strip()}
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self._latencies: Dict[Tuple[str, str, str], Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._hedges = 0
+        self._hedge_wins = 0
+        self._over_budget = 0
+
+    def enabled_for(self, operation: Optional[str]) -> bool:
+        return operation in self.operations
+
+    def record(self, key: Tuple[str, str, str], latency: float):
+        with self._lock:
+            samples = self._latencies.get(key)
+            if samples is None:
+                samples = self._latencies[key] = deque(maxlen=WINDOW)
+            samples.append(latency)
+
+    def hedge_delay(self, key: Tuple[str, str, str]) -> Optional[float]:
+        """Observed latency percentile for the key, or None until there are enough samples"""
+        with self._lock:
+            samples = self._latencies.get(key)
+            if not samples or len(samples) < self.min_samples:
+                return None
+            return self._percentile_locked(samples)
+
+    def _take_budget(self) -> bool:
+        with self._lock:
+            if self._hedges + 1 > self.budget * self._calls:
+                self._over_budget += 1
+                return False
+            self._hedges += 1
+            return True
+
+    async def run(
+        self,
+        key: Tuple[str, str, str],
+        primary: Callable[[], Awaitable[Any]],
+        hedge: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Run primary(); if it is slower than the hedge delay, race it against hedge()"""
+        with self._lock:
+            self._calls += 1
+        started = time.monotonic()
+        delay = self.hedge_delay(key)
+        primary_task = asyncio.ensure_future(primary())
+        tasks = {primary_task}
+        try:
+            if delay is not None:
+                await asyncio.wait(tasks, timeout=delay)
+            if not primary_task.done() and delay is not None and self._take_budget():
+                hedge_task = asyncio.ensure_future(hedge())
+                tasks.add(hedge_task)
+                # First successful answer wins; an error only counts if both fail
+                while tasks:
+                    done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        tasks.discard(task)
+                        if task.exception() is None:
+                            if task is hedge_task:
+                                with self._lock:
+                                    self._hedge_wins += 1
+                            self.record(key, time.monotonic() - started)
+                            return task.result()
+                    if not tasks:
+                        # Both failed: surface the primary's error
+                        return primary_task.result()
+
+            result = await primary_task
+            self.record(key, time.monotonic() - started)
+            return result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "operations": sorted(self.operations),
+                "calls": self._calls,
+                "hedges": self._hedges,
+                "hedge_rate": round(self._hedges / self._calls, 4) if self._calls else 0.0,
+                "hedge_wins": self._hedge_wins,
+                "hedge_win_rate": round(self._hedge_wins / self._hedges, 4) if self._hedges else 0.0,
+                "skipped_over_budget": self._over_budget,
+                "hedge_delays": {
+                    ":".join(key): round(self._percentile_locked(samples), 3)
+                    for key, samples in self._latencies.items()
+                    if len(samples) >= self.min_samples
+                }
+            }
+
+    def _percentile_locked(self, samples: Deque[float]) -> float:
+        ordered = sorted(samples)
+        return ordered[min(int(len(ordered) * self.percentile), len(ordered) - 1)]
+
+
+hedge_policy = HedgePolicy(
+    operations=settings.AI_HEDGE_OPERATIONS,
+    percentile=settings.AI_HEDGE_PERCENTILE,
+    budget=settings.AI_HEDGE_BUDGET,
+    min_samples=settings.AI_HEDGE_MIN_SAMPLES
+)
@@ -0,0 +1,116 @@
+"""Process-wide pooled HTTP client shared by AI providers"""
+import httpx
+from typing import Optional
+from app.core.config import settings
+
+
+class _CountingTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper that tracks requests waiting on the pool"""
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport):
+        self.transport = transport
+        self.total_requests = 0
+        self.failed_requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.total_requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            return await self.transport.handle_async_request(request)
+        except Exception:
+            self.failed_requests += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+class HTTPClientPool:
+    """Owns a single keep-alive httpx.AsyncClient for the lifetime of the app"""
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._transport: Optional[_CountingTransport] = None
+        self._http2 = False
+
+    def _http2_available(self) -> bool:
+        """HTTP/2 needs the optional h2 package (httpx[http2])"""
+        if not settings.HTTP_ENABLE_HTTP2:
+            return False
+        try:
+            import h2  # noqa: F401
+            return True
+        except ImportError:
+            print("h2 not installed, shared HTTP client falling back to HTTP/1.1")
+            return False
+
+    def start(self) -> httpx.AsyncClient:
+        """Create the shared client if it does not exist yet"""
+        if self._client is None or self._client.is_closed:
+            self._http2 = self._http2_available()
+            self._transport = _CountingTransport(httpx.AsyncHTTPTransport(
+                http2=self._http2,
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+                )
+            ))
+            self._client = httpx.AsyncClient(
+                transport=self._transport,
+                timeout=httpx.Timeout(
+                    settings.HTTP_TIMEOUT,
+                    connect=settings.HTTP_CONNECT_TIMEOUT
+                )
+            )
+        return self._client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared client, created lazily when used outside the app lifespan"""
+        return self.start()
+
+    async def close(self):
+        """Close the shared client and all pooled connections"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    def stats(self) -> dict:
+        """Get pool utilisation metrics"""
+        is_open = self._client is not None and not self._client.is_closed
+        transport = self._transport
+        connections = []
+        if is_open and transport is not None:
+            # httpcore's pool is not exposed by httpx, so read it defensively
+            pool = getattr(transport.transport, "_pool", None)
+            connections = list(getattr(pool, "connections", []))
+
+        idle = sum(1 for conn in connections if conn.is_idle())
+        return {
+            "open": is_open,
+            "http2": self._http2,
+            "max_connections": settings.HTTP_MAX_CONNECTIONS,
+            "max_keepalive_connections": settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            "keepalive_expiry": settings.HTTP_KEEPALIVE_EXPIRY,
+            "connections": len(connections),
+            "idle_connections": idle,
+            "active_connections": len(connections) - idle,
+            "in_flight_requests": transport.in_flight if transport else 0,
+            "peak_in_flight_requests": transport.peak_in_flight if transport else 0,
+            "total_requests": transport.total_requests if transport else 0,
+            "failed_requests": transport.failed_requests if transport else 0
+        }
+
+
+http_pool = HTTPClientPool()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared pooled HTTP client"""
+    return http_pool.client
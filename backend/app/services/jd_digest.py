@@ -0,0 +1,275 @@
+"""
+Job description digest shared by every tailoring prompt and scorer.
+
+A job description is parsed once into normalized text (benefits, company
+boilerplate and EEO statements removed), the requirement and
+responsibility bullets, ranked keywords, seniority and must-have skills
+(known skill terms named in the requirements). The digest is cached in
+ai_cache under a hash of the posting, so /ai/tailor-resume, /ai/ats-score
+and /ai/rank-bullets stop re-extracting keywords from the same posting.
+Prompts carry the normalized text; postings with real requirement or
+responsibility sections are sent in a compact, sectioned form instead
+when that is shorter. Neither form drops any non-boilerplate line.
+"""
+import re
+from collections import Counter
+from typing import List, Optional, Tuple
+from pydantic import BaseModel
+from app.services.cache_service import ai_cache, make_cache_key
+from app.services.content_analyzer import BulletPointRanker
+from app.services.enhanced_ats_scorer import EnhancedATSScorer
+
+TOP_KEYWORDS = 30
+MAX_MUST_HAVE = 15
+
+BULLET = re.compile(r"^\s*(?:[-*•·–—▪◦]|\d+[.)])\s*")
+HEADING_WORDS = 8
+SECTION_PATTERNS = [
+    # "Who we are" alone is company boilerplate; "Who we are looking for" is a requirements heading
+    ("skip", re.compile(r"benefit|perk|we offer|what we offer|about us|about the company|^who we are$|equal opportunit|"
+                        r"compensation|salary|pay range|why join|our values|how to apply|privacy|accommodation", re.I)),
+    ("nice", re.compile(r"nice to have|nice-to-have|preferred|bonus|plus|desirable", re.I)),
+    ("requirements", re.compile(r"requirement|qualification|must have|must-have|what you('ll)? (need|bring)|"
+                                r"you have|about you|skills|experience|who you are|looking for", re.I)),
+    ("responsibilities", re.compile(r"responsibilit|what you('ll)? do|the role|duties|you will|day to day|your impact", re.I)),
+]
+REQUIRED_CUE = re.compile(r"\b(must|required|requires|minimum|at least|\d+\+?\s*(?:-\s*\d+\s*)?years?)\b", re.I)
+YEARS = re.compile(r"(\d+)\+?\s*(?:-\s*\d+\s*)?(?:years?|yrs)", re.I)
+SENIORITY_LEVELS = [
+    ("intern", re.compile(r"\bintern(ship)?\b", re.I)),
+    ("junior", re.compile(r"\b(junior|jr\.?|entry[- ]level|graduate)\b", re.I)),
+    ("principal", re.compile(r"\bprincipal\b", re.I)),
+    ("staff", re.compile(r"\bstaff\b", re.I)),
+    ("lead", re.compile(r"\b(lead|head of|manager|director)\b", re.I)),
+    ("senior", re.compile(r"\b(senior|sr\.?)\b", re.I)),
+    ("mid", re.compile(r"\b(mid[- ]level|intermediate)\b", re.I)),
+]
+# Frequent posting words that are never a keyword worth matching
+GENERIC_WORDS = {
+    "experience", "years", "year", "ability", "strong", "team", "teams", "work", "working", "skills",
+    "knowledge", "understanding", "excellent", "good", "great", "role", "you", "our", "your", "we",
+    "will", "including", "related", "plus", "etc", "using", "building", "build", "across", "within",
+    "degree", "field", "equivalent", "proven", "track", "record", "communication", "environment",
+    "what", "who", "new", "own", "help", "make", "part", "looking", "join", "about", "all", "also",
+    "any", "more", "other", "their", "they", "them", "into", "while", "well", "such", "like", "not",
+}
+
+# Known skill terms (display name -> spellings). Matched case-insensitively,
+# except terms that are also ordinary words or letters in prose
+SKILL_TERMS = {
+    "Python": ["python"], "Java": ["java"], "JavaScript": ["javascript"], "TypeScript": ["typescript"],
+    "Go": ["Go", "golang"], "Rust": ["Rust"], "C": ["C"], "C++": ["c++", "cpp"], "C#": ["c#"], "R": ["R"],
+    "Ruby": ["ruby"], "PHP": ["php"], "Kotlin": ["kotlin"], "Swift": ["Swift"], "Scala": ["scala"],
+    "Elixir": ["elixir"], "Haskell": ["haskell"], "Perl": ["perl"], "Bash": ["bash", "shell scripting"],
+    "SQL": ["sql"], "NoSQL": ["nosql"], "GraphQL": ["graphql"], "REST": ["REST", "restful"], "gRPC": ["grpc"],
+    "HTML": ["html", "html5"], "CSS": ["css", "css3"], "React": ["react", "react.js", "reactjs"],
+    "Vue": ["vue", "vue.js", "vuejs"], "Angular": ["angular"], "Svelte": ["svelte"], "Next.js": ["next.js", "nextjs"],
+    "Node.js": ["node.js", "nodejs"], "Django": ["django"], "Flask": ["flask"], "FastAPI": ["fastapi"],
+    "Spring": ["Spring", "spring boot"], "Rails": ["rails", "ruby on rails"], ".NET": [".net", "dotnet"],
+    "PostgreSQL": ["postgresql", "postgres"], "MySQL": ["mysql"], "SQLite": ["sqlite"], "MongoDB": ["mongodb", "mongo"],
+    "Redis": ["redis"], "Cassandra": ["cassandra"], "DynamoDB": ["dynamodb"], "Elasticsearch": ["elasticsearch"],
+    "Snowflake": ["snowflake"], "BigQuery": ["bigquery"], "Kafka": ["kafka"], "RabbitMQ": ["rabbitmq"],
+    "Spark": ["Spark", "pyspark"], "Hadoop": ["hadoop"], "Airflow": ["airflow"], "dbt": ["dbt"],
+    "AWS": ["aws", "amazon web services"], "GCP": ["gcp", "google cloud"], "Azure": ["azure"],
+    "Docker": ["docker"], "Kubernetes": ["kubernetes", "k8s"], "Terraform": ["terraform"], "Ansible": ["ansible"],
+    "Linux": ["linux"], "Git": ["git"], "CI/CD": ["ci/cd", "ci-cd", "continuous integration"],
+    "Jenkins": ["jenkins"], "GitHub Actions": ["github actions"], "Prometheus": ["prometheus"], "Grafana": ["grafana"],
+    "Microservices": ["microservices", "microservice"], "Distributed systems": ["distributed systems"],
+    "Machine learning": ["machine learning", "ml"], "AI": ["ai", "artificial intelligence"],
+    "Deep learning": ["deep learning"], "NLP": ["nlp", "natural language processing"], "LLM": ["llm", "llms"],
+    "PyTorch": ["pytorch"], "TensorFlow": ["tensorflow"], "scikit-learn": ["scikit-learn", "sklearn"],
+    "Pandas": ["pandas"], "NumPy": ["numpy"], "Tableau": ["tableau"], "Power BI": ["power bi"], "Excel": ["Excel"],
+    "UI": ["ui"], "UX": ["ux"], "Figma": ["figma"], "iOS": ["ios"], "Android": ["android"], "Flutter": ["flutter"],
+    "React Native": ["react native"], "QA": ["qa"], "Selenium": ["selenium"], "Cypress": ["cypress"],
+    "Agile": ["agile"], "Scrum": ["scrum"], "Jira": ["jira"], "Salesforce": ["salesforce"], "SAP": ["sap"],
+    "Security": ["cybersecurity", "application security"], "OAuth": ["oauth"], "TCP/IP": ["tcp/ip"],
+}
+# Skill spellings that are also common English words or letters only count in their exact case,
+# and at the start of a sentence or bullet ("Go the extra mile", "Excel at ...") only when listed
+CASE_SENSITIVE_SPELLINGS = {"Go", "C", "R", "REST", "Rust", "Swift", "Spring", "Spark", "Excel"}
+LISTED_AFTER = re.compile(r"\s*[,/;)]|\s+(?:and|or)\s")
+
+
+def _skill_pattern(spellings: List[str]) -> List[Tuple[re.Pattern, bool]]:
+    """(pattern, ambiguous) per spelling"""
+    patterns = []
+    for spelling in spellings:
+        # Letters are bounded by anything but word characters and skill punctuation (C++, C#, .NET)
+        body = rf"(?<![\w+#.&'’-]){re.escape(spelling)}(?![\w+#&'’-]|\.\w)"
+        if spelling in CASE_SENSITIVE_SPELLINGS:
+            patterns.append((re.compile(body), True))
+        else:
+            patterns.append((re.compile(body, re.I), False))
+    return patterns
+
+
+SKILL_PATTERNS = [(name, _skill_pattern(spellings)) for name, spellings in SKILL_TERMS.items()]
+
+
+def _starts_sentence(text: str, start: int) -> bool:
+    """Whether position `start` begins a line, bullet or sentence"""
+    line = text[text.rfind("\n", 0, start) + 1:start]
+    if not BULLET.sub("", line).strip():
+        return True
+    return line.rstrip()[-1] in ".!?"
+
+
+def find_skills(text: str) -> List[str]:
+    """Known skill terms named in text, in order of first mention"""
+    found = []
+    for name, patterns in SKILL_PATTERNS:
+        for pattern, ambiguous in patterns:
+            for match in pattern.finditer(text):
+                if ambiguous and _starts_sentence(text, match.start()) and not LISTED_AFTER.match(text, match.end()):
+                    continue
+                found.append((match.start(), name))
+                break
+    first = {}
+    for position, name in sorted(found):
+        first.setdefault(name, position)
+    return list(first)
+
+
+class JobDigest(BaseModel):
+    content_hash: str
+    title: str = ""
+    text: str  # normalized posting without boilerplate sections
+    structured: bool = False  # requirements/responsibilities came from headed sections
+    overview: List[str] = []  # lines outside those sections (intro, other sections), title excluded
+    requirements: List[str] = []
+    responsibilities: List[str] = []
+    nice_to_have: List[str] = []
+    keywords: List[str] = []  # EnhancedATSScorer keywords, most frequent first, GENERIC_WORDS removed
+    all_keywords: List[str] = []
+    important_terms: List[str] = []  # BulletPointRanker terms
+    seniority: str = ""
+    years_experience: Optional[int] = None
+    must_have_skills: List[str] = []  # SKILL_TERMS named in the requirements
+
+    def prompt_text(self) -> str:
+        """
+        Posting text for prompts: the normalized text, or for postings with real
+        sections the compact sectioned form when it is shorter. Both keep every
+        non-boilerplate line.
+        """
+        if not self.structured:
+            return self.text
+        lines = []
+        if self.title:
+            lines.append(f"Role: {self.title}")
+        if self.seniority or self.years_experience:
+            years = f" ({self.years_experience}+ years)" if self.years_experience else ""
+            lines.append(f"Seniority: {self.seniority or 'unspecified'}{years}")
+        if self.must_have_skills:
+            lines.append(f"Must-have skills: {', '.join(self.must_have_skills)}")
+        lines.extend(self.overview)
+        for heading, items in (
+            ("Requirements", self.requirements),
+            ("Responsibilities", self.responsibilities),
+            ("Nice to have", self.nice_to_have),
+        ):
+            if items:
+                lines.append(f"{heading}:")
+                lines.extend(f"- {item}" for item in items)
+        compact = "\n".join(lines)
+        return compact if len(compact) < len(self.text) else self.text
+
+
+def _heading_kind(line: str) -> Optional[str]:
+    """Section kind if the line looks like a heading"""
+    stripped = line.strip().rstrip(":").strip("#* ")
+    if not stripped or BULLET.match(line) or len(stripped.split()) > HEADING_WORDS:
+        return None
+    marked = line.strip().endswith(":") or line.strip().startswith("#") or stripped.isupper()
+    if not (marked or stripped.istitle()):
+        return None
+    for kind, pattern in SECTION_PATTERNS:
+        if pattern.search(stripped):
+            return kind
+    # Title Case lines without a marker are only headings when they name a known section
+    return "other" if marked else None
+
+
+def _clean_item(line: str) -> str:
+    return BULLET.sub("", line).strip()
+
+
+def build_digest(job_description: str, content_hash: str = "") -> JobDigest:
+    """Parse a job description into a digest (no caching)"""
+    lines = [re.sub(r"[ \t ]+", " ", line).strip() for line in job_description.splitlines()]
+    lines = [line for line in lines if line]
+
+    title = lines[0] if lines and len(lines[0]) <= 100 and _heading_kind(lines[0]) in (None, "other") else ""
+    kept: List[str] = []
+    overview: List[str] = []
+    sections = {"requirements": [], "responsibilities": [], "nice": []}
+    headed = False
+    section = "other"
+    for index, line in enumerate(lines):
+        kind = _heading_kind(line)
+        if kind is not None:
+            section = kind
+            if kind != "skip":
+                kept.append(line)
+            if kind == "other":
+                overview.append(line)
+            continue
+        if section == "skip":
+            continue
+        kept.append(line)
+        if section in sections:
+            sections[section].append(_clean_item(line))
+            headed = headed or section != "nice"
+        elif BULLET.match(line) and REQUIRED_CUE.search(line):
+            sections["requirements"].append(_clean_item(line))
+        elif not (index == 0 and title):
+            overview.append(line)
+
+    text = "\n".join(kept)
+    if not sections["requirements"]:
+        # Unstructured prose: sentences that state a requirement
+        sentences = re.split(r"(?<=[.!?])\s+", " ".join(kept))
+        sections["requirements"] = [_clean_item(s) for s in sentences if REQUIRED_CUE.search(s)]
+
+    words = EnhancedATSScorer.extract_keywords(text)
+    ranked = [word for word, _ in Counter(words).most_common()]
+
+    seniority = ""
+    for search_text in (title, text):
+        seniority = next((level for level, pattern in SENIORITY_LEVELS if pattern.search(search_text)), "")
+        if seniority:
+            break
+    years = [int(match) for match in YEARS.findall(" ".join(sections["requirements"]) or text) if int(match) < 40]
+
+    # Skills the requirements name; without any there, every skill outside the nice-to-haves
+    nice_text = set(sections["nice"])
+    must_have = find_skills("\n".join(sections["requirements"])) or find_skills(
+        "\n".join(line for line in kept if _clean_item(line) not in nice_text)
+    )
+
+    return JobDigest(
+        content_hash=content_hash,
+        title=title,
+        text=text,
+        structured=headed,
+        overview=overview,
+        requirements=sections["requirements"],
+        responsibilities=sections["responsibilities"],
+        nice_to_have=sections["nice"],
+        keywords=[word for word in ranked if word not in GENERIC_WORDS][:TOP_KEYWORDS],
+        all_keywords=ranked,
+        important_terms=BulletPointRanker.extract_important_terms(text),
+        seniority=seniority,
+        years_experience=min(years) if years else None,
+        must_have_skills=must_have[:MAX_MUST_HAVE]
+    )
+
+
+def job_digest(job_description: str) -> JobDigest:
+    """Digest for a job description, computed once per distinct posting"""
+    content_hash = make_cache_key("jd_digest", job_description)
+    digest = ai_cache.get(content_hash)
+    if digest is None:
+        digest = build_digest(job_description, content_hash)
+        ai_cache.set(content_hash, digest)
+    return digest
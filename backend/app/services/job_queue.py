@@ -0,0 +1,400 @@
+"""
+Background jobs for batch resume tailoring.
+
+A job is one profile tailored against many job descriptions. Each job
+description is an item processed by a bounded worker pool; items are
+scheduled round-robin across users with a per-user concurrency cap so one
+large batch cannot starve everyone else. Progress is persisted to SQLite so
+unfinished items are picked up again after a restart.
+"""
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque, Counter
+from typing import Optional, Dict, List, Any, Deque, Tuple
+from app.core.config import settings
+from app.models.resume import ResumeData
+from app.services.ai_settings_service import ai_settings_service
+from app.services.ai_service_factory import AIServiceFactory
+
+# Item and job states
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_user ON jobs (user_id, status);
+CREATE TABLE IF NOT EXISTS job_items (
+    job_id TEXT NOT NULL REFERENCES jobs (id) ON DELETE CASCADE,
+    idx INTEGER NOT NULL,
+    job_description TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (job_id, idx)
+);
+"""
+
+
+class JobStore:
+    """SQLite persistence for jobs and their items (calls are short and run in a thread)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def open(self):
+        if self._conn is not None:
+            return
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def create_job(self, user_id: str, profile_json: str, job_descriptions: List[str]) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, user_id, status, profile, total, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, user_id, PENDING, profile_json, len(job_descriptions), now, now)
+            )
+            self._conn.executemany(
+                "INSERT INTO job_items (job_id, idx, job_description, status, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(job_id, i, jd, PENDING, now) for i, jd in enumerate(job_descriptions)]
+            )
+        return job_id
+
+    def count_active_jobs(self, user_id: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE user_id = ? AND status IN (?, ?)",
+                (user_id, PENDING, RUNNING)
+            ).fetchone()
+        return row[0]
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def list_jobs(self, user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, status, total, created_at, updated_at FROM jobs "
+                "WHERE user_id = ? ORDER BY created_at DESC LIMIT ?",
+                (user_id, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_items(self, job_id: str, after_idx: int = -1) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT idx, job_description, status, result, error FROM job_items "
+                "WHERE job_id = ? AND idx > ? ORDER BY idx",
+                (job_id, after_idx)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_item(self, job_id: str, idx: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT idx, job_description, status, result, error FROM job_items "
+                "WHERE job_id = ? AND idx = ?",
+                (job_id, idx)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def item_counts(self, job_id: str) -> Counter:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM job_items WHERE job_id = ? GROUP BY status",
+                (job_id,)
+            ).fetchall()
+        return Counter({status: count for status, count in rows})
+
+    def set_item_status(self, job_id: str, idx: int, status: str, result: Optional[str] = None, error: Optional[str] = None):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE job_items SET status = ?, result = ?, error = ?, updated_at = ? "
+                "WHERE job_id = ? AND idx = ?",
+                (status, result, error, now, job_id, idx)
+            )
+            self._conn.execute("UPDATE jobs SET updated_at = ? WHERE id = ?", (now, job_id))
+
+    def set_job_status(self, job_id: str, status: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?",
+                (status, time.time(), job_id)
+            )
+
+    def unfinished_items(self) -> List[Tuple[str, str, int]]:
+        """(user_id, job_id, idx) of every item not yet finished, oldest job first"""
+        with self._lock, self._conn:
+            # Anything marked running was interrupted by the last shutdown
+            self._conn.execute("UPDATE job_items SET status = ? WHERE status = ?", (PENDING, RUNNING))
+            rows = self._conn.execute(
+                "SELECT j.user_id, i.job_id, i.idx FROM job_items i JOIN jobs j ON j.id = i.job_id "
+                "WHERE i.status = ? ORDER BY j.created_at, i.idx",
+                (PENDING,)
+            ).fetchall()
+        return [tuple(row) for row in rows]
+
+    def delete_finished_before(self, cutoff: float) -> int:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (COMPLETED, FAILED, cutoff)
+            )
+        return cursor.rowcount
+
+
+class JobQueue:
+    """Worker pool that runs batch tailoring items with per-user fairness"""
+
+    def __init__(self, store: JobStore, workers: int, max_concurrent_per_user: int):
+        self.store = store
+        self.workers = workers
+        self.max_concurrent_per_user = max_concurrent_per_user
+        self._pending: Dict[str, Deque[Tuple[str, int]]] = {}  # user_id -> items
+        self._users: Deque[str] = deque()  # round-robin order of users with pending items
+        self._running = Counter()  # user_id -> items in flight
+        self._ready: Optional[asyncio.Condition] = None
+        self._updates: Dict[str, asyncio.Event] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._profiles: Dict[str, ResumeData] = {}
+
+    async def start(self):
+        """Open the store, requeue unfinished items and start workers"""
+        self._ready = asyncio.Condition()
+        await asyncio.to_thread(self.store.open)
+        cutoff = time.time() - settings.JOB_RETENTION_DAYS * 86400
+        await asyncio.to_thread(self.store.delete_finished_before, cutoff)
+
+        unfinished = await asyncio.to_thread(self.store.unfinished_items)
+        for user_id, job_id, idx in unfinished:
+            self._push(user_id, job_id, idx)
+        if unfinished:
+            print(f"Resuming {len(unfinished)} unfinished batch tailoring items")
+
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Stop workers; in-flight items stay unfinished and resume on next start"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await asyncio.to_thread(self.store.close)
+
+    def _push(self, user_id: str, job_id: str, idx: int):
+        if user_id not in self._pending:
+            self._pending[user_id] = deque()
+            self._users.append(user_id)
+        self._pending[user_id].append((job_id, idx))
+
+    async def submit(self, user_id: str, profile: ResumeData, job_descriptions: List[str]) -> str:
+        """Persist a new job and queue its items"""
+        job_id = await asyncio.to_thread(
+            self.store.create_job, user_id, profile.model_dump_json(), job_descriptions
+        )
+        async with self._ready:
+            for idx in range(len(job_descriptions)):
+                self._push(user_id, job_id, idx)
+            self._ready.notify_all()
+        return job_id
+
+    def _next_item(self) -> Optional[Tuple[str, str, int]]:
+        """Pop the next item from the first user, in rotation, who is under their limit"""
+        for _ in range(len(self._users)):
+            user_id = self._users[0]
+            self._users.rotate(-1)
+            if self._running[user_id] >= self.max_concurrent_per_user:
+                continue
+            job_id, idx = self._pending[user_id].popleft()
+            if not self._pending[user_id]:
+                del self._pending[user_id]
+                self._users.remove(user_id)
+            self._running[user_id] += 1
+            return user_id, job_id, idx
+        return None
+
+    async def _worker(self):
+        while True:
+            async with self._ready:
+                item = self._next_item()
+                while item is None:
+                    await self._ready.wait()
+                    item = self._next_item()
+
+            user_id, job_id, idx = item
+            try:
+                await self._run_item(user_id, job_id, idx)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Batch job {job_id} item {idx} failed unexpectedly: {e}")
+            finally:
+                async with self._ready:
+                    self._running[user_id] -= 1
+                    if self._running[user_id] <= 0:
+                        del self._running[user_id]
+                    self._ready.notify_all()
+
+    def _load_profile(self, job: Dict[str, Any]) -> ResumeData:
+        profile = self._profiles.get(job["id"])
+        if profile is None:
+            profile = ResumeData.model_validate_json(job["profile"])
+            self._profiles[job["id"]] = profile
+        return profile
+
+    async def _run_item(self, user_id: str, job_id: str, idx: int):
+        job = await asyncio.to_thread(self.store.get_job, job_id)
+        if job is None:
+            return
+        if job["status"] == PENDING:
+            await asyncio.to_thread(self.store.set_job_status, job_id, RUNNING)
+        await asyncio.to_thread(self.store.set_item_status, job_id, idx, RUNNING)
+
+        item = await asyncio.to_thread(self.store.get_item, job_id, idx)
+        try:
+            # Settings are looked up per item so restarted jobs never need stored API keys
+            user_config = await ai_settings_service.get_user_settings(user_id)
+            if not user_config:
+                raise Exception("AI provider not configured")
+            ai_service = AIServiceFactory.get_service(user_config)
+            result = await tailor_for_job(ai_service, self._load_profile(job), item["job_description"])
+            await asyncio.to_thread(
+                self.store.set_item_status, job_id, idx, COMPLETED, json.dumps(result)
+            )
+        except Exception as e:
+            await asyncio.to_thread(self.store.set_item_status, job_id, idx, FAILED, None, str(e))
+
+        await self._finish_job_if_done(job_id)
+        self._notify(job_id)
+
+    async def _finish_job_if_done(self, job_id: str):
+        counts = await asyncio.to_thread(self.store.item_counts, job_id)
+        if counts[PENDING] or counts[RUNNING]:
+            return
+        status = FAILED if counts[FAILED] and not counts[COMPLETED] else COMPLETED
+        await asyncio.to_thread(self.store.set_job_status, job_id, status)
+        self._profiles.pop(job_id, None)
+
+    def _notify(self, job_id: str):
+        event = self._updates.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    def update_event(self, job_id: str) -> asyncio.Event:
+        """Event set when the next item of the job finishes; take it before reading progress"""
+        return self._updates.setdefault(job_id, asyncio.Event())
+
+    @staticmethod
+    async def wait_for_update(event: asyncio.Event, timeout: float) -> bool:
+        """Wait for an update event; False on timeout"""
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def get_job(self, job_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """Job summary with progress counts, or None if it doesn't exist for this user"""
+        job = await asyncio.to_thread(self.store.get_job, job_id)
+        if job is None or job["user_id"] != user_id:
+            return None
+        counts = await asyncio.to_thread(self.store.item_counts, job_id)
+        return {
+            "job_id": job_id,
+            "status": job["status"],
+            "total_jobs": job["total"],
+            "completed": counts[COMPLETED],
+            "failed": counts[FAILED],
+            "pending": counts[PENDING] + counts[RUNNING],
+            "created_at": job["created_at"],
+            "updated_at": job["updated_at"]
+        }
+
+    async def get_results(self, job_id: str, after_idx: int = -1) -> List[Dict[str, Any]]:
+        """Finished items after the given index, in order of submission"""
+        items = await asyncio.to_thread(self.store.get_items, job_id, after_idx)
+        return [item_payload(item) for item in items]
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._tasks),
+            "queued": sum(len(items) for items in self._pending.values()),
+            "running": sum(self._running.values()),
+            "users_waiting": len(self._users)
+        }
+
+
+def item_payload(item: Dict[str, Any]) -> Dict[str, Any]:
+    """API form of a job item"""
+    payload = {
+        "index": item["idx"],
+        "job_description": item["job_description"][:100] + "...",
+        "status": item["status"]
+    }
+    if item["result"]:
+        payload.update(json.loads(item["result"]))
+    if item["error"]:
+        payload["error"] = item["error"]
+    return payload
+
+
+async def tailor_for_job(ai_service, profile: ResumeData, job_description: str) -> Dict[str, Any]:
+    """Tailor summary, experience and skills for one job description"""
+    summary, experience, skills = await asyncio.gather(
+        ai_service.tailor_summary(
+            profile.additionalInfo,
+            profile.skills,
+            profile.experience,
+            job_description
+        ),
+        ai_service.tailor_experience(profile.experience, job_description),
+        ai_service.tailor_skills(profile.skills, job_description),
+        return_exceptions=True
+    )
+    if all(isinstance(r, Exception) for r in (summary, experience, skills)):
+        raise summary
+
+    return {
+        "summary": summary if not isinstance(summary, Exception) else "",
+        "experience": [exp.model_dump() for exp in experience] if isinstance(experience, list) else [],
+        "skills": skills.model_dump() if not isinstance(skills, Exception) else None,
+        "experience_count": len(experience) if isinstance(experience, list) else 0
+    }
+
+
+job_queue = JobQueue(
+    JobStore(settings.JOB_DB_PATH),
+    workers=settings.JOB_WORKERS,
+    max_concurrent_per_user=settings.JOB_MAX_CONCURRENT_PER_USER
+)
@@ -0,0 +1,286 @@
+"""
+Tolerant extraction of JSON from LLM output.
+
+Models wrap JSON in markdown fences or prose, leave trailing commas, use
+single quotes or Python literals, and get cut off at the token limit. The
+scanner here re-emits the outermost JSON value with its punctuation
+normalized, remembers the last point where every open value was complete,
+and on truncation cuts back to that point and closes the open brackets.
+It works on chunks, so completed array elements (or object members) can be
+used while the rest of the document is still being generated.
+"""
+import json
+import re
+from typing import Any, List
+
+# Start positions tried before giving up on prose that contains stray brackets
+MAX_CANDIDATES = 8
+
+CLOSERS = {"{": "}", "[": "]"}
+LITERALS = {"true": "true", "false": "false", "null": "null", "True": "true", "False": "false", "None": "null"}
+NUMBER = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?$")
+VALID_ESCAPES = set('"\\/bfnrtu')
+# Characters that end a plain run of string content
+STRING_SPECIAL = {
+    '"': re.compile(r'[\\"\x00-\x1f]'),
+    "'": re.compile(r"[\\'\"\x00-\x1f]"),
+}
+CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t", "\b": "\\b", "\f": "\\f"}
+
+
+class JSONRepairError(ValueError):
+    """No usable JSON value could be recovered from the text"""
+
+
+class _Scanner:
+    """Character-level rewriter for one JSON value (see module docstring)"""
+
+    def __init__(self, skip_prefix: bool = False):
+        self.skip_prefix = skip_prefix  # ignore text before the first bracket
+        self.out: List[str] = []
+        self.stack: List[str] = []
+        self.states: List[str] = []  # per level: object "key"/"value"/"next", array "first"/"next"
+        self.started = False
+        self.done = False
+        self.failed = False
+        self.in_string = False
+        self.string_is_key = False
+        self.quote = '"'
+        self.escape = False
+        self.token: List[str] = []
+        self.token_is_key = False
+        self.checkpoint = (0, "")
+        self.item_start = 0
+        self.items: List[Any] = []
+
+    def feed(self, text: str):
+        i = 0
+        length = len(text)
+        while i < length and not (self.done or self.failed):
+            if self.in_string:
+                i = self._string(text, i)
+                continue
+
+            char = text[i]
+            i += 1
+            if not self.started:
+                if char in CLOSERS:
+                    self.started = True
+                    self._open(char)
+                elif not self.skip_prefix and not char.isspace():
+                    self.failed = True
+                continue
+
+            if self.token:
+                if char.isspace() or char in ",:{}[]\"'":
+                    self._finish_token()
+                    if self.failed:
+                        break
+                else:
+                    self.token.append(char)
+                    continue
+
+            if char.isspace() or char == ",":
+                # Separators are re-synthesized, which also drops trailing commas
+                continue
+            if char == ":":
+                continue
+            if char in "\"'":
+                self.string_is_key = self._begin_value()
+                self.in_string = True
+                self.quote = char
+                self.out.append('"')
+            elif char in CLOSERS:
+                if self._begin_value():
+                    self.failed = True
+                    break
+                self._open(char)
+            elif char in "}]":
+                self._close()
+            else:
+                self.token_is_key = self._begin_value()
+                self.token.append(char)
+
+    def _string(self, text: str, i: int) -> int:
+        """Consume string content from text[i:]; return the next index"""
+        if self.escape:
+            self.escape = False
+            char = text[i]
+            if char == "'" and self.quote == "'":
+                self.out.append("'")
+            elif char in VALID_ESCAPES:
+                self.out.append("\\" + char)
+            else:
+                # Unknown escape: keep the backslash literally
+                self.out.append("\\\\" + char)
+            return i + 1
+
+        match = STRING_SPECIAL[self.quote].search(text, i)
+        end = match.start() if match else len(text)
+        if end > i:
+            self.out.append(text[i:end])
+        if not match:
+            return end
+
+        char = text[end]
+        if char == "\\":
+            self.escape = True
+        elif char == self.quote:
+            self.in_string = False
+            self.out.append('"')
+            if self.string_is_key:
+                self.states[-1] = "value"
+            else:
+                self._value_done()
+        elif char == '"':
+            self.out.append('\\"')
+        else:
+            self.out.append(CONTROL_ESCAPES.get(char) or f"\\u{ord(char):04x}")
+        return end + 1
+
+    def _begin_value(self) -> bool:
+        """Emit the separator before a new key or value; return True if it is a key"""
+        state = self.states[-1]
+        is_key = self.stack[-1] == "{" and state != "value"
+        if state == "next":
+            self.out.append(",")
+        elif state == "value":
+            self.out.append(":")
+        if len(self.stack) == 1 and state != "value":
+            self.item_start = len(self.out)
+        return is_key
+
+    def _open(self, char: str):
+        self.stack.append(char)
+        self.states.append("key" if char == "{" else "first")
+        self.out.append(char)
+        self._save_checkpoint()
+
+    def _close(self):
+        if self.states[-1] == "value":
+            # Key without a value: drop it
+            del self.out[self.checkpoint[0]:]
+        self.out.append(CLOSERS[self.stack.pop()])
+        self.states.pop()
+        if not self.stack:
+            self.done = True
+            return
+        self._value_done()
+
+    def _finish_token(self):
+        token = "".join(self.token)
+        self.token = []
+        if self.token_is_key:
+            # Unquoted object key
+            self.out.append(json.dumps(token))
+            self.states[-1] = "value"
+            return
+        value = LITERALS.get(token)
+        if value is None and NUMBER.match(token):
+            value = token
+        if value is None:
+            self.failed = True
+            return
+        self.out.append(value)
+        self._value_done()
+
+    def _value_done(self):
+        self.states[-1] = "next"
+        self._save_checkpoint()
+        if len(self.stack) == 1:
+            item = "".join(self.out[self.item_start:])
+            try:
+                if self.stack[0] == "{":
+                    self.items.append(next(iter(json.loads("{" + item + "}").items())))
+                else:
+                    self.items.append(json.loads(item))
+            except json.JSONDecodeError:
+                # e.g. a malformed \u escape
+                self.failed = True
+
+    def _save_checkpoint(self):
+        closers = "".join(CLOSERS[char] for char in reversed(self.stack))
+        self.checkpoint = (len(self.out), closers)
+
+    def result(self) -> Any:
+        """The value scanned so far, closing whatever was cut off"""
+        if self.failed or not self.started:
+            raise JSONRepairError("No JSON value found")
+        if self.done:
+            text = "".join(self.out)
+        else:
+            length, closers = self.checkpoint
+            text = "".join(self.out[:length]) + closers
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            raise JSONRepairError(f"Unrepairable JSON: {e}")
+
+
+def _strip_fences(text: str) -> str:
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else text[3:]
+        if text.rstrip().endswith("```"):
+            text = text.rstrip()[:-3]
+    return text.strip()
+
+
+def extract_json(text: str) -> Any:
+    """
+    Return the outermost JSON object or array in text, repairing fences,
+    surrounding prose, trailing commas, single quotes, Python literals and
+    truncation. Raises JSONRepairError if nothing usable is found.
+    """
+    stripped = _strip_fences(text)
+    try:
+        return json.loads(stripped)
+    except ValueError:
+        pass
+
+    # Valid JSON with prose around it: slice between the outermost brackets
+    starts = [i for i, char in enumerate(stripped) if char in CLOSERS][:MAX_CANDIDATES]
+    if not starts:
+        raise JSONRepairError("No JSON value found")
+    end = max(stripped.rfind("}"), stripped.rfind("]"))
+    if end > starts[0]:
+        try:
+            return json.loads(stripped[starts[0]:end + 1])
+        except ValueError:
+            pass
+
+    # The first start that scans cleanly wins, even if truncated: later
+    # starts are usually values nested inside it
+    for start in starts:
+        scanner = _Scanner()
+        scanner.feed(stripped[start:])
+        if not scanner.failed:
+            return scanner.result()
+    raise JSONRepairError("No JSON value found")
+
+
+class JSONItemStream:
+    """
+    Incrementally scans a JSON array or object arriving in chunks and hands
+    back each element (or (key, value) member) as soon as it is complete.
+    Text before the first bracket, such as a markdown fence, is skipped.
+    """
+
+    def __init__(self):
+        self._scanner = _Scanner(skip_prefix=True)
+        self._returned = 0
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Consume a chunk and return the items it completed"""
+        self._scanner.feed(chunk)
+        items = self._scanner.items[self._returned:]
+        self._returned += len(items)
+        return items
+
+    @property
+    def failed(self) -> bool:
+        return self._scanner.failed
+
+    def result(self) -> Any:
+        """The whole value, repaired if the stream was cut off"""
+        return self._scanner.result()
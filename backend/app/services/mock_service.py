@@ -0,0 +1,180 @@
+"""
+Deterministic mock AI provider for load tests and offline development.
+
+mock_completion() recognizes the prompt template an operation rendered,
+reads the data sections back out of the prompt and builds a well-formed
+answer from them: tailoring operations echo the candidate's own sections,
+summaries and letters are assembled from job description keywords, and the
+ATS score is derived from a hash of the prompt. The same prompt always gets
+the same answer. MockService runs it in-process with a simulated latency
+(MOCK_AI_LATENCY_SECONDS); benchmarks/fake_provider.py serves it over the
+OpenAI, OpenRouter and Gemini wire formats. Only available when
+MOCK_AI_ENABLED is set.
+"""
+import asyncio
+import hashlib
+import json
+import re
+from typing import AsyncIterator, Dict, List, Optional, Type
+from pydantic import BaseModel
+from app.core.config import settings
+from app.services.base_ai_service import BaseAIService
+from app.services.prompts import PROMPTS, PromptTemplate
+
+KEYWORD = re.compile(r"[A-Za-z][A-Za-z0-9+#.]{3,}")
+# Words never used as "keywords" in mock answers
+STOPWORDS = {
+    "with", "that", "this", "will", "have", "from", "your", "they", "their", "about", "role",
+    "seniority", "requirements", "responsibilities", "experience", "years", "must", "skills",
+    "keywords", "nice", "work", "team", "strong", "ability", "including", "using", "what",
+}
+
+
+def match_template(prompt: str) -> Optional[PromptTemplate]:
+    """The prompt template a prompt was rendered from, if any"""
+    return next((template for template in PROMPTS.values() if prompt.startswith(template.instructions)), None)
+
+
+def prompt_sections(template: PromptTemplate, prompt: str) -> Dict[str, str]:
+    """Section values (as rendered) keyed by value name"""
+    values = {}
+    bounds = [(name, prompt.find(f"\n\n{title}:\n")) for title, name in template.sections]
+    for index, (name, start) in enumerate(bounds):
+        if start < 0:
+            continue
+        start = prompt.index(":\n", start + 2) + 2
+        ends = [bound for _, bound in bounds[index + 1:] if bound > start]
+        cue = prompt.rfind(f"\n\n{template.cue}") if template.cue else -1
+        end = min(ends) if ends else (cue if cue > start else len(prompt))
+        values[name] = prompt[start:end].strip()
+    return values
+
+
+def _data(text: Optional[str], default):
+    try:
+        return json.loads(text) if text else default
+    except ValueError:
+        return default
+
+
+def keywords(text: str, limit: int = 5) -> List[str]:
+    words = [word.rstrip(".") for word in KEYWORD.findall(text or "")]
+    return list(dict.fromkeys(word for word in words if word.lower() not in STOPWORDS))[:limit]
+
+
+def _summary(job_description: str) -> str:
+    terms = keywords(job_description) or ["software delivery"]
+    return (
+        f"Results-driven professional with a track record in {', '.join(terms[:3])}. "
+        f"Known for shipping reliable work with {terms[-1]} and collaborating across teams."
+    )
+
+
+def _cover_letter(profile: dict, job_description: str) -> str:
+    name = (profile.get("personalInfo") or {}).get("fullName", "Candidate")
+    terms = keywords(job_description, 6) or ["the role"]
+    roles = [f"{exp.get('role', '')} at {exp.get('company', '')}" for exp in profile.get("experience") or []][:2]
+    background = " and ".join(roles) or "my recent roles"
+    return "\n\n".join([
+        "Dear Hiring Manager,",
+        f"I am excited to apply for this position. The focus on {', '.join(terms[:3])} matches the work "
+        f"I have been doing as {background}, where I delivered measurable improvements for my teams.",
+        f"I have hands-on experience with {', '.join(terms[3:] or terms)} and enjoy turning ambiguous "
+        "requirements into dependable systems that are easy to operate and extend.",
+        "I would welcome the chance to bring this experience to your team and contribute from day one.",
+        f"Sincerely,\n{name}",
+    ])
+
+
+def _proposal(profile: dict, job_description: str) -> dict:
+    terms = keywords(job_description, 4) or ["your project"]
+    experience = profile.get("experience") or []
+    projects = profile.get("projects") or []
+    return {
+        "proposal": (
+            f"Your project around {terms[0]} is exactly the kind of work I enjoy. "
+            f"I would start by reviewing the current setup, then deliver {', '.join(terms[1:3]) or terms[0]} "
+            "in small, tested increments. I have done similar work for several clients. "
+            "What does success look like for you in the first month? Which parts are the most urgent? "
+            "I am available to start this week - happy to jump on a short call."
+        ),
+        "suggestedExperience": [f"{exp.get('company', '')} - {exp.get('role', '')}" for exp in experience[:2]],
+        "suggestedProjects": [project.get("name", "") for project in projects[:2]],
+    }
+
+
+def mock_answer(operation: Optional[str], sections: Dict[str, str], digest: int):
+    """Answer for an operation: text, or data to be serialized as JSON"""
+    job = sections.get("job_description", "")
+    if operation in ("generate_summary", "tailor_summary"):
+        return _summary(job or sections.get("experience", ""))
+    if operation == "tailor_experience":
+        return _data(sections.get("experience"), [])
+    if operation == "tailor_skills":
+        return _data(sections.get("skills"), {})
+    if operation == "tailor_projects":
+        return _data(sections.get("projects"), [])
+    if operation == "tailor_resume_combined":
+        return {
+            "summary": _summary(job),
+            "experience": _data(sections.get("experience"), []),
+            "skills": _data(sections.get("skills"), {}),
+            "projects": _data(sections.get("projects"), []),
+        }
+    if operation == "calculate_ats_score":
+        terms = keywords(job, 3)
+        return {
+            "score": 55 + digest % 40,
+            "feedback": f"Good overall match; mention {', '.join(terms) or 'the key requirements'} more explicitly."
+        }
+    if operation == "generate_cover_letter":
+        return _cover_letter(_data(sections.get("profile"), {}), job)
+    if operation == "generate_proposal":
+        return _proposal(_data(sections.get("profile"), {}), job)
+    return "Mock response."
+
+
+def mock_completion(prompt: str, wrap_key: Optional[str] = None) -> str:
+    """
+    Deterministic answer text for a prompt. A list answer is wrapped as
+    {wrap_key: [...]} when the caller asked for an object-rooted schema.
+    """
+    template = match_template(prompt)
+    sections = prompt_sections(template, prompt) if template else {}
+    digest = int.from_bytes(hashlib.blake2b(prompt.encode(), digest_size=4).digest(), "big")
+    answer = mock_answer(template.name if template else None, sections, digest)
+    if isinstance(answer, str):
+        return answer
+    if wrap_key and isinstance(answer, list):
+        answer = {wrap_key: answer}
+    return json.dumps(answer, ensure_ascii=False)
+
+
+def response_wrap_key(response_model: Optional[Type[BaseModel]]) -> Optional[str]:
+    """Field holding the list for single-list response models (ExperienceList, ProjectList)"""
+    if response_model is None or len(response_model.model_fields) != 1:
+        return None
+    name, field = next(iter(response_model.model_fields.items()))
+    return name if getattr(field.annotation, "__origin__", None) is list else None
+
+
+class MockService(BaseAIService):
+    """In-process mock provider: deterministic answers after a simulated latency"""
+
+    PROVIDER = "mock"
+
+    def __init__(self, api_key: str, model: str = "mock-1"):
+        super().__init__(api_key, model)
+
+    async def _request_completion(self, prompt: str, response_model: Optional[Type[BaseModel]] = None) -> str:
+        """Answer after MOCK_AI_LATENCY_SECONDS"""
+        await asyncio.sleep(settings.MOCK_AI_LATENCY_SECONDS)
+        return mock_completion(prompt, response_wrap_key(response_model))
+
+    async def _request_stream(self, prompt: str) -> AsyncIterator[str]:
+        """Stream the answer word by word, spreading the simulated latency across chunks"""
+        chunks = re.findall(r"\S+\s*", mock_completion(prompt))
+        delay = settings.MOCK_AI_LATENCY_SECONDS / max(len(chunks), 1)
+        for chunk in chunks:
+            await asyncio.sleep(delay)
+            yield chunk
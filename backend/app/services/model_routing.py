@@ -0,0 +1,195 @@
+"""
+Per-operation model routing within the user's provider.
+
+Operations are mapped to tiers. "standard" operations (experience and
+project rewrites, cover letters, proposals, the combined tailor call) run
+on the model the user configured. "fast" operations (AI_ROUTING_FAST_OPERATIONS,
+short answers such as the summary, skills selection and ATS score) run on
+the cheapest fast model of the same provider whose observed p90 latency for
+that operation meets AI_ROUTING_LATENCY_SLO_SECONDS; models without enough
+samples yet are tried so they get measured. Routing only ever moves to a
+cheaper model (of the same vendor on OpenRouter), skips models whose
+circuit is open, and falls back to the lowest-latency candidate when none
+meets the SLO. It is off unless the server enables it (AI_ROUTING_ENABLED)
+and the user opts in (fast_routing in their AI settings); the models that
+answered a request are reported in its X-AI-Models header.
+"""
+import threading
+from collections import Counter, deque
+from typing import Deque, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.services.circuit_breaker import OPEN, breaker_registry
+
+# Latency samples kept per (provider, model, operation)
+WINDOW = 100
+
+# Fast-tier models per provider, preferred first
+FAST_MODELS: Dict[str, List[str]] = {
+    "gemini": ["gemini-1.5-flash", "gemini-2.0-flash-exp"],
+    "openai": ["gpt-4o-mini"],
+    "openrouter": ["openai/gpt-4o-mini", "google/gemini-flash-1.5", "anthropic/claude-3-haiku"],
+}
+
+# List prices in USD per million (input, output) tokens, for routing and cost estimates
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gemini-2.0-flash-exp": (0.10, 0.40),
+    "gemini-1.5-flash": (0.075, 0.30),
+    "gemini-1.5-pro": (1.25, 5.00),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4-turbo": (10.00, 30.00),
+    "gpt-3.5-turbo": (0.50, 1.50),
+    "anthropic/claude-3.5-sonnet": (3.00, 15.00),
+    "anthropic/claude-3-opus": (15.00, 75.00),
+    "anthropic/claude-3-haiku": (0.25, 1.25),
+    "openai/gpt-4o": (2.50, 10.00),
+    "openai/gpt-4o-mini": (0.15, 0.60),
+    "google/gemini-pro-1.5": (1.25, 5.00),
+    "google/gemini-flash-1.5": (0.075, 0.30),
+    "meta-llama/llama-3.1-70b-instruct": (0.35, 0.40),
+    "mistralai/mixtral-8x7b-instruct": (0.24, 0.24),
+}
+
+
+def model_cost(model: str, input_tokens: int, output_tokens: int) -> Optional[float]:
+    """Estimated USD cost of a call, None for models without a known price"""
+    price = MODEL_PRICES.get(model)
+    if price is None:
+        return None
+    return (input_tokens * price[0] + output_tokens * price[1]) / 1e6
+
+
+def _blended_price(model: str) -> Optional[float]:
+    price = MODEL_PRICES.get(model)
+    # Tailoring prompts are input-heavy: weight input 3:1
+    return (3 * price[0] + price[1]) / 4 if price else None
+
+
+class _RouteStats:
+    __slots__ = ("latencies", "calls", "failures", "cost")
+
+    def __init__(self):
+        self.latencies: Deque[float] = deque(maxlen=WINDOW)
+        self.calls = 0
+        self.failures = 0
+        self.cost = 0.0
+
+
+class ModelRouter:
+    """Chooses a model per operation and tracks observed latency and cost"""
+
+    def __init__(self, enabled: bool, fast_operations: str, latency_slo: float, min_samples: int):
+        self.enabled = enabled
+        self.fast_operations = {op.strip() for op in fast_operations.split(",") if op.strip()}
+        self.latency_slo = latency_slo
+        self.min_samples = min_samples
+        self._stats: Dict[Tuple[str, str, str], _RouteStats] = {}
+        self._routed: Counter = Counter()  # (provider, configured, routed, operation) -> decisions
+        self._lock = threading.Lock()
+
+    def tier(self, operation: Optional[str]) -> str:
+        return "fast" if self.enabled and operation in self.fast_operations else "standard"
+
+    def choose(self, provider: str, model: str, operation: Optional[str]) -> str:
+        """Model to run an operation on, given the user's configured model"""
+        if self.tier(operation) == "standard":
+            return model
+        routed = self._choose_fast(provider, model, operation)
+        if routed != model:
+            with self._lock:
+                self._routed[(provider, model, routed, operation)] += 1
+        return routed
+
+    @staticmethod
+    def _same_vendor(provider: str, model: str, candidate: str) -> bool:
+        """OpenRouter models are "vendor/model"; never route a user to another vendor"""
+        return provider != "openrouter" or candidate.split("/", 1)[0] == model.split("/", 1)[0]
+
+    def _choose_fast(self, provider: str, model: str, operation: str) -> str:
+        configured_price = _blended_price(model)
+        candidates = [
+            candidate for candidate in FAST_MODELS.get(provider, [])
+            if candidate != model
+            and self._same_vendor(provider, model, candidate)
+            and configured_price is not None
+            and _blended_price(candidate) < configured_price
+            and breaker_registry.get(provider, candidate).state != OPEN
+        ]
+        if not candidates:
+            return model
+        candidates.sort(key=_blended_price)
+        candidates.append(model)
+
+        observed = []
+        for candidate in candidates:
+            latency = self.p90(provider, candidate, operation)
+            if latency is None or latency <= self.latency_slo:
+                return candidate
+            observed.append((latency, candidate))
+        # Ties go to the cheaper model
+        return min(observed, key=lambda item: item[0])[1]
+
+    def p90(self, provider: str, model: str, operation: str) -> Optional[float]:
+        """Observed p90 latency, or None until there are enough samples"""
+        with self._lock:
+            stats = self._stats.get((provider, model, operation))
+            if stats is None or len(stats.latencies) < self.min_samples:
+                return None
+            return self._p90_locked(stats.latencies)
+
+    def record(
+        self,
+        provider: str,
+        model: str,
+        operation: Optional[str],
+        latency: float,
+        failed: bool = False,
+        input_tokens: int = 0,
+        output_tokens: int = 0
+    ):
+        key = (provider, model, operation or "other")
+        cost = model_cost(model, input_tokens, output_tokens) or 0.0
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = _RouteStats()
+            stats.calls += 1
+            if failed:
+                stats.failures += 1
+            else:
+                stats.latencies.append(latency)
+                stats.cost += cost
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "fast_operations": sorted(self.fast_operations),
+                "latency_slo_seconds": self.latency_slo,
+                "routed": {
+                    f"{provider}:{configured}->{routed}:{operation}": count
+                    for (provider, configured, routed, operation), count in self._routed.items()
+                },
+                "routes": {
+                    ":".join(key): {
+                        "calls": stats.calls,
+                        "failures": stats.failures,
+                        "p90_seconds": round(self._p90_locked(stats.latencies), 3) if stats.latencies else None,
+                        "estimated_cost_usd": round(stats.cost, 6)
+                    }
+                    for key, stats in self._stats.items()
+                }
+            }
+
+    @staticmethod
+    def _p90_locked(samples: Deque[float]) -> float:
+        ordered = sorted(samples)
+        return ordered[min(int(len(ordered) * 0.9), len(ordered) - 1)]
+
+
+model_router = ModelRouter(
+    enabled=settings.AI_ROUTING_ENABLED,
+    fast_operations=settings.AI_ROUTING_FAST_OPERATIONS,
+    latency_slo=settings.AI_ROUTING_LATENCY_SLO_SECONDS,
+    min_samples=settings.AI_ROUTING_MIN_SAMPLES
+)
@@ -0,0 +1,197 @@
+"""
+Compact prompt inputs and an input-token budget.
+
+Profile data goes into prompts as compact JSON. Operations that only read
+the profile for context (ATS score, cover letter, proposal, summary) also
+drop ids, the stored cover letter, contact details and empty fields.
+Operations whose answer must mirror their input keep every field. When the
+rendered prompt is still over AI_INPUT_TOKEN_BUDGET, the bullets that
+BulletPointRanker scores lowest against the job description are dropped
+(never below MIN_BULLETS per entry) until it fits, except for operations
+that rewrite every bullet they are given.
+"""
+import json
+import logging
+import re
+import threading
+from typing import Any, Dict, List
+from pydantic import BaseModel
+from app.core.config import settings
+from app.services.content_analyzer import BulletPointRanker
+from app.services.jd_digest import JobDigest
+from app.services.prompts import render_prompt
+
+logger = logging.getLogger(__name__)
+
+# Words, numbers, punctuation marks and line breaks with their indentation:
+# within ~15% of BPE counts for English and JSON
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]|\n[ \t]*")
+
+# Bullets always kept per experience or project when trimming
+MIN_BULLETS = 2
+
+# Operations answering with every input bullet rewritten; a trimmed bullet
+# would silently disappear from the tailored resume, so these are never trimmed
+UNTRIMMED_OPERATIONS = {"tailor_experience", "tailor_projects", "tailor_resume_combined"}
+
+CONTACT_FIELDS = {"email", "phone", "linkedin", "github"}
+
+# Fields removed from read-only inputs, per operation; operations not listed
+# keep the full structure because their JSON answer has to mirror it
+DROPPED_FIELDS = {
+    "tailor_summary": set(),
+    "calculate_ats_score": {"id", "coverLetter"},
+    "generate_cover_letter": {"id", "coverLetter"} | CONTACT_FIELDS,
+    "generate_proposal": {"id", "coverLetter"} | CONTACT_FIELDS,
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Local token estimate, no tokenizer download or API call"""
+    return len(TOKEN_PATTERN.findall(text))
+
+
+def to_data(value: Any) -> Any:
+    """Plain JSON-ready data from models and lists of models"""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, list):
+        return [to_data(item) for item in value]
+    return value
+
+
+def prune(value: Any, dropped: set) -> Any:
+    """Remove dropped keys and empty values, recursively"""
+    if isinstance(value, dict):
+        pruned = {key: prune(item, dropped) for key, item in value.items() if key not in dropped}
+        return {key: item for key, item in pruned.items() if item not in ("", [], {}, None)}
+    if isinstance(value, list):
+        return [prune(item, dropped) for item in value]
+    return value
+
+
+def compact_json(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def _bullet_lists(value: Any):
+    """Every "description" bullet list inside the data"""
+    if isinstance(value, dict):
+        if isinstance(value.get("description"), list):
+            yield value["description"]
+        for item in value.values():
+            yield from _bullet_lists(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _bullet_lists(item)
+
+
+class PromptPlanner:
+    """Renders prompts from compact inputs within the token budget and counts tokens saved"""
+
+    def __init__(self, budget: int):
+        self.budget = budget
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def render(self, operation: str, **inputs: Any) -> str:
+        """
+        Render an operation's prompt. Inputs may be strings (used as-is),
+        models, lists of models or plain data; a JobDigest job_description
+        is rendered in its compact prompt form.
+        """
+        job = inputs.get("job_description")
+        digest = job if isinstance(job, JobDigest) else None
+        data = {name: to_data(value) for name, value in inputs.items()}
+        if digest is not None:
+            data["job_description"] = digest.text
+            terms = digest.important_terms
+        else:
+            terms = BulletPointRanker.extract_important_terms(job) if job else []
+        # Baseline: every field as indented JSON with the normalized posting (boilerplate
+        # already removed), so tokens_saved counts the compact JSON, dropped fields,
+        # sectioned posting and trimmed bullets, not the boilerplate removal
+        baseline = estimate_tokens(render_prompt(operation, **{
+            name: value if isinstance(value, str) else json.dumps(value, indent=2)
+            for name, value in data.items()
+        }))
+        if digest is not None:
+            data["job_description"] = digest.prompt_text()
+
+        dropped = DROPPED_FIELDS.get(operation)
+        if dropped is not None:
+            data = {name: prune(value, dropped) for name, value in data.items()}
+
+        prompt = self._render(operation, data)
+        tokens = estimate_tokens(prompt)
+        trimmed = 0
+        if tokens > self.budget and operation not in UNTRIMMED_OPERATIONS:
+            trimmed = self._trim(data, tokens - self.budget, terms)
+            prompt = self._render(operation, data)
+            tokens = estimate_tokens(prompt)
+            logger.info("Trimmed %d low-relevance bullets from %s prompt (%d tokens, budget %d)",
+                        trimmed, operation, tokens, self.budget)
+
+        self._record(operation, baseline, tokens, trimmed)
+        return prompt
+
+    @staticmethod
+    def _render(operation: str, data: Dict[str, Any]) -> str:
+        return render_prompt(operation, **{
+            name: value if isinstance(value, str) else compact_json(value)
+            for name, value in data.items()
+        })
+
+    @staticmethod
+    def _trim(data: Dict[str, Any], excess: int, terms: List[str]) -> int:
+        """Drop the lowest-ranked bullets (in place) until about `excess` tokens are gone"""
+        candidates = []
+        for bullets in _bullet_lists(data):
+            for index, bullet in enumerate(bullets):
+                if isinstance(bullet, str):
+                    score = BulletPointRanker.score_bullet(bullet, terms)["score"]
+                    candidates.append((score, -len(bullet), id(bullets), index, bullets, estimate_tokens(bullet) + 3))
+        candidates.sort(key=lambda candidate: candidate[:4])
+
+        drops: Dict[int, set] = {}
+        removed = 0
+        for _, _, list_id, index, bullets, tokens in candidates:
+            if excess <= 0:
+                break
+            indexes = drops.setdefault(list_id, set())
+            if len(bullets) - len(indexes) <= MIN_BULLETS:
+                continue
+            indexes.add(index)
+            excess -= tokens
+            removed += 1
+
+        for bullets in _bullet_lists(data):
+            indexes = drops.get(id(bullets))
+            if indexes:
+                bullets[:] = [bullet for index, bullet in enumerate(bullets) if index not in indexes]
+        return removed
+
+    def _record(self, operation: str, baseline: int, tokens: int, trimmed: int):
+        with self._lock:
+            stats = self._stats.setdefault(operation, {"calls": 0, "tokens": 0, "tokens_saved": 0, "bullets_trimmed": 0})
+            stats["calls"] += 1
+            stats["tokens"] += tokens
+            stats["tokens_saved"] += baseline - tokens
+            stats["bullets_trimmed"] += trimmed
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "input_token_budget": self.budget,
+                "operations": {
+                    operation: {
+                        **stats,
+                        "tokens_per_call": round(stats["tokens"] / stats["calls"]),
+                        "tokens_saved_per_call": round(stats["tokens_saved"] / stats["calls"])
+                    }
+                    for operation, stats in self._stats.items()
+                }
+            }
+
+
+prompt_planner = PromptPlanner(budget=settings.AI_INPUT_TOKEN_BUDGET)
@@ -0,0 +1,253 @@
+"""
+Versioned prompt templates for every AI operation.
+
+Prompts are laid out static-first so provider-side prompt caching (OpenAI,
+Gemini, Anthropic via OpenRouter) can reuse the longest possible prefix:
+the shared SYSTEM_PROMPT, then the operation's fixed instructions, then
+candidate data, with the job description - the part that changes on every
+request - last. Bump a template's version whenever its wording changes;
+the version is part of AI response cache keys.
+"""
+from typing import Dict, List, Optional, Tuple
+
+SYSTEM_PROMPT = "You are an expert resume writer and career advisor."
+
+
+class PromptTemplate:
+    """Fixed instructions followed by titled data sections and a closing cue"""
+
+    def __init__(
+        self,
+        name: str,
+        version: int,
+        instructions: str,
+        sections: List[Tuple[str, str]],
+        cue: str = ""
+    ):
+        self.name = name
+        self.version = version
+        self.instructions = instructions.strip()
+        self.sections = sections  # (title, value name) in render order
+        self.cue = cue
+
+    def render(self, **values: str) -> str:
+        """Build the prompt text; values are already-serialized section contents"""
+        parts = [self.instructions]
+        parts.extend(f"{title}:\n{values[name]}" for title, name in self.sections)
+        if self.cue:
+            parts.append(self.cue)
+        return "\n\n".join(parts)
+
+
+PROMPTS: Dict[str, PromptTemplate] = {}
+
+
+def register(template: PromptTemplate) -> PromptTemplate:
+    PROMPTS[template.name] = template
+    return template
+
+
+def render_prompt(operation: str, **values: str) -> str:
+    return PROMPTS[operation].render(**values)
+
+
+def prompt_version(operation: str) -> Optional[str]:
+    """Template version stamped into cache keys (None for operations without a prompt)"""
+    template = PROMPTS.get(operation)
+    return f"{template.name}@{template.version}" if template else None
+
+
+register(PromptTemplate(
+    name="generate_summary",
+    version=1,
+    instructions="""
+Based on the following work experience, generate a compelling 2-3 sentence professional summary for a resume. Focus on key achievements and skills.
+
+Return only the summary text, no additional formatting or labels.""",
+    sections=[("Experience", "experience")]
+))
+
+register(PromptTemplate(
+    name="tailor_summary",
+    version=4,
+    instructions="""
+You are an expert resume writer. Create a professional summary (2-3 sentences) tailored for the target job below.
+
+Instructions:
+1. Create a compelling 2-3 sentence professional summary
+2. Highlight the most relevant skills and experiences for THIS specific job
+3. Use keywords from the job description naturally
+4. Make it impactful and tailored to the role requirements
+5. Base the summary on the candidate's additional information and experience
+6. Return ONLY the professional summary text, no extra commentary""",
+    sections=[
+        ("Additional Information About the Candidate", "additional_info"),
+        ("Skills", "skills"),
+        ("Work Experience Summary", "experience"),
+        ("Target Job Description", "job_description"),
+    ],
+    cue="Professional Summary:"
+))
+
+register(PromptTemplate(
+    name="tailor_experience",
+    version=4,
+    instructions="""
+You are an expert resume writer. Optimize the work experiences below for the target job description.
+
+Instructions:
+1. SELECT and prioritize the 4-6 most relevant bullet points per role that match the job requirements
+2. Rewrite bullets to emphasize achievements that align with the job description
+3. Use strong action verbs and quantify results wherever possible (percentages, numbers, scale)
+4. Incorporate exact keywords and phrases from the job description naturally
+5. Remove or deprioritize bullets that are not relevant to this specific job
+6. Focus on accomplishments that demonstrate skills mentioned in the job posting
+7. Maintain truthfulness - do NOT add false information or fabricate achievements
+8. Keep the same structure (company, role, dates, location) - only modify description bullets
+9. Return valid JSON array matching the exact input structure""",
+    sections=[
+        ("Current Experiences", "experience"),
+        ("Target Job Description", "job_description"),
+    ],
+    cue="Return only the JSON array, no markdown or additional text:"
+))
+
+register(PromptTemplate(
+    name="tailor_skills",
+    version=4,
+    instructions="""
+You are an expert resume writer. Optimize the skills section below for the target job.
+
+Instructions:
+1. SELECT only the most relevant skills (5-8 per category) from the original list that match the job requirements
+2. Remove skills that are NOT mentioned or relevant to the job description
+3. Prioritize skills that appear in the job description
+4. If a category has no relevant skills, you may return an empty array for that category
+5. Do NOT add new skills - only select from the existing list
+6. Return valid JSON object matching the exact input structure""",
+    sections=[
+        ("Current Skills", "skills"),
+        ("Target Job Description", "job_description"),
+    ],
+    cue="Return only the JSON object, no markdown or additional text:"
+))
+
+register(PromptTemplate(
+    name="tailor_projects",
+    version=4,
+    instructions="""
+You are an expert resume writer. Optimize the projects below for the target job.
+
+Instructions:
+1. Rewrite project descriptions to emphasize relevant technologies and achievements
+2. Incorporate keywords from the job description
+3. Keep the same structure
+4. Return valid JSON array matching the exact input structure""",
+    sections=[
+        ("Current Projects", "projects"),
+        ("Target Job Description", "job_description"),
+    ],
+    cue="Return only the JSON array, no markdown or additional text:"
+))
+
+register(PromptTemplate(
+    name="calculate_ats_score",
+    version=4,
+    instructions="""
+You are an ATS (Applicant Tracking System) expert. Analyze the resume below against the job description and provide an ATS compatibility score.
+
+Analyze:
+1. Keyword matching
+2. Skills alignment
+3. Experience relevance
+4. Format compatibility
+
+Provide a score from 0-100 and brief feedback. Return valid JSON:
+{"score": 85, "feedback": "Strong match with relevant keywords..."}""",
+    sections=[
+        ("Resume Data", "resume"),
+        ("Job Description", "job_description"),
+    ],
+    cue="Return only the JSON object:"
+))
+
+register(PromptTemplate(
+    name="tailor_resume_combined",
+    version=4,
+    instructions="""
+You are an expert resume writer. Tailor the resume below for the target job in a single pass.
+
+Instructions:
+1. "summary": a compelling 2-3 sentence professional summary tailored to THIS job, using its keywords naturally
+2. "experience": for each role keep id, company, role, location and dates unchanged; SELECT and rewrite the 4-6 most relevant bullets with strong action verbs and quantified results
+3. "skills": SELECT only the most relevant skills (5-8 per category) from the existing lists; do NOT add new skills
+4. "projects": keep id, name and technologies; rewrite descriptions to emphasize relevant technologies and achievements
+5. Maintain truthfulness - do NOT add false information or fabricate achievements
+6. Return one valid JSON object with exactly the keys "summary", "experience", "skills", "projects", using the same structure as the inputs""",
+    sections=[
+        ("Additional Information About the Candidate", "additional_info"),
+        ("Current Skills", "skills"),
+        ("Current Experiences", "experience"),
+        ("Current Projects", "projects"),
+        ("Target Job Description", "job_description"),
+    ],
+    cue="Return only the JSON object, no markdown or additional text:"
+))
+
+register(PromptTemplate(
+    name="generate_cover_letter",
+    version=2,
+    instructions="""
+You are a professional cover letter writer. Create a complete, professional cover letter for the job application below.
+
+Write a complete cover letter including:
+1. Professional greeting (e.g., "Dear Hiring Manager,")
+2. 3-4 body paragraphs highlighting relevant experience and skills
+3. Professional closing (e.g., "Sincerely,")
+4. Candidate's full name
+
+IMPORTANT: Keep the total word count to approximately 300 words or less.
+Keep the letter professional, concise, and tailored to the specific job requirements.""",
+    sections=[
+        ("Candidate Information", "profile"),
+        ("Job Description", "job_description"),
+        ("Additional Instructions", "instructions"),
+    ],
+    cue="Cover Letter:"
+))
+
+register(PromptTemplate(
+    name="generate_proposal",
+    version=2,
+    instructions="""
+You are an expert freelance proposal writer. Create a winning proposal for the freelance job below.
+
+Create a compelling proposal with the following structure:
+
+1. CREATIVE HOOK (1-2 sentences): Start with an attention-grabbing opening that shows understanding of the client's needs
+
+2. SOLUTION APPROACH (2-3 sentences): Briefly explain how you would solve their problem or complete the project
+
+3. RELEVANT EXPERIENCE (2-3 sentences): Highlight specific experience that directly relates to this job
+
+4. INTELLIGENT QUESTIONS (2 questions): Ask 2 thoughtful questions that show you've read the job description carefully and are trying to build a conversation
+
+5. CALL TO ACTION (1-2 sentences): End with a clear next step
+
+Keep the total proposal around 250-300 words. Be professional but friendly and conversational.
+Also, analyze the candidate's profile and identify:
+- Which specific experiences from their profile are MOST relevant to this job
+- Which specific projects from their profile are MOST relevant to this job
+
+Return your response as JSON with this structure:
+{
+  "proposal": "the complete proposal text",
+  "suggestedExperience": ["experience 1 company and role", "experience 2 company and role"],
+  "suggestedProjects": ["project 1 name", "project 2 name"]
+}""",
+    sections=[
+        ("Candidate Profile", "profile"),
+        ("Freelance Job Description", "job_description"),
+    ],
+    cue="Important: Return ONLY the JSON object, no additional text or markdown formatting."
+))
@@ -0,0 +1,342 @@
+"""
+Adaptive concurrency limits and retries for AI provider calls.
+
+Each (provider, API key) pair gets an AIMD limiter: the number of calls
+allowed in flight grows by about one per round of successful calls and is
+halved when the provider answers 429 or latency exceeds the target. A
+Retry-After (or exhausted rate-limit header) pauses new calls on that key
+until the provider says it is ready, so bursts queue instead of failing.
+Every call also ends by the deadline of the API request it serves, when
+one is set with deadline_scope.
+"""
+import asyncio
+import email.utils
+import hashlib
+import logging
+import random
+import re
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Optional, Dict, Tuple, Callable, Awaitable, Any, Mapping, AsyncIterator
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
+
+
+class ProviderCallError(Exception):
+    """A failed provider call with what is known about whether to retry it"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @property
+    def rate_limited(self) -> bool:
+        return self.status_code == 429
+
+    @property
+    def retryable(self) -> bool:
+        # No status code means a transport failure (timeout, reset connection)
+        return self.status_code is None or self.status_code in RETRYABLE_STATUS
+
+
+def _parse_duration(value: str) -> Optional[float]:
+    """Parse "1.5", "20ms" or "6m0s" style durations into seconds"""
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = re.findall(r"([\d.]+)(ms|h|m|s)", value)
+    if not parts:
+        return None
+    scale = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+    return sum(float(number) * scale[unit] for number, unit in parts)
+
+
+def parse_retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """
+    Seconds to wait before the next call, from Retry-After or from exhausted
+    x-ratelimit-* headers (OpenAI durations, OpenRouter epoch milliseconds)
+    """
+    if not headers:
+        return None
+    headers = {k.lower(): v for k, v in headers.items()}
+
+    retry_after = headers.get("retry-after-ms")
+    if retry_after:
+        try:
+            return float(retry_after) / 1000
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        seconds = _parse_duration(retry_after)
+        if seconds is not None:
+            return max(seconds, 0.0)
+        try:
+            return max(email.utils.parsedate_to_datetime(retry_after).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            pass
+
+    for remaining_header, reset_header in (
+        ("x-ratelimit-remaining-requests", "x-ratelimit-reset-requests"),
+        ("x-ratelimit-remaining", "x-ratelimit-reset"),
+    ):
+        if headers.get(remaining_header, "").strip() != "0" or not headers.get(reset_header):
+            continue
+        reset = _parse_duration(headers[reset_header])
+        if reset is None:
+            continue
+        if reset > 1e11:
+            # Epoch milliseconds
+            reset = reset / 1000 - time.time()
+        return max(reset, 0.0)
+    return None
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit for one provider key"""
+
+    def __init__(
+        self,
+        initial_limit: float,
+        min_limit: float,
+        max_limit: float,
+        latency_target: float
+    ):
+        self.limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._condition = asyncio.Condition()
+        self._calls = 0
+        self._throttled = 0
+        self._retries = 0
+
+    async def _acquire(self):
+        async with self._condition:
+            while True:
+                wait = self.paused_until - time.monotonic()
+                if wait <= 0 and self.in_flight < max(int(self.limit), 1):
+                    self.in_flight += 1
+                    return
+                try:
+                    await asyncio.wait_for(self._condition.wait(), wait if wait > 0 else None)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _release(self):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one of the key's concurrent call slots"""
+        await self._acquire()
+        try:
+            yield
+        finally:
+            await self._release()
+
+    def on_success(self, latency: float):
+        self._calls += 1
+        if latency > self.latency_target:
+            # Slow answers are an early sign of overload: back off gently
+            self.limit = max(self.min_limit, self.limit * 0.9)
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def on_throttled(self, retry_after: Optional[float]):
+        self._calls += 1
+        self._throttled += 1
+        self.limit = max(self.min_limit, self.limit / 2)
+        if retry_after:
+            self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+
+    def on_retry(self):
+        self._retries += 1
+
+    def stats(self) -> dict:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "paused_for": round(max(self.paused_until - time.monotonic(), 0.0), 2),
+            "calls": self._calls,
+            "throttled": self._throttled,
+            "retries": self._retries
+        }
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff, never shorter than the provider's Retry-After"""
+    delay = random.uniform(0, min(settings.AI_RETRY_MAX_DELAY, settings.AI_RETRY_BASE_DELAY * 2 ** attempt))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def _retry_delay(
+    limiter: AdaptiveLimiter,
+    error: ProviderCallError,
+    retries: int,
+    deadline: float
+) -> Optional[float]:
+    """Record a failed attempt; seconds to wait before retrying, or None to give up"""
+    if error.rate_limited:
+        limiter.on_throttled(error.retry_after)
+    if not error.retryable or retries + 1 >= settings.AI_RETRY_MAX_ATTEMPTS:
+        return None
+    delay = backoff_delay(retries, error.retry_after)
+    if time.monotonic() + delay >= deadline:
+        return None
+    limiter.on_retry()
+    logger.debug("Retrying provider call in %.1fs (attempt %d): %s", delay, retries + 2, error)
+    return delay
+
+
+# time.monotonic() by which the current API request must be answered; tasks
+# started inside a deadline_scope inherit it
+request_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(seconds: float):
+    """Provider calls made inside the block end within `seconds`; nested scopes only tighten"""
+    deadline = time.monotonic() + seconds
+    current = request_deadline.get()
+    token = request_deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        request_deadline.reset(token)
+
+
+def _default_deadline() -> float:
+    deadline = time.monotonic() + settings.AI_REQUEST_DEADLINE_SECONDS
+    current = request_deadline.get()
+    return deadline if current is None else min(current, deadline)
+
+
+async def call_with_retries(
+    limiter: AdaptiveLimiter,
+    call: Callable[[], Awaitable[Any]],
+    deadline: Optional[float] = None
+) -> Any:
+    """
+    Run a provider call under the key's limiter, retrying throttled and transient
+    failures with backoff as long as the next attempt can start before the deadline
+    (a time.monotonic() value; defaults to AI_REQUEST_DEADLINE_SECONDS from now).
+    """
+    deadline = deadline or _default_deadline()
+
+    async def attempt():
+        async with limiter.slot():
+            started = time.monotonic()
+            result = await call()
+            return result, time.monotonic() - started
+
+    retries = 0
+    while True:
+        if deadline <= time.monotonic():
+            raise ProviderCallError("Provider request deadline exceeded", status_code=504)
+        try:
+            result, latency = await asyncio.wait_for(attempt(), max(deadline - time.monotonic(), 0.001))
+        except asyncio.TimeoutError:
+            raise ProviderCallError("Provider request deadline exceeded", status_code=504)
+        except ProviderCallError as e:
+            delay = _retry_delay(limiter, e, retries, deadline)
+            if delay is None:
+                raise
+            retries += 1
+            await asyncio.sleep(delay)
+            continue
+
+        limiter.on_success(latency)
+        return result
+
+
+async def stream_with_retries(
+    limiter: AdaptiveLimiter,
+    open_stream: Callable[[], AsyncIterator[str]],
+    deadline: Optional[float] = None
+) -> AsyncIterator[str]:
+    """
+    Relay a provider stream while holding a limiter slot. Failures before the
+    first chunk are retried like call_with_retries; once text has been relayed
+    a failure is raised, since the caller has already shown it. Each chunk is
+    awaited only until the deadline, so a stalled stream is cut off too.
+    """
+    deadline = deadline or _default_deadline()
+    retries = 0
+    while True:
+        relayed = False
+        try:
+            async with limiter.slot():
+                started = time.monotonic()
+                stream = open_stream().__aiter__()
+                try:
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(stream.__anext__(), max(deadline - time.monotonic(), 0.001))
+                        except StopAsyncIteration:
+                            break
+                        except asyncio.TimeoutError:
+                            raise ProviderCallError("Provider stream deadline exceeded", status_code=504)
+                        if not relayed:
+                            relayed = True
+                            limiter.on_success(time.monotonic() - started)
+                        yield chunk
+                finally:
+                    if hasattr(stream, "aclose"):
+                        await stream.aclose()
+            return
+        except ProviderCallError as e:
+            if relayed:
+                raise
+            delay = _retry_delay(limiter, e, retries, deadline)
+            if delay is None:
+                raise
+            retries += 1
+            await asyncio.sleep(delay)
+
+
+class LimiterRegistry:
+    """One limiter per (provider, API key); keys are hashed so they never sit in memory as map keys"""
+
+    def __init__(self):
+        self._limiters: Dict[Tuple[str, str], AdaptiveLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider: str, api_key: str) -> AdaptiveLimiter:
+        key = (provider, hashlib.sha256(api_key.encode()).hexdigest()[:16])
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limiter = AdaptiveLimiter(
+                    initial_limit=settings.AI_LIMITER_INITIAL_CONCURRENCY,
+                    min_limit=1,
+                    max_limit=settings.AI_LIMITER_MAX_CONCURRENCY,
+                    latency_target=settings.AI_LIMITER_LATENCY_TARGET_SECONDS
+                )
+                self._limiters[key] = limiter
+            return limiter
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                f"{provider}:{key_hash[:8]}": limiter.stats()
+                for (provider, key_hash), limiter in self._limiters.items()
+            }
+
+
+limiter_registry = LimiterRegistry()
@@ -0,0 +1,42 @@
+"""Persistence interfaces implemented by the database services"""
+from abc import ABC, abstractmethod
+from typing import Optional
+from app.models.resume import ResumeData
+
+
+class ProfileRepository(ABC):
+    """Storage for resume profiles"""
+
+    @abstractmethod
+    async def get_profile(self, user_id: str) -> Optional[dict]:
+        """Get user profile, or None if not found"""
+        pass
+
+    @abstractmethod
+    async def save_profile(self, user_id: str, profile_data: ResumeData, target_jd: str = "") -> bool:
+        """Save or update user profile"""
+        pass
+
+    @abstractmethod
+    async def delete_profile(self, user_id: str) -> bool:
+        """Delete user profile"""
+        pass
+
+
+class AISettingsRepository(ABC):
+    """Storage for per-user AI provider settings"""
+
+    @abstractmethod
+    async def get_ai_settings(self, user_id: str) -> Optional[dict]:
+        """Get the raw settings row for a user, or None if not configured"""
+        pass
+
+    @abstractmethod
+    async def upsert_ai_settings(self, user_id: str, provider_config: str) -> None:
+        """Insert or update the provider config JSON for a user"""
+        pass
+
+    @abstractmethod
+    async def delete_ai_settings(self, user_id: str) -> None:
+        """Delete settings for a user"""
+        pass
@@ -0,0 +1,65 @@
+"""Coalescing of identical in-flight AI provider calls"""
+import asyncio
+from typing import Dict, Callable, Awaitable, Any
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time; callers arriving while it is in
+    flight await the same result. The shared call is cancelled only when every
+    caller waiting on it has been cancelled.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self._started = 0
+        self._joined = 0
+        self._abandoned = 0
+
+    def _forget(self, key: str, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    async def do(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Run call() for key, or join the identical call already running"""
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(call()))
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            self._flights[key] = flight
+            self._started += 1
+        else:
+            self._joined += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                # Last interested caller left: stop paying for the provider call
+                flight.task.cancel()
+                self._forget(key, flight)
+                self._abandoned += 1
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._flights),
+            "started": self._started,
+            "joined": self._joined,
+            "abandoned": self._abandoned
+        }
+
+
+# Identical provider calls (same key, model, parameters and prompt)
+completion_flights = SingleFlight()
@@ -0,0 +1,95 @@
+"""Helpers for relaying LLM output incrementally over server-sent events"""
+import json
+from typing import Any
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class JSONStringFieldStream:
+    """
+    Incrementally decodes the value of one top-level string field (e.g.
+    "proposal") from a JSON document arriving in chunks, so its text can be
+    shown before the whole document has been generated.
+    """
+
+    ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+    def __init__(self, field: str):
+        self.marker = f'"{field}"'
+        self._seen = ""        # raw text received before the value started
+        self._pending = ""     # raw value text not decoded yet (partial escapes)
+        self._state = "search"  # search -> value -> done
+
+    def feed(self, chunk: str) -> str:
+        """Consume a chunk and return newly decoded characters of the field value"""
+        if self._state == "done":
+            return ""
+
+        if self._state == "search":
+            self._seen += chunk
+            chunk = self._find_value_start()
+            if chunk is None:
+                return ""
+
+        self._pending += chunk
+        return self._decode()
+
+    def _find_value_start(self):
+        """Return raw text after the value's opening quote, or None if not there yet"""
+        while True:
+            start = self._seen.find(self.marker)
+            if start == -1:
+                return None
+            rest = self._seen[start + len(self.marker):].lstrip()
+            if not rest or (rest == ":" or rest.startswith(":") and not rest[1:].strip()):
+                return None  # key seen, value not started yet
+            if not rest.startswith(":"):
+                # Marker appeared as a value, not a key; keep searching after it
+                self._seen = self._seen[start + len(self.marker):]
+                continue
+            rest = rest[1:].lstrip()
+            self._seen = ""
+            if not rest.startswith('"'):
+                self._state = "done"  # not a string value
+                return None
+            self._state = "value"
+            return rest[1:]
+
+    def _decode(self) -> str:
+        out = []
+        i = 0
+        text = self._pending
+        while i < len(text):
+            char = text[i]
+            if char == '"':
+                self._state = "done"
+                self._pending = ""
+                return "".join(out)
+            if char != "\\":
+                out.append(char)
+                i += 1
+                continue
+            if i + 1 >= len(text):
+                break  # escape split across chunks
+            code = text[i + 1]
+            if code == "u":
+                if i + 6 > len(text):
+                    break
+                codepoint = int(text[i + 2:i + 6], 16)
+                if 0xD800 <= codepoint < 0xDC00:
+                    # Surrogate pair: wait for the low half
+                    if i + 12 > len(text):
+                        break
+                    low = int(text[i + 8:i + 12], 16)
+                    codepoint = 0x10000 + ((codepoint - 0xD800) << 10) + (low - 0xDC00)
+                    i += 6
+                out.append(chr(codepoint))
+                i += 6
+            else:
+                out.append(self.ESCAPES.get(code, code))
+                i += 2
+        self._pending = text[i:]
+        return "".join(out)
@@ -0,0 +1,145 @@
+"""
+Response schemas for structured (JSON schema constrained) provider output.
+
+Schemas are generated from the resume pydantic models, flattened to the
+subset every provider accepts (no $refs, titles or defaults; every object
+closed and fully required), and validated with cached TypeAdapters.
+Top-level lists are wrapped in an object because OpenAI requires one.
+"""
+import copy
+from functools import lru_cache
+from typing import Any, Dict, List, Type
+from pydantic import BaseModel, TypeAdapter, ValidationError, create_model
+from app.models.resume import Experience, Skills, Project, TailoredResumeData
+from app.services.json_repair import extract_json, JSONRepairError
+
+
+class StructuredOutputError(ValueError):
+    """Provider output that is not valid JSON for the requested response model"""
+
+
+class ExperienceList(BaseModel):
+    experience: List[Experience]
+
+
+class ProjectList(BaseModel):
+    projects: List[Project]
+
+
+# Sections of TailoredResumeData the model rewrites in combined mode; the rest
+# (personal info, education, certifications) always comes from the profile
+TailoredSections = create_model(
+    "TailoredSections",
+    **{
+        name: (TailoredResumeData.model_fields[name].annotation, ...)
+        for name in ("summary", "experience", "skills", "projects")
+    }
+)
+
+RESPONSE_MODELS = {
+    "tailor_experience": ExperienceList,
+    "tailor_skills": Skills,
+    "tailor_projects": ProjectList,
+    "tailor_resume_combined": TailoredSections,
+}
+
+# Keys Gemini's Schema proto understands
+GEMINI_SCHEMA_KEYS = {"type", "format", "description", "nullable", "enum", "properties", "required", "items"}
+
+
+@lru_cache(maxsize=None)
+def type_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+def _flatten(node: Any, defs: Dict[str, Any]) -> Any:
+    if isinstance(node, list):
+        return [_flatten(item, defs) for item in node]
+    if not isinstance(node, dict):
+        return node
+
+    if "$ref" in node:
+        return _flatten(defs[node["$ref"].split("/")[-1]], defs)
+
+    any_of = node.get("anyOf")
+    if any_of:
+        # Optional[X] -> X with nullable; providers reject general unions
+        options = [option for option in any_of if option.get("type") != "null"]
+        flattened = _flatten(options[0], defs)
+        if len(options) < len(any_of):
+            flattened["nullable"] = True
+        return flattened
+
+    result = {}
+    for key, value in node.items():
+        if key in ("title", "default", "$defs"):
+            continue
+        if key == "properties":
+            result[key] = {name: _flatten(prop, defs) for name, prop in value.items()}
+        else:
+            result[key] = _flatten(value, defs)
+
+    if result.get("type") == "object":
+        result["required"] = list(result.get("properties", {}))
+        result["additionalProperties"] = False
+    return result
+
+
+@lru_cache(maxsize=None)
+def _json_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    schema = model.model_json_schema()
+    return _flatten(schema, schema.get("$defs", {}))
+
+
+def json_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Closed, fully required JSON schema for OpenAI-style structured output"""
+    def convert(node):
+        if isinstance(node, dict):
+            node = {key: convert(value) for key, value in node.items()}
+            if node.pop("nullable", False):
+                node["type"] = [node["type"], "null"]
+            return node
+        if isinstance(node, list):
+            return [convert(item) for item in node]
+        return node
+    return convert(copy.deepcopy(_json_schema(model)))
+
+
+def gemini_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Schema restricted to the keys Gemini's response_schema accepts"""
+    def strip(node):
+        if isinstance(node, dict):
+            return {
+                key: ({name: strip(prop) for name, prop in value.items()} if key == "properties" else strip(value))
+                for key, value in node.items()
+                if key in GEMINI_SCHEMA_KEYS
+            }
+        if isinstance(node, list):
+            return [strip(item) for item in node]
+        return node
+    return strip(_json_schema(model))
+
+
+def unwrap(model: Type[BaseModel], value: BaseModel) -> Any:
+    """Return the list inside list wrappers, the model itself otherwise"""
+    if model is ExperienceList:
+        return value.experience
+    if model is ProjectList:
+        return value.projects
+    return value
+
+
+def parse_response(model: Type[BaseModel], text: str) -> Any:
+    """
+    Validate provider output against a response model and unwrap lists.
+    Bare arrays are accepted for list wrappers, since prompts outside
+    structured mode ask for the array itself; malformed or truncated JSON
+    is repaired where possible.
+    """
+    try:
+        data = extract_json(text)
+        if isinstance(data, list) and model in (ExperienceList, ProjectList):
+            data = {next(iter(model.model_fields)): data}
+        return unwrap(model, type_adapter(model).validate_python(data))
+    except (JSONRepairError, ValidationError) as e:
+        raise StructuredOutputError(f"Invalid {model.__name__} response: {e}")
@@ -1,21 +1,67 @@
 from supabase import create_client, Client
+from postgrest import AsyncPostgrestClient
+from postgrest.utils import AsyncClient
+from httpx import Limits, Timeout
 from app.core.config import settings
 from app.models.resume import ResumeData, ResumeProfile
-from typing import Optional
+from app.services.repositories import ProfileRepository, AISettingsRepository
+from typing import Dict, Optional, Union
 from datetime import datetime
 
-class SupabaseService:
+class PooledPostgrestClient(AsyncPostgrestClient):
+    """Async PostgREST client with a connection pool sized from config"""
+
+    def create_session(
+        self,
+        base_url: str,
+        headers: Dict[str, str],
+        timeout: Union[int, float, Timeout],
+        verify: bool = True,
+        proxy: Optional[str] = None,
+    ) -> AsyncClient:
+        return AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            verify=verify,
+            proxy=proxy,
+            follow_redirects=True,
+            http2=True,
+            limits=Limits(
+                max_connections=settings.SUPABASE_DB_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SUPABASE_DB_MAX_KEEPALIVE_CONNECTIONS
+            )
+        )
+
+class SupabaseService(ProfileRepository, AISettingsRepository):
     def __init__(self):
+        # Sync client is kept for Supabase Auth only; table access goes through self.db
         self.client: Client = create_client(
             settings.SUPABASE_URL,
             settings.SUPABASE_SERVICE_KEY
         )
+        self.db = PooledPostgrestClient(
+            f"{settings.SUPABASE_URL}/rest/v1",
+            headers={
+                "apiKey": settings.SUPABASE_SERVICE_KEY,
+                "Authorization": f"Bearer {settings.SUPABASE_SERVICE_KEY}"
+            },
+            timeout=Timeout(
+                settings.SUPABASE_DB_TIMEOUT,
+                connect=settings.SUPABASE_DB_CONNECT_TIMEOUT
+            )
+        )
         self.table_name = "resume_profiles"
+        self.ai_settings_table = "ai_settings"
+
+    async def aclose(self):
+        """Close pooled database connections"""
+        await self.db.aclose()
 
     async def get_profile(self, user_id: str) -> Optional[dict]:
         """Get user profile from database"""
         try:
-            response = self.client.table(self.table_name)\
+            response = await self.db.table(self.table_name)\
                 .select("*")\
                 .eq("user_id", user_id)\
                 .execute()
@@ -42,7 +88,7 @@ class SupabaseService:
                 "updated_at": datetime.utcnow().isoformat()
             }
 
-            response = self.client.table(self.table_name)\
+            await self.db.table(self.table_name)\
                 .upsert(data)\
                 .execute()
 
@@ -54,7 +100,7 @@ class SupabaseService:
     async def delete_profile(self, user_id: str) -> bool:
         """Delete user profile"""
         try:
-            self.client.table(self.table_name)\
+            await self.db.table(self.table_name)\
                 .delete()\
                 .eq("user_id", user_id)\
                 .execute()
@@ -63,4 +109,32 @@ class SupabaseService:
             print(f"Error deleting profile: {e}")
             return False
 
+    async def get_ai_settings(self, user_id: str) -> Optional[dict]:
+        """Get AI settings row for a user"""
+        response = await self.db.table(self.ai_settings_table)\
+            .select("provider_config")\
+            .eq("user_id", user_id)\
+            .execute()
+
+        if response.data and len(response.data) > 0:
+            return response.data[0]
+        return None
+
+    async def upsert_ai_settings(self, user_id: str, provider_config: str) -> None:
+        """Insert or update AI settings on the unique user_id"""
+        await self.db.table(self.ai_settings_table)\
+            .upsert({
+                "user_id": user_id,
+                "provider_config": provider_config,
+                "updated_at": datetime.utcnow().isoformat()
+            }, on_conflict="user_id")\
+            .execute()
+
+    async def delete_ai_settings(self, user_id: str) -> None:
+        """Delete AI settings for a user"""
+        await self.db.table(self.ai_settings_table)\
+            .delete()\
+            .eq("user_id", user_id)\
+            .execute()
+
 supabase_service = SupabaseService()
@@ -0,0 +1,192 @@
+"""
+Local JWT verification for Supabase access tokens.
+Verifies HS256 tokens with the project JWT secret and ES256/RS256 tokens with
+cached JWKS signing keys, so authenticated requests avoid a network hop.
+"""
+import asyncio
+import hashlib
+import json
+import threading
+import time
+import httpx
+import jwt
+from collections import OrderedDict
+from typing import Optional, Dict, Tuple
+from app.core.config import settings
+
+ASYMMETRIC_ALGORITHMS = ("ES256", "RS256")
+
+
+class JWKSCache:
+    """Supabase signing keys by kid, refreshed in the background"""
+
+    # Minimum gap between on-demand refreshes triggered by unknown key ids
+    MIN_REFRESH_INTERVAL = 30.0
+
+    def __init__(self, url: str, file_path: str = "", refresh_seconds: int = 600):
+        self.url = url
+        self.file_path = file_path
+        self.refresh_seconds = refresh_seconds
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._last_refresh = 0.0
+        self._lock = threading.Lock()
+
+    def _load_document(self) -> dict:
+        """Read the JWKS document from the local stand-in file or the auth server"""
+        if self.file_path:
+            with open(self.file_path) as f:
+                return json.load(f)
+        response = httpx.get(self.url, timeout=5.0)
+        response.raise_for_status()
+        return response.json()
+
+    def refresh(self) -> bool:
+        """Reload signing keys, keeping the previous set if the fetch fails (blocking)"""
+        with self._lock:
+            return self._refresh_locked()
+
+    def refresh_if_idle(self) -> bool:
+        """Refresh unless another refresh ran within MIN_REFRESH_INTERVAL (blocking)"""
+        with self._lock:
+            if time.monotonic() - self._last_refresh <= self.MIN_REFRESH_INTERVAL:
+                return False
+            return self._refresh_locked()
+
+    def _refresh_locked(self) -> bool:
+        self._last_refresh = time.monotonic()
+        try:
+            document = self._load_document()
+        except Exception as e:
+            print(f"JWKS refresh failed: {e}")
+            return False
+
+        keys = {}
+        for jwk in document.get("keys", []):
+            try:
+                key = jwt.PyJWK(jwk)
+            except jwt.PyJWTError as e:
+                print(f"Skipping unusable JWKS key {jwk.get('kid')}: {e}")
+                continue
+            keys[jwk.get("kid", "")] = key
+        self._keys = keys
+        return True
+
+    async def get_key(self, kid: str) -> Optional[jwt.PyJWK]:
+        """
+        Get a signing key, refreshing once if the key id is unknown (e.g. after
+        rotation). The fetch runs in a worker thread, off the event loop.
+        """
+        key = self._keys.get(kid)
+        if key is None and time.monotonic() - self._last_refresh > self.MIN_REFRESH_INTERVAL:
+            await asyncio.to_thread(self.refresh_if_idle)
+            key = self._keys.get(kid)
+        return key
+
+    async def run_refresh_loop(self):
+        """Periodically refresh keys off the event loop; runs for the app lifetime"""
+        while True:
+            await asyncio.to_thread(self.refresh)
+            await asyncio.sleep(self.refresh_seconds)
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of verified token hashes, each valid until its exp claim"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Dict, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _hash(token: str) -> str:
+        return hashlib.blake2b(token.encode(), digest_size=20).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict]:
+        key = self._hash(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            user_data, exp = entry
+            if exp <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return user_data
+
+    def set(self, token: str, user_data: Dict, exp: float):
+        key = self._hash(token)
+        with self._lock:
+            self._entries[key] = (user_data, exp)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class TokenVerifier:
+    """Verifies Supabase JWTs locally"""
+
+    def __init__(self, jwt_secret: str, jwks: JWKSCache, token_cache: VerifiedTokenCache):
+        self.jwt_secret = jwt_secret
+        self.jwks = jwks
+        self.token_cache = token_cache
+
+    async def _resolve_key(self, header: dict):
+        """Pick the verification key for the token's algorithm"""
+        alg = header.get("alg")
+        if alg == "HS256":
+            return self.jwt_secret
+        if alg in ASYMMETRIC_ALGORITHMS:
+            jwk = await self.jwks.get_key(header.get("kid", ""))
+            return jwk.key if jwk else None
+        raise jwt.InvalidAlgorithmError(f"Unsupported token algorithm: {alg}")
+
+    async def verify(self, token: str) -> Optional[Dict]:
+        """
+        Verify signature, audience and expiry of a token.
+
+        Args:
+            token: JWT access token
+
+        Returns:
+            User info from the token, or None if no local key can verify it
+            (e.g. JWKS unavailable); raises jwt.InvalidTokenError if it is invalid
+        """
+        cached = self.token_cache.get(token)
+        if cached is not None:
+            return cached
+
+        header = jwt.get_unverified_header(token)
+        key = await self._resolve_key(header)
+        if key is None:
+            return None
+
+        payload = jwt.decode(
+            token,
+            key,
+            algorithms=[header["alg"]],
+            audience="authenticated",
+            options={"require": ["exp", "sub"]}
+        )
+
+        user_data = {
+            "user_id": payload.get("sub"),  # Subject is the user ID
+            "email": payload.get("email"),
+            "role": payload.get("role"),
+            "exp": payload.get("exp")
+        }
+        self.token_cache.set(token, user_data, float(payload["exp"]))
+        return user_data
+
+
+jwks_cache = JWKSCache(
+    url=settings.SUPABASE_JWKS_URL or f"{settings.SUPABASE_URL.rstrip('/')}/auth/v1/.well-known/jwks.json",
+    file_path=settings.SUPABASE_JWKS_FILE,
+    refresh_seconds=settings.JWKS_REFRESH_SECONDS
+)
+
+token_verifier = TokenVerifier(
+    jwt_secret=settings.SUPABASE_JWT_SECRET,
+    jwks=jwks_cache,
+    token_cache=VerifiedTokenCache(max_entries=settings.AUTH_TOKEN_CACHE_SIZE)
+)
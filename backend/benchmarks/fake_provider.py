@@ -0,0 +1,283 @@
+"""
+Local fake AI provider for offline load tests.
+
+Speaks the OpenAI chat-completions (/v1/chat/completions), OpenRouter
+(/api/v1/chat/completions) and Gemini REST (/v1beta/models/{model}:generateContent,
+:streamGenerateContent) wire formats, answering every prompt with the
+deterministic mock_completion() of app.services.mock_service. Latency,
+streaming speed, malformed JSON and 429 bursts are configurable.
+
+Usage (from backend/):
+    python -m benchmarks.fake_provider --port 8900 --latency lognormal:0.8,0.5 \\
+        --malformed-rate 0.05 --burst-every 60 --burst-seconds 5
+
+Then point the backend at it (and give users any non-empty API key):
+    OPENAI_BASE_URL=http://localhost:8900/v1
+    OPENROUTER_BASE_URL=http://localhost:8900/api/v1
+    GEMINI_API_ENDPOINT=http://localhost:8900
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, Optional
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from app.services.mock_service import mock_completion
+from app.services.prompt_inputs import estimate_tokens
+
+app = FastAPI(title="Fake AI provider")
+stats: Counter = Counter()
+
+
+class Behavior:
+    """Latency distribution and fault injection, set from the command line"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.latency = self._parse_latency(args.latency)
+        self.tokens_per_second = args.tokens_per_second
+        self.malformed_rate = args.malformed_rate
+        self.error_rate = args.error_rate
+        self.burst_every = args.burst_every
+        self.burst_seconds = args.burst_seconds
+        self.retry_after = args.retry_after
+        self.rng = random.Random(args.seed)
+        self.started = time.monotonic()
+
+    @staticmethod
+    def _parse_latency(spec: str):
+        """fixed:S | uniform:LOW,HIGH | lognormal:MEDIAN,SIGMA | exp:MEAN (seconds to first token)"""
+        kind, _, params = spec.partition(":")
+        values = [float(value) for value in params.split(",") if value]
+        if kind == "fixed":
+            return lambda rng: values[0]
+        if kind == "uniform":
+            return lambda rng: rng.uniform(values[0], values[1])
+        if kind == "lognormal":
+            return lambda rng: values[0] * rng.lognormvariate(0, values[1])
+        if kind == "exp":
+            return lambda rng: rng.expovariate(1 / values[0])
+        raise argparse.ArgumentTypeError(f"Unknown latency distribution: {spec}")
+
+    def first_token_delay(self) -> float:
+        return self.latency(self.rng)
+
+    def fault(self) -> Optional[int]:
+        """Status code to fail this call with, if any"""
+        if self.burst_every and (time.monotonic() - self.started) % self.burst_every < self.burst_seconds:
+            return 429
+        if self.rng.random() < self.error_rate:
+            return 503
+        return None
+
+    def corrupt(self, text: str) -> str:
+        """Malformed-JSON injection: the failure modes models produce in practice"""
+        if not text.lstrip().startswith(("{", "[")) or self.rng.random() >= self.malformed_rate:
+            return text
+        stats["malformed"] += 1
+        kind = self.rng.choice(("fence", "prose", "truncate", "trailing_comma"))
+        if kind == "fence":
+            return f"```json\n{text}\n```"
+        if kind == "prose":
+            return f"Here is the tailored result:\n{text}\nLet me know if you need changes."
+        if kind == "truncate":
+            return text[:int(len(text) * self.rng.uniform(0.6, 0.95))]
+        return re.sub(r"([}\]])\s*$", r",\1", text)
+
+
+def wrap_key(schema: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Property holding the list when the requested schema is an object around a single array"""
+    properties = (schema or {}).get("properties") or {}
+    if len(properties) != 1:
+        return None
+    name, prop = next(iter(properties.items()))
+    kind = prop.get("type")
+    return name if str(kind).lower() == "array" or (isinstance(kind, list) and "array" in kind) else None
+
+
+def stream_pieces(text: str):
+    return re.findall(r"\S+\s*|\s+", text)
+
+
+async def answer(prompt: str, schema: Optional[Dict[str, Any]]) -> str:
+    await asyncio.sleep(behavior.first_token_delay())
+    return behavior.corrupt(mock_completion(prompt, wrap_key(schema)))
+
+
+def rate_limited(provider: str) -> JSONResponse:
+    stats["rate_limited"] += 1
+    if provider == "gemini":
+        body = {"error": {"code": 429, "message": "Resource has been exhausted (fake burst)", "status": "RESOURCE_EXHAUSTED"}}
+    else:
+        body = {"error": {"message": "Rate limit reached (fake burst)", "type": "rate_limit_exceeded", "code": "rate_limit_exceeded"}}
+    return JSONResponse(body, status_code=429, headers={"Retry-After": str(behavior.retry_after)})
+
+
+def unavailable(provider: str) -> JSONResponse:
+    stats["errors"] += 1
+    if provider == "gemini":
+        body = {"error": {"code": 503, "message": "The model is overloaded (fake)", "status": "UNAVAILABLE"}}
+    else:
+        body = {"error": {"message": "The server is overloaded (fake)", "type": "server_error"}}
+    return JSONResponse(body, status_code=503)
+
+
+def fault_response(provider: str) -> Optional[JSONResponse]:
+    status_code = behavior.fault()
+    if status_code == 429:
+        return rate_limited(provider)
+    if status_code == 503:
+        return unavailable(provider)
+    return None
+
+
+async def chat_completions(request: Request, provider: str):
+    body = await request.json()
+    stats[f"{provider}_calls"] += 1
+    failure = fault_response(provider)
+    if failure is not None:
+        return failure
+
+    prompt = next((m["content"] for m in reversed(body.get("messages", [])) if m.get("role") == "user"), "")
+    response_format = body.get("response_format") or {}
+    schema = (response_format.get("json_schema") or {}).get("schema")
+    model = body.get("model", "fake")
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+    prompt_tokens = estimate_tokens(prompt)
+
+    if not body.get("stream"):
+        text = await answer(prompt, schema)
+        completion_tokens = estimate_tokens(text)
+        await asyncio.sleep(completion_tokens / behavior.tokens_per_second)
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+
+    async def events():
+        text = await answer(prompt, schema)
+        base = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model}
+        for piece in stream_pieces(text):
+            chunk = {**base, "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+            yield f"data: {json.dumps(chunk)}\n\n"
+            await asyncio.sleep(estimate_tokens(piece) / behavior.tokens_per_second)
+        done = {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+        yield f"data: {json.dumps(done)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.post("/v1/chat/completions")
+async def openai_chat(request: Request):
+    return await chat_completions(request, "openai")
+
+
+@app.post("/api/v1/chat/completions")
+async def openrouter_chat(request: Request):
+    return await chat_completions(request, "openrouter")
+
+
+def gemini_response(text: str, prompt_tokens: int, finish: Optional[str] = "STOP") -> dict:
+    candidate = {"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}
+    if finish:
+        candidate["finishReason"] = finish
+    output_tokens = estimate_tokens(text)
+    return {
+        "candidates": [candidate],
+        "usageMetadata": {
+            "promptTokenCount": prompt_tokens,
+            "candidatesTokenCount": output_tokens,
+            "totalTokenCount": prompt_tokens + output_tokens
+        }
+    }
+
+
+@app.post("/v1beta/models/{model_method}")
+async def gemini_generate(model_method: str, request: Request):
+    _, _, method = model_method.partition(":")
+    body = await request.json()
+    stats["gemini_calls"] += 1
+    failure = fault_response("gemini")
+    if failure is not None:
+        return failure
+
+    contents = body.get("contents") or []
+    prompt = "".join(part.get("text", "") for part in (contents[-1].get("parts") if contents else []))
+    config = body.get("generationConfig") or body.get("generation_config") or {}
+    schema = config.get("responseSchema") or config.get("response_schema")
+    prompt_tokens = estimate_tokens(prompt)
+
+    if method == "generateContent":
+        text = await answer(prompt, schema)
+        await asyncio.sleep(estimate_tokens(text) / behavior.tokens_per_second)
+        return gemini_response(text, prompt_tokens)
+
+    if method == "streamGenerateContent":
+        sse = request.query_params.get("alt") == "sse"
+
+        async def chunks():
+            text = await answer(prompt, schema)
+            pieces = stream_pieces(text)
+            if not sse:
+                yield "["
+            for index, piece in enumerate(pieces):
+                last = index == len(pieces) - 1
+                payload = json.dumps(gemini_response(piece, prompt_tokens, "STOP" if last else None))
+                yield f"data: {payload}\r\n\r\n" if sse else payload + ("" if last else ",\r\n")
+                await asyncio.sleep(estimate_tokens(piece) / behavior.tokens_per_second)
+            if not sse:
+                yield "]"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream" if sse else "application/json")
+
+    return JSONResponse({"error": {"code": 404, "message": f"Unknown method {method}", "status": "NOT_FOUND"}}, status_code=404)
+
+
+@app.get("/stats")
+async def get_stats():
+    return dict(stats)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", default="lognormal:0.8,0.5",
+                        help="time to first token: fixed:S, uniform:LOW,HIGH, lognormal:MEDIAN,SIGMA or exp:MEAN")
+    parser.add_argument("--tokens-per-second", type=float, default=150.0, help="output speed after the first token")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="fraction of JSON answers to corrupt")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls answered 503")
+    parser.add_argument("--burst-every", type=float, default=0.0, help="seconds between 429 bursts (0 = none)")
+    parser.add_argument("--burst-seconds", type=float, default=5.0, help="length of each 429 burst")
+    parser.add_argument("--retry-after", type=int, default=2, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser
+
+
+# Defaults until main() applies the command line (also used under `uvicorn benchmarks.fake_provider:app`)
+behavior = Behavior(build_parser().parse_args([]))
+
+
+def main():
+    global behavior
+    args = build_parser().parse_args()
+    behavior = Behavior(args)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
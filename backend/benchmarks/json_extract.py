@@ -0,0 +1,115 @@
+"""
+Correctness, fuzz and speed check for app.services.json_repair against a
+corpus of malformed model outputs (benchmarks/json_corpus.jsonl).
+
+Usage (from backend/):
+    python -m benchmarks.json_extract --runs 2000 --fuzz 5000
+
+For every corpus entry the fence-strip + json.loads parsing the services used
+before is compared with extract_json. The fuzz pass truncates and chunks the
+valid entries at random points: extract_json must return a value or raise
+JSONRepairError, and JSONItemStream must hand back the same elements.
+"""
+import argparse
+import json
+import os
+import random
+import time
+from app.services.json_repair import extract_json, JSONItemStream, JSONRepairError
+
+CORPUS = os.path.join(os.path.dirname(__file__), "json_corpus.jsonl")
+
+
+def naive_parse(text: str):
+    """The fence stripping the providers did before extract_json"""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("```")[1]
+        if text.startswith("json"):
+            text = text[4:]
+    return json.loads(text)
+
+
+def attempt(parse, text: str):
+    try:
+        return parse(text)
+    except ValueError:
+        return None
+
+
+def time_per_call(parse, text: str, runs: int) -> float:
+    started = time.perf_counter()
+    for _ in range(runs):
+        attempt(parse, text)
+    return (time.perf_counter() - started) / runs * 1e6
+
+
+def stream_items(text: str, rng: random.Random) -> list:
+    stream = JSONItemStream()
+    items = []
+    i = 0
+    while i < len(text):
+        size = rng.randint(1, 12)
+        items.extend(stream.feed(text[i:i + size]))
+        i += size
+    return items
+
+
+def fuzz(cases: list, iterations: int, seed: int) -> int:
+    """Return the number of fuzz failures"""
+    rng = random.Random(seed)
+    sources = [case["text"] for case in cases if case["expect"] is not None]
+    failures = 0
+    for _ in range(iterations):
+        text = rng.choice(sources)
+        text = text[:rng.randint(0, len(text))]
+        try:
+            value = extract_json(text)
+        except JSONRepairError:
+            continue
+        except Exception as e:
+            failures += 1
+            print(f"  unexpected {type(e).__name__} for {text!r}: {e}")
+            continue
+
+        items = stream_items(text, rng)
+        if isinstance(value, list) and items != value[:len(items)]:
+            failures += 1
+            print(f"  stream items disagree for {text!r}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=2000, help="timed parses per corpus entry")
+    parser.add_argument("--fuzz", type=int, default=5000, help="random truncations to check")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with open(CORPUS) as f:
+        cases = [json.loads(line) for line in f if line.strip()]
+
+    print(f"{'case':<26}{'naive':>7}{'extract':>9}{'naive us':>10}{'extract us':>12}")
+    naive_ok = extract_ok = 0
+    naive_time = extract_time = 0.0
+    for case in cases:
+        naive_hit = attempt(naive_parse, case["text"]) == case["expect"]
+        extract_hit = attempt(extract_json, case["text"]) == case["expect"]
+        naive_us = time_per_call(naive_parse, case["text"], args.runs)
+        extract_us = time_per_call(extract_json, case["text"], args.runs)
+        naive_ok += naive_hit
+        extract_ok += extract_hit
+        naive_time += naive_us
+        extract_time += extract_us
+        print(f"{case['name']:<26}{'ok' if naive_hit else '-':>7}{'ok' if extract_hit else 'FAIL':>9}"
+              f"{naive_us:>10.1f}{extract_us:>12.1f}")
+
+    print(f"\nrecovered: naive {naive_ok}/{len(cases)}, extract_json {extract_ok}/{len(cases)}")
+    print(f"mean time per parse: naive {naive_time / len(cases):.1f}us, extract_json {extract_time / len(cases):.1f}us")
+
+    failures = fuzz(cases, args.fuzz, args.seed)
+    print(f"fuzz: {args.fuzz} truncations, {failures} failures")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Load test for /api/ai/tailor-resume and /api/ai/batch-tailor.
+
+Run the backend against benchmarks/fake_provider.py (or with the "mock"
+provider and MOCK_AI_ENABLED=true) and save that provider in the test
+user's AI settings, then:
+
+    python -m benchmarks.tailor_load --token $JWT --requests 200 --concurrency 20
+    python -m benchmarks.tailor_load --token $JWT --batch 5 --batch-size 20
+
+Every request gets a distinct job description (unless --repeat), so results
+measure provider calls rather than the AI response cache. With --metrics-token
+the backend's /api/metrics rate-limit, circuit and routing sections are
+printed afterwards.
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+import httpx
+
+PROFILE = {
+    "personalInfo": {
+        "fullName": "Load Test", "email": "load@example.com", "phone": "",
+        "location": "Remote", "linkedin": "", "github": ""
+    },
+    "additionalInfo": "Backend engineer focused on APIs, data pipelines and reliability.",
+    "summary": "Backend engineer with eight years of Python experience.",
+    "skills": {
+        "languages": ["Python", "Go", "SQL"], "databases": ["PostgreSQL", "Redis"],
+        "cloud": ["AWS", "GCP"], "tools": ["Docker", "Kubernetes", "Terraform"]
+    },
+    "experience": [
+        {
+            "id": f"exp-{i}", "company": f"Company {i}", "role": "Senior Backend Engineer",
+            "location": "Remote", "startDate": f"{2016 + 2 * i}-01", "endDate": f"{2018 + 2 * i}-01",
+            "description": [
+                "Built FastAPI services handling 5k requests per second on PostgreSQL and Redis",
+                "Cut p99 latency by 40% by introducing connection pooling and query caching",
+                "Migrated deployments to Kubernetes with Terraform-managed AWS infrastructure",
+                "Mentored four engineers and led design reviews for the payments platform",
+            ]
+        }
+        for i in range(3)
+    ],
+    "education": [],
+    "projects": [
+        {"id": "proj-1", "name": "Resume tailor", "technologies": ["FastAPI", "React"],
+         "description": ["LLM-backed resume tailoring with streaming responses"]}
+    ],
+    "certifications": []
+}
+
+JOB_DESCRIPTION = """Senior Backend Engineer #{n}
+
+What you'll do:
+- Design and build scalable REST APIs in Python and FastAPI
+- Own PostgreSQL schema design and query performance
+- Mentor engineers and lead code reviews
+
+Requirements:
+- 5+ years of backend development with Python
+- Strong experience with PostgreSQL, Redis and Docker
+- Experience with AWS (ECS, Lambda, S3)
+"""
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)] if ordered else 0.0
+
+
+async def tailor_once(client: httpx.AsyncClient, n: int, args) -> tuple:
+    body = {
+        "profileData": PROFILE,
+        "jobDescription": JOB_DESCRIPTION.format(n=0 if args.repeat else n),
+        "mode": args.mode
+    }
+    started = time.monotonic()
+    try:
+        response = await client.post("/api/ai/tailor-resume", json=body)
+        return response.status_code, time.monotonic() - started
+    except httpx.HTTPError as e:
+        return type(e).__name__, time.monotonic() - started
+
+
+async def run_tailor(client: httpx.AsyncClient, args):
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def limited(n: int):
+        async with semaphore:
+            return await tailor_once(client, n, args)
+
+    started = time.monotonic()
+    results = await asyncio.gather(*[limited(n) for n in range(args.requests)])
+    elapsed = time.monotonic() - started
+
+    latencies = [latency for status, latency in results if status == 200]
+    print(f"{args.requests} requests in {elapsed:.1f}s ({args.requests / elapsed:.1f} req/s), "
+          f"concurrency {args.concurrency}, mode {args.mode}")
+    print(f"status: {dict(Counter(status for status, _ in results))}")
+    print(f"latency ok: p50 {percentile(latencies, 0.5):.2f}s  p90 {percentile(latencies, 0.9):.2f}s  "
+          f"p99 {percentile(latencies, 0.99):.2f}s  max {max(latencies, default=0):.2f}s")
+
+
+async def run_batches(client: httpx.AsyncClient, args):
+    started = time.monotonic()
+    job_ids = []
+    for batch in range(args.batch):
+        descriptions = [JOB_DESCRIPTION.format(n=batch * args.batch_size + i) for i in range(args.batch_size)]
+        response = await client.post("/api/ai/batch-tailor", json={"profileData": PROFILE, "jobDescriptions": descriptions})
+        print(f"batch {batch}: {response.status_code} {response.json()}")
+        if response.status_code == 202:
+            job_ids.append(response.json()["job_id"])
+
+    pending = set(job_ids)
+    while pending:
+        await asyncio.sleep(1)
+        for job_id in list(pending):
+            job = (await client.get(f"/api/ai/jobs/{job_id}")).json()
+            if job.get("status") in ("completed", "failed"):
+                pending.discard(job_id)
+                print(f"{job_id}: {job.get('status')} after {time.monotonic() - started:.1f}s")
+    total = args.batch * args.batch_size
+    elapsed = time.monotonic() - started
+    print(f"{total} tailorings in {elapsed:.1f}s ({total / elapsed:.2f}/s)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--token", required=True, help="Supabase access token of the test user")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--mode", choices=("fanout", "combined"), default="fanout")
+    parser.add_argument("--repeat", action="store_true", help="reuse one job description (measures cache hits)")
+    parser.add_argument("--batch", type=int, default=0, help="batch jobs to submit instead of tailor requests")
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--metrics-token", default="", help="backend METRICS_TOKEN, to print its metrics afterwards")
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient(
+        base_url=args.url,
+        headers={"Authorization": f"Bearer {args.token}"},
+        timeout=300,
+        limits=httpx.Limits(max_connections=max(args.concurrency, 10))
+    ) as client:
+        if args.batch:
+            await run_batches(client, args)
+        else:
+            await run_tailor(client, args)
+
+        if not args.metrics_token:
+            return
+        metrics = (await client.get("/api/metrics", headers={"X-Metrics-Token": args.metrics_token})).json()
+        for section in ("ai_rate_limits", "ai_circuits", "ai_model_routing", "ai_inflight_coalescing"):
+            print(f"\n{section}: {json.dumps(metrics.get(section), indent=2)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,36 @@
+from app.services.jd_digest import build_digest, find_skills
+
+POSTING = """Backend Engineer
+
+Who We Are Looking For:
+- 5+ years of Python
+- Strong PostgreSQL skills
+
+Who we are:
+We are a small startup building hiring tools.
+"""
+
+
+def test_who_we_are_looking_for_is_a_requirements_heading():
+    digest = build_digest(POSTING)
+    assert digest.requirements == ["5+ years of Python", "Strong PostgreSQL skills"]
+    assert digest.must_have_skills == ["Python", "PostgreSQL"]
+    assert "Who We Are Looking For:" in digest.text
+
+
+def test_who_we_are_section_is_skipped():
+    assert "small startup" not in build_digest(POSTING).text
+
+
+def test_ambiguous_words_at_sentence_start_are_not_skills():
+    assert find_skills("Excel at stakeholder communication.") == []
+    assert find_skills("Go the extra mile for customers.") == []
+    assert find_skills("- Go the extra mile\n- Excel at written updates") == []
+    assert find_skills("We ship fast. Go beyond the spec when it helps.") == []
+
+
+def test_ambiguous_skills_in_context_are_found():
+    assert find_skills("Languages: Go, Python") == ["Go", "Python"]
+    assert find_skills("- Go, Rust or C++") == ["Go", "Rust", "C++"]
+    assert find_skills("Experience with C and R.") == ["C", "R"]
+    assert find_skills("Advanced Excel and SQL") == ["Excel", "SQL"]